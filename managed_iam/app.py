@@ -2,16 +2,127 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from dataclasses import asdict
+from typing import Any, AsyncIterator, Awaitable, Callable, MutableMapping
 
+from managed_iam.crypto import get_crypto_executor
 from managed_iam.storage import RedisFactory
 
+logger = logging.getLogger(__name__)
+
+ASGIApp = Callable[[MutableMapping[str, Any], Callable[[], Awaitable[Any]], Callable[[Any], Awaitable[None]]], Awaitable[None]]
+
 
 @asynccontextmanager
 async def redis_lifespan() -> AsyncIterator[None]:
-    """Convenience context manager for ensuring Redis connections close cleanly."""
+    """Convenience context manager for warming the Redis pool and closing it cleanly."""
+    await RedisFactory.warm_up()
     try:
         yield
     finally:
         await RedisFactory.close()
+
+
+def prewarm_clients() -> None:
+    """Build the configured boto3 clients once, before the first request needs them.
+
+    Failures (an unknown ``DEFAULT_ASSUME_PROFILE``, unresolvable endpoints)
+    are logged rather than raised so the worker still boots; the clients are
+    then built, and the error surfaces, on first use.
+    """
+    from botocore.exceptions import BotoCoreError
+
+    from managed_iam.aws import client_registry
+    from managed_iam.config import settings
+
+    try:
+        client_registry.prewarm(settings.aws_prewarm_services, profile=settings.default_assume_profile)
+    except (BotoCoreError, ValueError):
+        logger.warning("boto3 client prewarm failed; clients will be built on first use", exc_info=True)
+
+
+_startup_hooks: list[Callable[[], Any]] = []
+
+
+def on_startup(hook: Callable[[], Any]) -> Callable[[], Any]:
+    """Run ``hook`` from ``startup``; lets the Django app warm its own caches without this layer importing it."""
+    if hook not in _startup_hooks:
+        _startup_hooks.append(hook)
+    return hook
+
+
+def startup() -> None:
+    """Process startup hook: build shared services and clients before the first request."""
+    from managed_iam.services.container import get_container
+
+    prewarm_clients()
+    get_container()
+    for hook in _startup_hooks:
+        hook()
+
+
+@asynccontextmanager
+async def serving_lifespan() -> AsyncIterator[None]:
+    """Startup/shutdown for long-lived ASGI workers: warm shared clients and pools, then close them."""
+    from managed_iam.aws import AsyncSTSClient
+
+    # boto3 client construction and credential resolution block, so keep them off the loop.
+    await asyncio.to_thread(startup)
+    async with redis_lifespan():
+        try:
+            yield
+        finally:
+            await AsyncSTSClient.close()
+            get_crypto_executor().shutdown(wait=False)
+
+
+def with_lifespan(app: ASGIApp) -> ASGIApp:
+    """Answer ASGI ``lifespan`` events (which Django rejects) with ``serving_lifespan``."""
+
+    async def application(scope, receive, send) -> None:
+        if scope["type"] != "lifespan":
+            await app(scope, receive, send)
+            return
+
+        lifespan = serving_lifespan()
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await lifespan.__aenter__()
+                except Exception as exc:  # noqa: BLE001 - reported to the server, which aborts startup
+                    await send({"type": "lifespan.startup.failed", "message": repr(exc)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await lifespan.__aexit__(None, None, None)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    return application
+
+
+def runtime_stats() -> dict[str, Any]:
+    """Collect in-process cache and pool counters for the metrics endpoint."""
+    from managed_iam.aws import client_registry
+    from managed_iam.repos.orgs import verified_key_cache
+    from managed_iam.services.integration import integration_link_cache
+    from managed_iam.services.org_cache import org_record_cache
+    from managed_iam.services.ratelimit import leased_rate_limiter
+    from managed_iam.services.role_cache import assumed_role_cache
+    from managed_iam.services.stack_watch import stack_watch_hub
+
+    return {
+        "api_key_cache": asdict(verified_key_cache.stats()),
+        "crypto_executor": asdict(get_crypto_executor().stats()),
+        "redis_pool": asdict(RedisFactory.stats()),
+        "assumed_role_cache": asdict(assumed_role_cache.stats()),
+        "aws_clients": asdict(client_registry.stats()),
+        "rate_limiter": asdict(leased_rate_limiter.stats()),
+        "org_cache": asdict(org_record_cache.stats()),
+        "integration_links": asdict(integration_link_cache.stats()),
+        "stack_watch": asdict(stack_watch_hub.stats()),
+    }
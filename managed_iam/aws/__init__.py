@@ -0,0 +1,19 @@
+"""Lightweight AWS clients used on the request path."""
+
+from .clients import ClientRegistry, ClientRegistryStats, client_registry
+from .credentials import CredentialProvider, credential_provider
+from .sigv4 import SigningCredentials, presign_s3_url, sign_request
+from .sts import AsyncSTSClient, STSTransportError
+
+__all__ = [
+    "AsyncSTSClient",
+    "ClientRegistry",
+    "ClientRegistryStats",
+    "CredentialProvider",
+    "STSTransportError",
+    "SigningCredentials",
+    "client_registry",
+    "credential_provider",
+    "presign_s3_url",
+    "sign_request",
+]
@@ -0,0 +1,158 @@
+"""Process-wide registry of boto3 sessions and clients."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ProfileNotFound
+
+from managed_iam.config import settings
+
+ClientKey = tuple[str, str, str, str]
+
+
+@dataclass
+class ClientRegistryStats:
+    sessions: int = 0
+    profile_clients: int = 0
+    credential_clients: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def _credential_identity(credentials: Mapping[str, Any]) -> str:
+    # The access key alone is not unique across refreshed sessions, so fold the
+    # secret material in as a digest rather than keeping it in the key.
+    material = "\x00".join(
+        [
+            credentials["AccessKeyId"],
+            credentials["SecretAccessKey"],
+            credentials.get("SessionToken") or "",
+        ]
+    )
+    return f"{credentials['AccessKeyId']}:{hashlib.sha256(material.encode()).hexdigest()[:32]}"
+
+
+class ClientRegistry:
+    """Reuse boto3 sessions and clients across requests.
+
+    Building a session loads the service model data and building a client
+    resolves endpoints, and each client owns its own urllib3 connection pool.
+    Clients created from a profile (or the default chain) live for the process;
+    clients built from per-tenant temporary credentials are kept in a bounded
+    LRU. boto3 clients are thread-safe once built, but sessions are not, so
+    each session builds one client at a time under its own lock. The registry
+    lock only guards the maps: clients are built outside it, and when two
+    threads race to build the same key the first one stored wins.
+    """
+
+    def __init__(self, *, max_pool_connections: int = 10, max_credential_clients: int = 128) -> None:
+        self._config = Config(max_pool_connections=max_pool_connections)
+        self._max_credential_clients = max_credential_clients
+        self._sessions: dict[str, boto3.session.Session] = {}
+        self._profile_clients: dict[ClientKey, Any] = {}
+        self._credential_clients: OrderedDict[ClientKey, Any] = OrderedDict()
+        self._session_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = ClientRegistryStats()
+
+    def session(self, profile: str | None = None) -> boto3.session.Session:
+        return self._session_entry(profile)[0]
+
+    def _session_entry(self, profile: str | None) -> tuple[boto3.session.Session, threading.Lock]:
+        name = profile or ""
+        with self._lock:
+            session = self._sessions.get(name)
+            if session is not None:
+                return session, self._session_locks[name]
+        try:
+            session = boto3.session.Session(profile_name=profile) if profile else boto3.session.Session()
+        except ProfileNotFound as exc:
+            raise ValueError(f"aws profile '{profile}' not found") from exc
+        with self._lock:
+            session = self._sessions.setdefault(name, session)
+            return session, self._session_locks.setdefault(name, threading.Lock())
+
+    def _build(self, service: str, profile: str | None, region_name: str, **kwargs: Any) -> Any:
+        session, session_lock = self._session_entry(profile)
+        with session_lock:
+            return session.client(service, region_name=region_name, config=self._config, **kwargs)
+
+    def client(
+        self,
+        service: str,
+        *,
+        profile: str | None = None,
+        region: str | None = None,
+        credentials: Mapping[str, Any] | None = None,
+    ) -> Any:
+        """Return a cached client; ``credentials`` takes the STS ``Credentials`` shape."""
+        region_name = region or settings.aws_region
+        if credentials is None:
+            key = (service, profile or "", region_name, "")
+            with self._lock:
+                client = self._profile_clients.get(key)
+                if client is not None:
+                    self._stats.hits += 1
+                    return client
+                self._stats.misses += 1
+            client = self._build(service, profile, region_name)
+            with self._lock:
+                return self._profile_clients.setdefault(key, client)
+
+        key = (service, profile or "", region_name, _credential_identity(credentials))
+        with self._lock:
+            client = self._credential_clients.get(key)
+            if client is not None:
+                self._credential_clients.move_to_end(key)
+                self._stats.hits += 1
+                return client
+            self._stats.misses += 1
+        client = self._build(
+            service,
+            profile,
+            region_name,
+            aws_access_key_id=credentials["AccessKeyId"],
+            aws_secret_access_key=credentials["SecretAccessKey"],
+            aws_session_token=credentials.get("SessionToken"),
+        )
+        with self._lock:
+            client = self._credential_clients.setdefault(key, client)
+            self._credential_clients.move_to_end(key)
+            while len(self._credential_clients) > self._max_credential_clients:
+                self._credential_clients.popitem(last=False)
+                self._stats.evictions += 1
+            return client
+
+    def prewarm(self, services: Iterable[str], *, profile: str | None = None) -> None:
+        """Build the default session and the listed clients ahead of the first request."""
+        for service in services:
+            self.client(service, profile=profile)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._session_locks.clear()
+            self._profile_clients.clear()
+            self._credential_clients.clear()
+
+    def stats(self) -> ClientRegistryStats:
+        with self._lock:
+            snapshot = ClientRegistryStats(**self._stats.__dict__)
+            snapshot.sessions = len(self._sessions)
+            snapshot.profile_clients = len(self._profile_clients)
+            snapshot.credential_clients = len(self._credential_clients)
+        return snapshot
+
+
+client_registry = ClientRegistry(
+    max_pool_connections=settings.aws_max_pool_connections,
+    max_credential_clients=settings.aws_credential_client_cache_size,
+)
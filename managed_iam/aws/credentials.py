@@ -0,0 +1,74 @@
+"""Cached AWS credentials for in-process SigV4 signing."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import Any
+
+from .clients import client_registry
+from .sigv4 import SigningCredentials
+
+
+class CredentialProvider:
+    """Resolve each profile's botocore credentials once and hand out frozen copies.
+
+    botocore's refreshable credentials renew themselves shortly before expiry,
+    so keeping the resolved object is safe; only resolving a profile and
+    refreshing (IMDS, SSO, assume-role chains) can block.
+    """
+
+    def __init__(self) -> None:
+        self._credentials: dict[str | None, Any] = {}
+        self._lock = threading.Lock()
+
+    def _resolve(self, profile: str | None) -> Any:
+        with self._lock:
+            credentials = self._credentials.get(profile)
+        if credentials is None:
+            credentials = client_registry.session(profile).get_credentials()
+            if credentials is None:
+                raise ValueError("no AWS credentials available to sign requests")
+            with self._lock:
+                self._credentials[profile] = credentials
+        return credentials
+
+    def frozen(self, profile: str | None = None) -> SigningCredentials:
+        """Blocking variant for synchronous callers; cheap unless a refresh is due."""
+        frozen = self._resolve(profile).get_frozen_credentials()
+        return SigningCredentials(frozen.access_key, frozen.secret_key, frozen.token)
+
+    async def signing_credentials(self, profile: str | None = None) -> SigningCredentials:
+        return (await self.signing_credentials_with_expiry(profile))[0]
+
+    async def signing_credentials_with_expiry(
+        self, profile: str | None = None
+    ) -> tuple[SigningCredentials, datetime | None]:
+        """Signing credentials and when they stop working (``None`` for long-term keys).
+
+        A session token whose expiry botocore does not track (e.g. one taken
+        from the environment) is reported as expiring now, so nothing signed
+        with it is cached.
+        """
+        # Resolving a profile or refreshing can block, so only do that off-loop.
+        credentials = self._credentials.get(profile)
+        if credentials is None:
+            credentials = await asyncio.to_thread(self._resolve, profile)
+        # Read before a possible refresh below: the frozen keys live at least this long.
+        expires_at = getattr(credentials, "_expiry_time", None)
+        refresh_needed = getattr(credentials, "refresh_needed", None)
+        if refresh_needed is not None and refresh_needed():
+            frozen = await asyncio.to_thread(credentials.get_frozen_credentials)
+        else:
+            frozen = credentials.get_frozen_credentials()
+        if expires_at is None and frozen.token:
+            expires_at = datetime.now(timezone.utc)
+        return SigningCredentials(frozen.access_key, frozen.secret_key, frozen.token), expires_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._credentials.clear()
+
+
+credential_provider = CredentialProvider()
@@ -0,0 +1,159 @@
+"""asyncio-native STS client speaking the Query API over httpx."""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import Any
+from urllib.parse import urlencode
+
+import httpx
+from botocore.exceptions import ClientError
+
+from managed_iam.config import settings
+from managed_iam.loops import LoopLocal
+
+from .credentials import credential_provider
+from .sigv4 import SigningCredentials, sign_request
+
+STS_API_VERSION = "2011-06-15"
+_NS = {"sts": "https://sts.amazonaws.com/doc/2011-06-15/"}
+
+
+class STSTransportError(RuntimeError):
+    """Raised when STS could not be reached or returned an unreadable response."""
+
+
+def _endpoint(region: str) -> str:
+    return settings.sts_endpoint_url or f"https://sts.{region}.amazonaws.com/"
+
+
+def _text(node: ET.Element | None, path: str) -> str | None:
+    if node is None:
+        return None
+    found = node.find(path, _NS)
+    return found.text if found is not None else None
+
+
+def _parse_timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class AsyncSTSClient:
+    """Call AssumeRole/GetCallerIdentity without blocking the event loop.
+
+    Requests are SigV4-signed in-process and sent over one pooled
+    ``httpx.AsyncClient`` per event loop, closed by the ASGI lifespan or, under
+    WSGI, when the request's loop ends (see ``LoopLocal``). Errors are raised
+    as botocore ``ClientError`` so callers can keep handling them the way they
+    did with boto3.
+    """
+
+    _http_clients: LoopLocal[httpx.AsyncClient] = LoopLocal(
+        lambda: httpx.AsyncClient(
+            timeout=settings.sts_http_timeout_seconds,
+            limits=httpx.Limits(max_connections=settings.sts_http_max_connections),
+        ),
+        close=httpx.AsyncClient.aclose,
+    )
+
+    @classmethod
+    def _http(cls) -> httpx.AsyncClient:
+        return cls._http_clients.get()
+
+    @classmethod
+    async def close(cls) -> None:
+        await cls._http_clients.close()
+
+    async def _call(
+        self,
+        action: str,
+        params: dict[str, str],
+        *,
+        credentials: SigningCredentials,
+        region: str,
+    ) -> ET.Element:
+        url = _endpoint(region)
+        body = urlencode({"Action": action, "Version": STS_API_VERSION, **params}).encode()
+        headers = sign_request(
+            method="POST",
+            url=url,
+            headers={"Content-Type": "application/x-www-form-urlencoded; charset=utf-8"},
+            body=body,
+            service="sts",
+            region=region,
+            credentials=credentials,
+        )
+        try:
+            response = await self._http().post(url, content=body, headers=headers)
+            root = ET.fromstring(response.content)
+        except (httpx.HTTPError, ET.ParseError) as exc:
+            raise STSTransportError(f"sts {action} request failed") from exc
+
+        if response.status_code >= 400:
+            error = root.find("sts:Error", _NS)
+            raise ClientError(
+                {
+                    "Error": {
+                        "Code": _text(error, "sts:Code") or "Unknown",
+                        "Message": _text(error, "sts:Message") or "",
+                    },
+                    "ResponseMetadata": {"HTTPStatusCode": response.status_code},
+                },
+                action,
+            )
+        return root
+
+    async def assume_role(
+        self,
+        *,
+        role_arn: str,
+        role_session_name: str,
+        external_id: str,
+        duration_seconds: int = 3600,
+        profile: str | None = None,
+    ) -> dict[str, Any]:
+        """Return the ``Credentials`` mapping in the same shape boto3 uses."""
+        root = await self._call(
+            "AssumeRole",
+            {
+                "RoleArn": role_arn,
+                "RoleSessionName": role_session_name,
+                "ExternalId": external_id,
+                "DurationSeconds": str(duration_seconds),
+            },
+            credentials=await credential_provider.signing_credentials(profile),
+            region=settings.aws_region,
+        )
+        creds = root.find("sts:AssumeRoleResult/sts:Credentials", _NS)
+        expiration = _text(creds, "sts:Expiration")
+        if creds is None or expiration is None:
+            raise STSTransportError("sts AssumeRole response missing credentials")
+        return {
+            "AccessKeyId": _text(creds, "sts:AccessKeyId"),
+            "SecretAccessKey": _text(creds, "sts:SecretAccessKey"),
+            "SessionToken": _text(creds, "sts:SessionToken"),
+            "Expiration": _parse_timestamp(expiration),
+        }
+
+    async def get_caller_identity(
+        self,
+        credentials: SigningCredentials,
+        *,
+        region: str | None = None,
+    ) -> dict[str, Any]:
+        root = await self._call(
+            "GetCallerIdentity",
+            {},
+            credentials=credentials,
+            region=region or settings.aws_region,
+        )
+        result = root.find("sts:GetCallerIdentityResult", _NS)
+        return {
+            "Arn": _text(result, "sts:Arn"),
+            "UserId": _text(result, "sts:UserId"),
+            "Account": _text(result, "sts:Account"),
+        }
@@ -52,4 +52,52 @@ def run_prod_server() -> None:
     WSGIApplication().run()
 
 
-__all__ = ["run_dev_server", "run_prod_server"]
+def run_prod_asgi_server() -> None:
+    """Launch gunicorn with uvicorn workers serving the ASGI application.
+
+    Every worker keeps one event loop for its lifetime, so pooled Redis and
+    HTTP connections are reused across requests instead of being rebuilt by
+    ``async_to_sync`` for each one.
+    """
+    _configure_django()
+    from gunicorn.app.wsgiapp import WSGIApplication
+
+    bind = os.environ.get("SUNRIN_GUNICORN_BIND", "0.0.0.0:8000")
+    workers = os.environ.get("SUNRIN_GUNICORN_WORKERS", "4")
+    timeout = os.environ.get("SUNRIN_GUNICORN_TIMEOUT", "30")
+    keepalive = os.environ.get("SUNRIN_GUNICORN_KEEPALIVE", "5")
+    max_requests = os.environ.get("SUNRIN_GUNICORN_MAX_REQUESTS", "0")
+    backlog = os.environ.get("SUNRIN_GUNICORN_BACKLOG", "2048")
+
+    sys.argv = [
+        "gunicorn",
+        "managed_iam_site.asgi:application",
+        "--worker-class",
+        "managed_iam.server.AsgiWorker",
+        "--bind",
+        bind,
+        "--workers",
+        workers,
+        "--timeout",
+        timeout,
+        "--graceful-timeout",
+        timeout,
+        "--keep-alive",
+        keepalive,
+        "--max-requests",
+        max_requests,
+        "--max-requests-jitter",
+        str(int(max_requests) // 10),
+        "--backlog",
+        backlog,
+    ]
+    WSGIApplication().run()
+
+
+def run_worker() -> None:
+    """Run a workload job worker; start several to share the queue."""
+    _configure_django()
+    _run_command(["manage.py", "workload_worker"])
+
+
+__all__ = ["run_dev_server", "run_prod_asgi_server", "run_prod_server", "run_worker"]
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import AnyHttpUrl, Field, RootModel, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -22,6 +22,17 @@ class Settings(BaseSettings):
     environment: str = Field(default="dev")
 
     redis_url: str = Field(default="redis://localhost:6379/0")
+    redis_max_connections: int = Field(default=50, ge=1)
+    redis_pool_timeout_seconds: float = Field(
+        default=5.0,
+        description="How long a request waits for a free pooled connection before failing.",
+    )
+    redis_socket_keepalive: bool = Field(default=True)
+    redis_health_check_interval: int = Field(
+        default=30,
+        description="Seconds of idleness after which a pooled connection is PINGed before reuse.",
+    )
+    redis_warm_connections: int = Field(default=2, ge=0)
 
     encryption_key: str = Field(
         ...,
@@ -50,9 +61,18 @@ class Settings(BaseSettings):
         default=False,
         description="Set true when the template bucket/object is already public, so no presign is required.",
     )
+    template_presign_mode: Literal["sigv4", "boto3"] = Field(
+        default="sigv4",
+        description="'sigv4' presigns template URLs in-process; 'boto3' uses an S3 client's generate_presigned_url.",
+    )
 
     validation_endpoint_base: AnyHttpUrl = Field(default="https://test.sunrin.us")
 
+    json_backend: Literal["auto", "orjson", "stdlib"] = Field(
+        default="auto",
+        description="Encoder for non-model JSON responses; 'auto' uses orjson when installed, else the stdlib.",
+    )
+
     cors_origins: Optional[CorsOrigins] = None
 
     log_bucket_tag_key: str = Field(default="Managed")
@@ -62,7 +82,177 @@ class Settings(BaseSettings):
 
     rate_limit_window_seconds: int = Field(default=60)
     rate_limit_max_requests: int = Field(default=10)
+    rate_limit_algorithm: Literal["fixed_window", "sliding_window", "gcra", "leased"] = Field(
+        default="sliding_window",
+        description="Redis Lua limiter used for per-user/org request quotas ('leased' decides mostly in-process).",
+    )
+    rate_limit_lease_size: int = Field(
+        default=5,
+        ge=1,
+        description="Quota units one process leases from Redis at a time; bounds how far local decisions drift.",
+    )
+    rate_limit_lease_sync_ms: int = Field(
+        default=1000,
+        ge=1,
+        description="How long a lease (or a cached refusal) is trusted before reconciling with Redis.",
+    )
+    org_record_format: Literal["v1", "v2"] = Field(
+        default="v1",
+        description="Layout for new org hash writes; readers accept both. Opt in to 'v2' once no pre-v2 worker is running.",
+    )
     idempotency_ttl_seconds: int = Field(default=3600)
+    idempotency_lock_seconds: int = Field(
+        default=30,
+        ge=1,
+        description="Lifetime of an in-progress claim, so a crashed worker does not block retries for long.",
+    )
+    idempotency_wait_ms: int = Field(
+        default=2000,
+        ge=0,
+        description="How long a retry waits for an in-progress request before answering 409.",
+    )
+    api_key_cache_max_entries: int = Field(
+        default=1024,
+        description="Upper bound on verified API keys remembered per process (0 disables the cache).",
+    )
+    api_key_cache_ttl_seconds: int = Field(
+        default=300,
+        description="How long a successful PBKDF2 verification is trusted before re-hashing.",
+    )
+    org_cache_max_entries: int = Field(
+        default=1024,
+        description="Organisation records kept per process (0 disables; HMGET field projections apply only while off or bypassed).",
+    )
+    org_cache_ttl_seconds: float = Field(
+        default=30,
+        description="Upper bound on how long a cached organisation record is served.",
+    )
+    org_cache_pubsub_enabled: bool = Field(
+        default=True,
+        description="Invalidate cached organisations in every worker over Redis pub/sub (otherwise TTL only).",
+    )
+    integration_links_cache_max_entries: int = Field(
+        default=512,
+        description="Built integration links (console URL, CLI command, presigned template URL) kept per process.",
+    )
+    integration_links_refresh_margin_seconds: int = Field(
+        default=300,
+        ge=0,
+        description="Rebuild cached links this long before their presigned template URL expires.",
+    )
+    aws_max_pool_connections: int = Field(
+        default=25,
+        description="urllib3 connection pool size for each cached boto3 client.",
+    )
+    aws_credential_client_cache_size: int = Field(
+        default=128,
+        description="LRU bound on boto3 clients built from per-tenant temporary credentials.",
+    )
+    aws_prewarm_services: List[str] = Field(
+        default_factory=lambda: ["sts", "s3"],
+        description="boto3 clients built when the WSGI/ASGI application loads (empty disables pre-warming).",
+    )
+    sts_client_mode: Literal["httpx", "boto3"] = Field(
+        default="httpx",
+        description="'httpx' signs STS calls in-process on the event loop; 'boto3' runs boto3 in a worker thread.",
+    )
+    sts_endpoint_url: str | None = Field(
+        default=None,
+        description="Override the regional STS endpoint (e.g. a local stand-in server).",
+    )
+    sts_http_timeout_seconds: float = Field(default=10.0)
+    sts_http_max_connections: int = Field(default=50, ge=1)
+    sts_cache_max_entries: int = Field(
+        default=512,
+        description="Assumed-role credentials kept per process (0 disables the cache).",
+    )
+    sts_cache_refresh_margin_seconds: int = Field(
+        default=300,
+        description="Cached credentials are refreshed this long before STS says they expire.",
+    )
+    sts_cache_refresh_jitter_seconds: int = Field(default=60, ge=0)
+    sts_cache_redis_enabled: bool = Field(
+        default=False,
+        description="Share encrypted assumed-role credentials between workers through Redis.",
+    )
+    sts_singleflight_lock_ms: int = Field(
+        default=5000,
+        description="Redis lock lifetime used to coalesce AssumeRole across workers (needs the Redis cache tier; 0 disables).",
+    )
+    credentials_batch_max_accounts: int = Field(
+        default=50,
+        ge=1,
+        description="Upper bound on target accounts accepted by one /api/credentials/batch request.",
+    )
+    credentials_batch_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="AssumeRole calls a single batch request keeps in flight at once.",
+    )
+    stack_watch_min_interval_seconds: float = Field(
+        default=2.0,
+        gt=0,
+        description="Poll interval for a watched workload stack while it is changing or in progress.",
+    )
+    stack_watch_max_interval_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        description="Upper bound the poll interval backs off to while a watched stack is idle.",
+    )
+    stack_watch_history: int = Field(
+        default=25,
+        ge=1,
+        description="Recent stack events kept per watched stack and replayed to new viewers.",
+    )
+    stack_watch_stream_seconds: int = Field(
+        default=600,
+        ge=1,
+        description="Lifetime of one event stream; browsers reconnect (with Last-Event-ID) afterwards.",
+    )
+    portal_links_timeout_seconds: float = Field(
+        default=2.0,
+        gt=0,
+        description="Time the portal waits for integration links before rendering without them.",
+    )
+    portal_stack_status_timeout_seconds: float = Field(
+        default=3.0,
+        gt=0,
+        description="Time the portal waits for AssumeRole + DescribeStacks before showing a loading placeholder.",
+    )
+    workload_job_mode: Literal["queue", "inline"] = Field(
+        default="queue",
+        description="'queue' hands portal deploys/deletes to the worker process; 'inline' runs them in the request.",
+    )
+    workload_job_max_attempts: int = Field(
+        default=5,
+        ge=1,
+        description="Attempts per workload job; only throttling, AWS-side faults and network errors are retried.",
+    )
+    workload_job_retry_base_seconds: float = Field(default=5.0, gt=0)
+    workload_job_retry_max_seconds: float = Field(default=300.0, gt=0)
+    workload_job_lock_seconds: int = Field(
+        default=900,
+        ge=1,
+        description="How long an organisation's queued or running job blocks new ones if the worker never finishes it.",
+    )
+    workload_job_claim_idle_seconds: float = Field(
+        default=120.0,
+        gt=0,
+        description="Unacknowledged jobs idle this long are taken over from a stopped worker; must exceed a job's run time.",
+    )
+    workload_job_ttl_seconds: int = Field(default=604800, ge=1, description="Retention of job status records.")
+    workload_job_stream_maxlen: int = Field(default=10000, ge=1)
+    workload_worker_concurrency: int = Field(default=4, ge=1, description="Jobs one worker process runs at a time.")
+    workload_worker_shutdown_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="Time a stopping worker waits for running jobs before leaving them to be reclaimed.",
+    )
+    crypto_executor_mode: Literal["thread", "process"] = Field(
+        default="thread",
+        description="Pool type used for PBKDF2/AES-GCM work; hashlib releases the GIL so threads usually suffice.",
+    )
+    crypto_executor_workers: int = Field(default=4, ge=1)
     django_debug: bool = Field(
         default=False,
         description="Mirror Django's DEBUG flag so both settings derive from the same env var.",
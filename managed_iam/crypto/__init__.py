@@ -1,7 +1,18 @@
 """Cryptographic helpers."""
 
 from .encryption import EnvelopeCipher
+from .executor import CryptoExecutor, ExecutorStats, get_crypto_executor
 from .hmac import HmacVerifier
 from .hashing import VerificationHash
+from .keycache import KeyCacheStats, VerifiedKeyCache
 
-__all__ = ["EnvelopeCipher", "HmacVerifier", "VerificationHash"]
+__all__ = [
+    "CryptoExecutor",
+    "EnvelopeCipher",
+    "ExecutorStats",
+    "HmacVerifier",
+    "KeyCacheStats",
+    "VerificationHash",
+    "VerifiedKeyCache",
+    "get_crypto_executor",
+]
@@ -0,0 +1,114 @@
+"""Dedicated executor for CPU-bound hashing and decryption."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+from managed_iam.config import settings
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExecutorStats:
+    mode: str
+    workers: int
+    submitted: int = 0
+    completed: int = 0
+    in_flight: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    run_seconds_total: float = 0.0
+
+
+def _timed_call(func: Callable[..., T], submitted_at: float, *args: Any) -> tuple[float, float, T]:
+    # Module level so it can be pickled into process workers. time.monotonic is
+    # system-wide on the platforms we deploy to, so the delta is meaningful there too.
+    started_at = time.monotonic()
+    result = func(*args)
+    return started_at - submitted_at, time.monotonic() - started_at, result
+
+
+class CryptoExecutor:
+    """Run PBKDF2 and AES-GCM calls away from the event loop.
+
+    ``hashlib.pbkdf2_hmac`` and the ``cryptography`` AEAD primitives release the
+    GIL, so a thread pool gives real parallelism; ``mode="process"`` is available
+    for deployments that prefer isolating the work entirely.
+    """
+
+    def __init__(self, *, mode: str = "thread", workers: int = 4) -> None:
+        if mode not in {"thread", "process"}:
+            raise ValueError("crypto executor mode must be 'thread' or 'process'")
+        self._mode = mode
+        self._workers = max(1, workers)
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._stats = ExecutorStats(mode=mode, workers=self._workers)
+
+    def _ensure_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self._mode == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self._workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="crypto")
+            return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        executor = self._ensure_executor()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._stats.submitted += 1
+            self._stats.in_flight += 1
+            # Anything beyond the worker count is necessarily waiting in the pool's queue.
+            queued = max(0, self._stats.in_flight - self._workers)
+            self._stats.max_queue_depth = max(self._stats.max_queue_depth, queued)
+        call = functools.partial(_timed_call, func, time.monotonic(), *args)
+        try:
+            waited, ran, result = await loop.run_in_executor(executor, call)
+        finally:
+            with self._lock:
+                self._stats.in_flight -= 1
+        with self._lock:
+            self._stats.completed += 1
+            self._stats.wait_seconds_total += waited
+            self._stats.wait_seconds_max = max(self._stats.wait_seconds_max, waited)
+            self._stats.run_seconds_total += ran
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            snapshot = ExecutorStats(**self._stats.__dict__)
+        snapshot.queue_depth = max(0, snapshot.in_flight - self._workers)
+        return snapshot
+
+
+_crypto_executor: CryptoExecutor | None = None
+_crypto_executor_lock = threading.Lock()
+
+
+def get_crypto_executor() -> CryptoExecutor:
+    """Return the process-wide crypto executor, creating it on first use."""
+    global _crypto_executor
+    with _crypto_executor_lock:
+        if _crypto_executor is None:
+            _crypto_executor = CryptoExecutor(
+                mode=settings.crypto_executor_mode,
+                workers=settings.crypto_executor_workers,
+            )
+        return _crypto_executor
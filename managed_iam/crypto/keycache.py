@@ -0,0 +1,97 @@
+"""Bounded cache of API keys that already passed PBKDF2 verification."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+
+@dataclass
+class KeyCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+@dataclass
+class VerifiedKeyCache:
+    """Remember successful API key verifications so repeat calls skip PBKDF2.
+
+    Entries are keyed by an HMAC digest of ``org_name`` and ``api_key`` under a
+    per-process random secret, so the plaintext key is never retained. Each
+    entry also pins the ``api_key_hash`` it was verified against; a record whose
+    hash has since changed is treated as a miss.
+    """
+
+    max_entries: int = 1024
+    ttl_seconds: float = 300.0
+    secret: bytes = field(default_factory=lambda: os.urandom(32))
+
+    def __post_init__(self) -> None:
+        self._entries: OrderedDict[bytes, tuple[str, str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = KeyCacheStats()
+
+    def _digest(self, org_name: str, api_key: str) -> bytes:
+        message = b"\x00".join([org_name.encode(), api_key.encode()])
+        return hmac.new(self.secret, message, hashlib.sha256).digest()
+
+    def check(self, *, org_name: str, api_key: str, api_key_hash: str) -> bool:
+        if self.max_entries <= 0:
+            return False
+        digest = self._digest(org_name, api_key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self._stats.misses += 1
+                return False
+            _, cached_hash, expires_at = entry
+            if expires_at <= now or not hmac.compare_digest(cached_hash, api_key_hash):
+                del self._entries[digest]
+                self._stats.misses += 1
+                return False
+            self._entries.move_to_end(digest)
+            self._stats.hits += 1
+            return True
+
+    def store(self, *, org_name: str, api_key: str, api_key_hash: str) -> None:
+        if self.max_entries <= 0:
+            return
+        digest = self._digest(org_name, api_key)
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[digest] = (org_name, api_key_hash, expires_at)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate(self, org_name: str) -> None:
+        """Drop every cached verification for ``org_name``."""
+        with self._lock:
+            stale = [digest for digest, entry in self._entries.items() if entry[0] == org_name]
+            for digest in stale:
+                del self._entries[digest]
+            self._stats.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> KeyCacheStats:
+        with self._lock:
+            return KeyCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                size=len(self._entries),
+            )
@@ -0,0 +1,95 @@
+"""Per-event-loop shared objects that are released when their loop finishes."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Awaitable, Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LoopExitCallback = Callable[[asyncio.AbstractEventLoop], Awaitable[None]]
+
+_exit_callbacks: dict[asyncio.AbstractEventLoop, list[LoopExitCallback]] = {}
+_finalisers: dict[asyncio.AbstractEventLoop, asyncio.Task[None]] = {}
+_exit_lock = threading.Lock()
+
+
+async def _finalise(loop: asyncio.AbstractEventLoop) -> None:
+    try:
+        # Parked until ``asyncio.run`` cancels the tasks still pending as it shuts the loop down.
+        await loop.create_future()
+    finally:
+        with _exit_lock:
+            callbacks = _exit_callbacks.pop(loop, [])
+            _finalisers.pop(loop, None)
+        for callback in callbacks:
+            try:
+                await callback(loop)
+            except Exception:  # noqa: BLE001 - one failed close must not skip the rest
+                logger.warning("closing loop-local resource failed", exc_info=True)
+
+
+def on_loop_exit(callback: LoopExitCallback) -> None:
+    """Await ``callback(loop)`` on the running loop while ``asyncio.run`` shuts it down."""
+    loop = asyncio.get_running_loop()
+    with _exit_lock:
+        _exit_callbacks.setdefault(loop, []).append(callback)
+        if loop not in _finalisers:
+            _finalisers[loop] = loop.create_task(_finalise(loop), name="loop-local-finaliser")
+
+
+class LoopLocal(Generic[T]):
+    """One value per running event loop, closed when that loop finishes.
+
+    asyncio clients and pools belong to the loop that created them. Under the
+    ASGI lifespan one loop serves the worker for its whole life and ``close``
+    is called on shutdown; under WSGI every async view runs on a fresh
+    ``asyncio.run`` loop (asgiref's ``async_to_sync``), so the value is closed
+    by ``on_loop_exit`` before that loop is discarded. Values are held in a
+    plain dict: a weak key would never die, since the sockets and transports
+    they own refer back to the loop.
+    """
+
+    def __init__(self, factory: Callable[[], T], *, close: Callable[[T], Awaitable[None]] | None = None) -> None:
+        self._factory = factory
+        self._close = close
+        self._values: dict[asyncio.AbstractEventLoop, T] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """The running loop's value, created on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop in self._values:
+                return self._values[loop]
+            value = self._values[loop] = self._factory()
+        on_loop_exit(self._release)
+        return value
+
+    def peek(self) -> T | None:
+        """The running loop's value if one was created, without creating it."""
+        with self._lock:
+            return self._values.get(asyncio.get_running_loop())
+
+    def values(self) -> list[T]:
+        with self._lock:
+            return list(self._values.values())
+
+    async def close(self) -> None:
+        """Close and forget the running loop's value now instead of when the loop ends."""
+        await self._release(asyncio.get_running_loop())
+
+    async def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        with self._lock:
+            if loop not in self._values:
+                return
+            value = self._values.pop(loop)
+        if self._close is not None:
+            await self._close(value)
+
+
+__all__ = ["LoopLocal", "on_loop_exit"]
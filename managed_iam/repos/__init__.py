@@ -1,6 +1,6 @@
 """Repositories for persistent state."""
 
-from .models import OrgRecord
+from .models import AnyOrgRecord, LazyOrgRecord, OrgRecord
 from .orgs import OrgRepository
 
-__all__ = ["OrgRecord", "OrgRepository"]
+__all__ = ["AnyOrgRecord", "LazyOrgRecord", "OrgRecord", "OrgRepository"]
@@ -0,0 +1,184 @@
+"""Field encodings for organisation hashes.
+
+v1 hashes use the long field names, base64 for ciphertexts, ``""``
+placeholders for unset fields, an ISO timestamp and JSON tags. v2 hashes
+use one-letter field names, raw ciphertext bytes, a packed timestamp and
+length-prefixed tags, leave unset fields out, and carry ``_v = 2``.
+
+Records can be mixed while a migration is running, so every field is read
+from its v2 name first and its v1 name otherwise.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import struct
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping
+
+FORMAT_FIELD = b"_v"
+COMPACT_VERSION = b"2"
+
+COMPACT_NAMES: dict[str, bytes] = {
+    "owner_user_id": b"o",
+    "api_key_cipher": b"k",
+    "api_key_hash": b"h",
+    "external_id_cipher": b"x",
+    "validation_status": b"s",
+    "validation_updated_at": b"t",
+    "account_id": b"a",
+    "account_partition": b"p",
+    "account_tags": b"g",
+}
+
+_LENGTH = struct.Struct(">H")
+_MICROS = struct.Struct(">q")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def stored_names(fields: Iterable[str]) -> list[bytes]:
+    """Both hash field names for each logical field, v2 first."""
+    names: list[bytes] = []
+    for field in fields:
+        names.extend((COMPACT_NAMES[field], field.encode()))
+    return names
+
+
+def is_compact(raw: Mapping[bytes, bytes | None]) -> bool:
+    """Marked v2 and holding no v1 field; a v1 write after the migration leaves the marker behind."""
+    if raw.get(FORMAT_FIELD) != COMPACT_VERSION:
+        return False
+    return all(raw.get(field.encode()) is None for field in COMPACT_NAMES)
+
+
+def has_field(raw: Mapping[bytes, bytes | None], field: str) -> bool:
+    return COMPACT_NAMES[field] in raw or field.encode() in raw
+
+
+def decode_field(raw: Mapping[bytes, bytes | None], field: str) -> Any:
+    compact = raw.get(COMPACT_NAMES[field])
+    if compact is not None:
+        return _COMPACT_DECODERS[field](compact)
+    return _V1_DECODERS[field](raw.get(field.encode()))
+
+
+def encode_fields(values: Mapping[str, Any], *, compact: bool) -> dict[bytes, bytes]:
+    """Encode logical field values for ``HSET``; v2 drops unset values instead of storing placeholders."""
+    if not compact:
+        return {field.encode(): _V1_ENCODERS[field](value) for field, value in values.items()}
+    return {
+        COMPACT_NAMES[field]: _COMPACT_ENCODERS[field](value)
+        for field, value in values.items()
+        if value is not None and value is not False
+    }
+
+
+def superseded_names(fields: Iterable[str], *, compact: bool) -> list[bytes]:
+    """Names in the other layout that a write of ``fields`` must delete so readers never see stale values."""
+    return [field.encode() if compact else COMPACT_NAMES[field] for field in fields]
+
+
+def _text(raw: bytes | None) -> str:
+    return raw.decode() if raw else ""
+
+
+def _optional_text(raw: bytes | None) -> str | None:
+    return raw.decode() if raw else None
+
+
+def _v1_timestamp(raw: bytes | None) -> datetime | None:
+    return datetime.fromisoformat(raw.decode()) if raw else None
+
+
+def _v1_tags(raw: bytes | None) -> dict[str, str] | None:
+    if not raw:
+        return None
+    try:
+        obj = json.loads(raw.decode())
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(obj, dict):
+        return None
+    return {str(k): str(v) for k, v in obj.items()}
+
+
+def _compact_timestamp(raw: bytes) -> datetime:
+    (micros,) = _MICROS.unpack(raw)
+    return datetime.fromtimestamp(micros / 1_000_000, tz=timezone.utc)
+
+
+def _pack_timestamp(value: datetime) -> bytes:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return _MICROS.pack((delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds)
+
+
+def _pack_tags(tags: Mapping[str, str]) -> bytes:
+    parts = []
+    for key, value in tags.items():
+        for item in (str(key).encode(), str(value).encode()):
+            parts.append(_LENGTH.pack(len(item)))
+            parts.append(item)
+    return b"".join(parts)
+
+
+def _unpack_tags(raw: bytes) -> dict[str, str]:
+    items: list[str] = []
+    offset = 0
+    while offset < len(raw):
+        (length,) = _LENGTH.unpack_from(raw, offset)
+        offset += _LENGTH.size
+        items.append(raw[offset : offset + length].decode())
+        offset += length
+    return dict(zip(items[::2], items[1::2]))
+
+
+_V1_DECODERS = {
+    "owner_user_id": _text,
+    "api_key_cipher": lambda raw: base64.b64decode(raw or b""),
+    "api_key_hash": _text,
+    "external_id_cipher": lambda raw: base64.b64decode(raw or b""),
+    "validation_status": lambda raw: raw == b"1",
+    "validation_updated_at": _v1_timestamp,
+    "account_id": _optional_text,
+    "account_partition": _optional_text,
+    "account_tags": _v1_tags,
+}
+
+_COMPACT_DECODERS = {
+    "owner_user_id": bytes.decode,
+    "api_key_cipher": bytes,
+    "api_key_hash": bytes.decode,
+    "external_id_cipher": bytes,
+    "validation_status": lambda raw: raw == b"1",
+    "validation_updated_at": _compact_timestamp,
+    "account_id": _optional_text,
+    "account_partition": _optional_text,
+    "account_tags": _unpack_tags,
+}
+
+_V1_ENCODERS = {
+    "owner_user_id": str.encode,
+    "api_key_cipher": base64.b64encode,
+    "api_key_hash": str.encode,
+    "external_id_cipher": base64.b64encode,
+    "validation_status": lambda value: b"1" if value else b"0",
+    "validation_updated_at": lambda value: value.isoformat().encode() if value else b"",
+    "account_id": lambda value: (value or "").encode(),
+    "account_partition": lambda value: (value or "").encode(),
+    "account_tags": lambda value: json.dumps(value).encode() if value is not None else b"",
+}
+
+_COMPACT_ENCODERS = {
+    "owner_user_id": str.encode,
+    "api_key_cipher": bytes,
+    "api_key_hash": str.encode,
+    "external_id_cipher": bytes,
+    "validation_status": lambda value: b"1",
+    "validation_updated_at": _pack_timestamp,
+    "account_id": str.encode,
+    "account_partition": str.encode,
+    "account_tags": _pack_tags,
+}
@@ -4,6 +4,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
+from typing import Any, Mapping, Union
+
+from . import codec
 
 
 @dataclass(slots=True)
@@ -18,3 +22,112 @@ class OrgRecord:
     account_id: str | None = None
     account_partition: str | None = None
     account_tags: dict[str, str] | None = None
+
+
+ORG_FIELDS = (
+    "owner_user_id",
+    "api_key_cipher",
+    "api_key_hash",
+    "external_id_cipher",
+    "validation_status",
+    "validation_updated_at",
+    "account_id",
+    "account_partition",
+    "account_tags",
+)
+
+
+class LazyOrgRecord:
+    """Read-only ``OrgRecord`` over raw Redis hash fields, decoding each field on first access.
+
+    Records read with a field projection only carry the requested fields;
+    touching any other field raises ``AttributeError``. ``complete`` records
+    came from ``HGETALL``, so a missing field there simply means it is unset.
+    Both hash layouts in ``codec`` are understood.
+    """
+
+    def __init__(self, org_name: str, raw: Mapping[bytes, bytes | None], *, complete: bool = False) -> None:
+        self.org_name = org_name
+        self._raw = dict(raw)
+        self._complete = complete
+
+    @property
+    def compact(self) -> bool:
+        """Whether the hash has been fully rewritten in the v2 layout."""
+        return codec.is_compact(self._raw)
+
+    @property
+    def complete(self) -> bool:
+        return self._complete
+
+    def snapshot(self) -> dict[bytes, bytes | None]:
+        """Copy of the raw hash fields read so far."""
+        return dict(self._raw)
+
+    def loaded(self, field: str) -> bool:
+        return self._complete or codec.has_field(self._raw, field)
+
+    def load(self, values: Mapping[bytes, bytes | None]) -> None:
+        """Add hash fields fetched after the initial read."""
+        self._raw.update(values)
+        for field in codec.COMPACT_NAMES:
+            self.__dict__.pop(field, None)
+
+    def _value(self, field: str) -> Any:
+        if not self.loaded(field):
+            raise AttributeError(f"org field '{field}' was not loaded")
+        return codec.decode_field(self._raw, field)
+
+    @cached_property
+    def owner_user_id(self) -> str:
+        return self._value("owner_user_id")
+
+    @cached_property
+    def api_key_cipher(self) -> bytes:
+        return self._value("api_key_cipher")
+
+    @cached_property
+    def api_key_hash(self) -> str:
+        return self._value("api_key_hash")
+
+    @cached_property
+    def external_id_cipher(self) -> bytes:
+        return self._value("external_id_cipher")
+
+    @cached_property
+    def validation_status(self) -> bool:
+        return self._value("validation_status")
+
+    @cached_property
+    def validation_updated_at(self) -> datetime | None:
+        return self._value("validation_updated_at")
+
+    @cached_property
+    def account_id(self) -> str | None:
+        return self._value("account_id")
+
+    @cached_property
+    def account_partition(self) -> str | None:
+        return self._value("account_partition")
+
+    @cached_property
+    def account_tags(self) -> dict[str, str] | None:
+        return self._value("account_tags")
+
+    def materialise(self) -> OrgRecord:
+        """Decode every field into a plain ``OrgRecord``; the record must have been read in full."""
+        return OrgRecord(
+            org_name=self.org_name,
+            owner_user_id=self.owner_user_id,
+            api_key_cipher=self.api_key_cipher,
+            api_key_hash=self.api_key_hash,
+            external_id_cipher=self.external_id_cipher,
+            validation_status=self.validation_status,
+            validation_updated_at=self.validation_updated_at,
+            account_id=self.account_id,
+            account_partition=self.account_partition,
+            account_tags=self.account_tags,
+        )
+
+
+AnyOrgRecord = Union[OrgRecord, LazyOrgRecord]
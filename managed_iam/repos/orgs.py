@@ -2,55 +2,91 @@
 
 from __future__ import annotations
 
-import base64
-import json
 from datetime import datetime, timezone
-from typing import Mapping, Optional
+from typing import AsyncIterator, Iterable, Mapping, Optional
 
 from redis.asyncio import Redis
+from redis.exceptions import WatchError
 
 from managed_iam.config import settings
-from managed_iam.crypto import EnvelopeCipher, VerificationHash
+from managed_iam.crypto import CryptoExecutor, EnvelopeCipher, VerificationHash, VerifiedKeyCache, get_crypto_executor
 from managed_iam.storage import RedisFactory
 
-from .models import OrgRecord
+from . import codec
+from .models import ORG_FIELDS, AnyOrgRecord, LazyOrgRecord, OrgRecord
 
 
 ORG_KEY_TEMPLATE = "v1:orgs:{org_name}"
 USER_ORG_KEY_TEMPLATE = "v1:users:{user_id}:orgs"
 
+# What API-key checks and their callers read: ownership, validation state and the linked account.
+VERIFY_FIELDS = ("owner_user_id", "validation_status", "account_id")
+
+# KEYS: org hash, owner's org index. ARGV: org name, then hash field/value pairs.
+_CREATE_ORG_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('SADD', KEYS[2], ARGV[1])
+return 1
+"""
+
+
+verified_key_cache = VerifiedKeyCache(
+    max_entries=settings.api_key_cache_max_entries,
+    ttl_seconds=settings.api_key_cache_ttl_seconds,
+)
+
 
 class OrgRepository:
     """Persist organisation metadata in Redis."""
 
-    def __init__(self, redis: Optional[Redis] = None) -> None:
+    def __init__(
+        self,
+        redis: Optional[Redis] = None,
+        key_cache: VerifiedKeyCache | None = None,
+        executor: CryptoExecutor | None = None,
+        cipher: EnvelopeCipher | None = None,
+        hasher: VerificationHash | None = None,
+    ) -> None:
         self._redis = redis or RedisFactory.client()
-        self._cipher = EnvelopeCipher(settings.decode_encryption_key())
-        self._hasher = VerificationHash()
+        self._cipher = cipher or EnvelopeCipher(settings.decode_encryption_key())
+        self._hasher = hasher or VerificationHash()
+        self._key_cache = key_cache or verified_key_cache
+        self._executor = executor or get_crypto_executor()
+        self._compact = settings.org_record_format == "v2"
 
     async def create_org(self, *, org_name: str, owner_user_id: str, api_key: str, external_id: str) -> OrgRecord:
         key = ORG_KEY_TEMPLATE.format(org_name=org_name)
-        exists = await self._redis.exists(key)
-        if exists:
+        api_key_cipher = await self._executor.run(self._cipher.encrypt, api_key.encode())
+        external_cipher = await self._executor.run(self._cipher.encrypt, external_id.encode())
+        api_key_hash = await self._executor.run(self._hasher.hash, api_key)
+
+        payload = codec.encode_fields(
+            {
+                "owner_user_id": owner_user_id,
+                "api_key_cipher": api_key_cipher,
+                "api_key_hash": api_key_hash,
+                "external_id_cipher": external_cipher,
+                "validation_status": False,
+                "validation_updated_at": None,
+                "account_id": None,
+                "account_partition": None,
+                "account_tags": None,
+            },
+            compact=self._compact,
+        )
+        if self._compact:
+            payload[codec.FORMAT_FIELD] = codec.COMPACT_VERSION
+        # Existence check, hash write and owner index update happen atomically in one round trip.
+        created = await self._redis.register_script(_CREATE_ORG_SCRIPT)(
+            keys=[key, USER_ORG_KEY_TEMPLATE.format(user_id=owner_user_id)],
+            args=[org_name, *(item for pair in payload.items() for item in pair)],
+        )
+        if not created:
             raise ValueError("organisation already exists")
-
-        api_key_cipher = self._cipher.encrypt(api_key.encode())
-        external_cipher = self._cipher.encrypt(external_id.encode())
-        api_key_hash = self._hasher.hash(api_key)
-
-        payload = {
-            b"owner_user_id": owner_user_id.encode(),
-            b"api_key_cipher": base64.b64encode(api_key_cipher),
-            b"api_key_hash": api_key_hash.encode(),
-            b"external_id_cipher": base64.b64encode(external_cipher),
-            b"validation_status": b"0",
-            b"validation_updated_at": b"",
-            b"account_id": b"",
-            b"account_partition": b"",
-            b"account_tags": b"",
-        }
-        await self._redis.hset(key, mapping=payload)
-        await self._redis.sadd(USER_ORG_KEY_TEMPLATE.format(user_id=owner_user_id), org_name)
+        self._key_cache.invalidate(org_name)
 
         return OrgRecord(
             org_name=org_name,
@@ -65,66 +101,59 @@ class OrgRepository:
             account_tags=None,
         )
 
-    async def get_org(self, org_name: str) -> OrgRecord | None:
+    async def get_org(self, org_name: str, fields: Iterable[str] | None = None) -> LazyOrgRecord | None:
+        """Read an organisation; with ``fields`` only those hash fields are fetched (``HMGET``)."""
         key = ORG_KEY_TEMPLATE.format(org_name=org_name)
-        raw = await self._redis.hgetall(key)
-        if not raw:
-            return None
-
-        validation_updated_at = (
-            datetime.fromisoformat(raw[b"validation_updated_at"].decode()) if raw.get(b"validation_updated_at") else None
-        )
-
-        account_id_raw = raw.get(b"account_id")
-        account_partition_raw = raw.get(b"account_partition")
-        account_tags_raw = raw.get(b"account_tags")
-
-        account_id = account_id_raw.decode() if account_id_raw else None
-        if account_id == "":
-            account_id = None
-
-        account_partition = account_partition_raw.decode() if account_partition_raw else None
-        if account_partition == "":
-            account_partition = None
-
-        account_tags = None
-        if account_tags_raw:
-            decoded = account_tags_raw.decode()
-            if decoded:
-                try:
-                    obj = json.loads(decoded)
-                    if isinstance(obj, dict):
-                        account_tags = {str(k): str(v) for k, v in obj.items()}
-                except json.JSONDecodeError:
-                    account_tags = None
-
-        return OrgRecord(
-            org_name=org_name,
-            owner_user_id=raw[b"owner_user_id"].decode(),
-            api_key_cipher=base64.b64decode(raw[b"api_key_cipher"]),
-            api_key_hash=raw[b"api_key_hash"].decode(),
-            external_id_cipher=base64.b64decode(raw[b"external_id_cipher"]),
-            validation_status=raw[b"validation_status"] == b"1",
-            validation_updated_at=validation_updated_at,
-            account_id=account_id,
-            account_partition=account_partition,
-            account_tags=account_tags,
-        )
-
-    async def verify_api_key(self, *, org_name: str, api_key: str) -> OrgRecord | None:
-        record = await self.get_org(org_name)
-        if not record:
+        if fields is None:
+            raw = await self._redis.hgetall(key)
+            if not raw:
+                return None
+            return LazyOrgRecord(org_name, raw, complete=True)
+
+        # owner_user_id is always set, so it doubles as the existence check.
+        names = codec.stored_names(dict.fromkeys(["owner_user_id", *fields]))
+        values = await self._redis.hmget(key, names)
+        if values[0] is None and values[1] is None:
             return None
-
-        if not self._hasher.verify(api_key, record.api_key_hash):
+        return LazyOrgRecord(org_name, dict(zip(names, values)))
+
+    async def _cipher_field(self, record: AnyOrgRecord, field: str) -> bytes:
+        if isinstance(record, LazyOrgRecord) and not record.loaded(field):
+            names = codec.stored_names([field])
+            values = await self._redis.hmget(ORG_KEY_TEMPLATE.format(org_name=record.org_name), names)
+            if values[0] is None and values[1] is None:
+                raise ValueError("organisation not found")
+            record.load(dict(zip(names, values)))
+        return getattr(record, field)
+
+    async def verify_api_key(
+        self,
+        *,
+        org_name: str,
+        api_key: str,
+        fields: Iterable[str] | None = VERIFY_FIELDS,
+    ) -> LazyOrgRecord | None:
+        record = await self.get_org(org_name, fields=None if fields is None else ["api_key_hash", *fields])
+        if not record or not await self.check_api_key(record, api_key):
             return None
         return record
 
-    def decrypt_api_key(self, record: OrgRecord) -> str:
-        return self._cipher.decrypt(record.api_key_cipher).decode()
+    async def check_api_key(self, record: AnyOrgRecord, api_key: str) -> bool:
+        """Check ``api_key`` against a record that was read with ``api_key_hash``."""
+        if self._key_cache.check(org_name=record.org_name, api_key=api_key, api_key_hash=record.api_key_hash):
+            return True
+        if not await self._executor.run(self._hasher.verify, api_key, record.api_key_hash):
+            return False
+        self._key_cache.store(org_name=record.org_name, api_key=api_key, api_key_hash=record.api_key_hash)
+        return True
 
-    def decrypt_external_id(self, record: OrgRecord) -> str:
-        return self._cipher.decrypt(record.external_id_cipher).decode()
+    async def decrypt_api_key(self, record: AnyOrgRecord) -> str:
+        plaintext = await self._executor.run(self._cipher.decrypt, await self._cipher_field(record, "api_key_cipher"))
+        return plaintext.decode()
+
+    async def decrypt_external_id(self, record: AnyOrgRecord) -> str:
+        plaintext = await self._executor.run(self._cipher.decrypt, await self._cipher_field(record, "external_id_cipher"))
+        return plaintext.decode()
 
     async def mark_validated(
         self,
@@ -135,18 +164,60 @@ class OrgRepository:
         account_tags: Mapping[str, str] | None = None,
     ) -> None:
         key = ORG_KEY_TEMPLATE.format(org_name=org_name)
-        mapping: dict[str, str] = {
-            "validation_status": "1",
-            "validation_updated_at": datetime.now(timezone.utc).isoformat(),
+        values: dict[str, object] = {
+            "validation_status": True,
+            "validation_updated_at": datetime.now(timezone.utc),
         }
         if account_id is not None:
-            mapping["account_id"] = account_id
+            values["account_id"] = account_id
         if account_partition is not None:
-            mapping["account_partition"] = account_partition
+            values["account_partition"] = account_partition
         if account_tags is not None:
-            mapping["account_tags"] = json.dumps(account_tags)
-        await self._redis.hset(key, mapping=mapping)
+            values["account_tags"] = dict(account_tags)
+        # Drop the same fields in the other layout so a half-migrated hash never shadows this write.
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=codec.encode_fields(values, compact=self._compact))
+            pipe.hdel(key, *codec.superseded_names(values, compact=self._compact))
+            await pipe.execute()
 
     async def list_orgs_for_user(self, user_id: str) -> list[str]:
         members = await self._redis.smembers(USER_ORG_KEY_TEMPLATE.format(user_id=user_id))
         return sorted(member.decode() if isinstance(member, bytes) else member for member in members)
+
+    async def scan_org_names(self, *, batch_size: int = 100) -> AsyncIterator[list[str]]:
+        """Yield organisation names in ``SCAN`` batches without blocking Redis."""
+        prefix = ORG_KEY_TEMPLATE.format(org_name="")
+        cursor = 0
+        while True:
+            cursor, keys = await self._redis.scan(cursor=cursor, match=f"{prefix}*", count=batch_size)
+            names = [(key.decode() if isinstance(key, bytes) else key)[len(prefix) :] for key in keys]
+            if names:
+                yield names
+            if cursor == 0:
+                return
+
+    async def migrate_to_compact(self, org_name: str) -> str:
+        """Rewrite one hash in the v2 layout; returns ``migrated``, ``compact`` or ``conflict``.
+
+        The read and rewrite run under ``WATCH``, so a concurrent write makes
+        this attempt back off instead of being lost.
+        """
+        key = ORG_KEY_TEMPLATE.format(org_name=org_name)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                raw = await pipe.hgetall(key)
+                if not raw:
+                    return "conflict"
+                record = LazyOrgRecord(org_name, raw, complete=True)
+                if record.compact:
+                    return "compact"
+                payload = codec.encode_fields({field: getattr(record, field) for field in ORG_FIELDS}, compact=True)
+                payload[codec.FORMAT_FIELD] = codec.COMPACT_VERSION
+                pipe.multi()
+                pipe.delete(key)
+                pipe.hset(key, mapping=payload)
+                await pipe.execute()
+            except WatchError:
+                return "conflict"
+        return "migrated"
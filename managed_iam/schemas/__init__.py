@@ -3,7 +3,13 @@
 from .users import UserCreateResponse
 from .orgs import OrgRegisterRequest, OrgRegisterResponse
 from .integrate import IntegrationRequest, IntegrationResponse
-from .sts import CredentialsRequest, CredentialsResponse
+from .sts import (
+    CredentialsBatchItem,
+    CredentialsBatchRequest,
+    CredentialsBatchResponse,
+    CredentialsRequest,
+    CredentialsResponse,
+)
 from .validation import ValidationWebhookPayload, ValidationWebhookResponse
 from .validate import ValidateRequest, ValidateResponse
 
@@ -15,6 +21,9 @@ __all__ = [
     "IntegrationResponse",
     "CredentialsRequest",
     "CredentialsResponse",
+    "CredentialsBatchRequest",
+    "CredentialsBatchItem",
+    "CredentialsBatchResponse",
     "ValidationWebhookPayload",
     "ValidationWebhookResponse",
     "ValidateRequest",
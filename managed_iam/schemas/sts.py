@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+from typing import Annotated, Literal
+
 from pydantic import BaseModel, Field, field_validator
 
+AccountId = Annotated[str, Field(min_length=12, max_length=12)]
+
 
 def _no_spaces(value: str) -> str:
     if " " in value:
@@ -20,6 +24,11 @@ class CredentialsRequest(BaseModel):
     _validate_org = field_validator("org_name")(_no_spaces)
 
 
+# Field groups that ``?fields=`` on /api/credentials accepts besides individual names.
+CREDENTIAL_FIELDS = ("access_key_id", "secret_access_key", "session_token", "expiration")
+LINK_FIELDS = ("console_url", "aws_cli_command", "template_url", "region")
+
+
 class CredentialsResponse(BaseModel):
     access_key_id: str
     secret_access_key: str
@@ -29,3 +38,50 @@ class CredentialsResponse(BaseModel):
     aws_cli_command: str
     template_url: str
     region: str
+
+
+class CredentialsPartialResponse(BaseModel):
+    """``CredentialsResponse`` narrowed by ``?fields=``; only the requested fields are serialised."""
+
+    access_key_id: str | None = None
+    secret_access_key: str | None = None
+    session_token: str | None = None
+    expiration: str | None = None
+    console_url: str | None = None
+    aws_cli_command: str | None = None
+    template_url: str | None = None
+    region: str | None = None
+
+
+class CredentialsBatchRequest(BaseModel):
+    org_name: str
+    target_account_ids: list[AccountId] = Field(min_length=1)
+    role_type: str = Field(pattern="^(readonly)$")
+    api_key: str
+
+    _validate_org = field_validator("org_name")(_no_spaces)
+
+    @field_validator("target_account_ids")
+    @classmethod
+    def _dedupe_accounts(cls, value: list[str]) -> list[str]:
+        return list(dict.fromkeys(value))
+
+
+class CredentialsBatchItem(BaseModel):
+    target_account_id: str
+    status: Literal["issued", "failed"]
+    access_key_id: str | None = None
+    secret_access_key: str | None = None
+    session_token: str | None = None
+    expiration: str | None = None
+    error: str | None = None
+
+
+class CredentialsBatchResponse(BaseModel):
+    results: list[CredentialsBatchItem]
+    issued: int
+    failed: int
+    console_url: str
+    aws_cli_command: str
+    template_url: str
+    region: str
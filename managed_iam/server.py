@@ -0,0 +1,33 @@
+"""gunicorn worker class for serving the ASGI application under uvicorn."""
+
+from __future__ import annotations
+
+import os
+
+try:
+    from uvicorn_worker import UvicornWorker
+except ImportError:  # pragma: no cover - uvicorn < 0.30 still ships the worker itself
+    from uvicorn.workers import UvicornWorker
+
+
+def _optional_int(name: str) -> int | None:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+class AsgiWorker(UvicornWorker):
+    """One event loop per gunicorn worker process, with lifespan events enabled.
+
+    ``SUNRIN_ASGI_LIMIT_CONCURRENCY`` caps in-flight requests per worker (503
+    beyond it) so a burst queues in the kernel backlog instead of piling onto
+    the Redis pool.
+    """
+
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "lifespan": "on",
+        "limit_concurrency": _optional_int("SUNRIN_ASGI_LIMIT_CONCURRENCY"),
+    }
+
+
+__all__ = ["AsgiWorker"]
@@ -6,9 +6,17 @@ from .stack import StackService
 from .integration import IntegrationService
 from .sts import STSService
 from .validation import ValidationWebhookService
-from .idempotency import IdempotencyService, IdempotencyError
-from .ratelimit import RateLimiter, RateLimitExceeded
+from .idempotency import (
+    IdempotencyError,
+    IdempotencyInProgress,
+    IdempotencyMismatch,
+    IdempotencyService,
+)
+from .ratelimit import LeasedRateLimiter, RateLimiter, RateLimitExceeded, RateLimitResult
 from .workload import WorkloadStackService
+from .jobs import WorkloadJob, WorkloadJobInProgress, WorkloadJobQueue
+from .role_cache import AssumedRoleCache, RoleCacheKey
+from .singleflight import SingleFlight
 
 __all__ = [
     "UserService",
@@ -19,7 +27,17 @@ __all__ = [
     "ValidationWebhookService",
     "IdempotencyService",
     "IdempotencyError",
+    "IdempotencyInProgress",
+    "IdempotencyMismatch",
     "RateLimiter",
+    "LeasedRateLimiter",
     "RateLimitExceeded",
+    "RateLimitResult",
     "WorkloadStackService",
+    "WorkloadJob",
+    "WorkloadJobInProgress",
+    "WorkloadJobQueue",
+    "AssumedRoleCache",
+    "RoleCacheKey",
+    "SingleFlight",
 ]
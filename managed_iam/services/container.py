@@ -0,0 +1,180 @@
+"""Process-wide service dependencies and lightweight per-request handles."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+
+from managed_iam.aws import AsyncSTSClient
+from managed_iam.config import settings
+from managed_iam.crypto import CryptoExecutor, EnvelopeCipher, VerificationHash, VerifiedKeyCache, get_crypto_executor
+from managed_iam.repos import OrgRepository
+from managed_iam.repos.orgs import verified_key_cache
+from managed_iam.services.idempotency import IdempotencyService
+from managed_iam.services.integration import IntegrationLinkCache, IntegrationService, integration_link_cache
+from managed_iam.services.jobs import WorkloadJobQueue
+from managed_iam.services.org_cache import OrgRecordCache, org_record_cache
+from managed_iam.services.orgs import OrganisationService
+from managed_iam.services.ratelimit import RateLimiter
+from managed_iam.services.role_cache import AssumedRoleCache, assumed_role_cache
+from managed_iam.services.stack import StackService
+from managed_iam.services.sts import STSService
+from managed_iam.services.users import UserService
+from managed_iam.services.validation import ValidationWebhookService
+from managed_iam.services.workload import WORKLOAD_TEMPLATE_PATH, WorkloadStackService
+from managed_iam.storage import RedisFactory
+
+
+@dataclass(frozen=True)
+class ServiceContainer:
+    """Stateless, thread-safe building blocks shared by every request in the process.
+
+    Nothing bound to an event loop lives here: the Redis client is looked up
+    per request, because WSGI workers run each request on its own loop.
+    """
+
+    cipher: EnvelopeCipher
+    hasher: VerificationHash
+    executor: CryptoExecutor
+    key_cache: VerifiedKeyCache
+    org_cache: OrgRecordCache
+    role_cache: AssumedRoleCache
+    link_cache: IntegrationLinkCache
+    stack: StackService
+    sts_client: AsyncSTSClient
+    workload_template: str
+
+    @classmethod
+    def build(cls) -> ServiceContainer:
+        return cls(
+            cipher=EnvelopeCipher(settings.decode_encryption_key()),
+            hasher=VerificationHash(),
+            executor=get_crypto_executor(),
+            key_cache=verified_key_cache,
+            org_cache=org_record_cache,
+            role_cache=assumed_role_cache,
+            link_cache=integration_link_cache,
+            stack=StackService(),
+            sts_client=AsyncSTSClient(),
+            workload_template=WORKLOAD_TEMPLATE_PATH.read_text(encoding="utf-8"),
+        )
+
+    def request(self, redis: Redis | None = None) -> RequestServices:
+        return RequestServices(self, redis)
+
+
+class RequestServices:
+    """Services for one request, created on first use from the shared container.
+
+    Services built from one handle share one ``OrganisationService``, so its
+    per-request memo covers everything the view calls. (Plain lazy properties:
+    ``cached_property`` takes a lock on every first access before Python 3.12.)
+    """
+
+    def __init__(self, container: ServiceContainer, redis: Redis | None = None) -> None:
+        self._container = container
+        self._redis = redis
+        self._user: UserService | None = None
+        self._org: OrganisationService | None = None
+        self._integration: IntegrationService | None = None
+        self._sts: STSService | None = None
+        self._workload: WorkloadStackService | None = None
+        self._validation: ValidationWebhookService | None = None
+        self._idempotency: IdempotencyService | None = None
+        self._rate_limiter: RateLimiter | None = None
+        self._jobs: WorkloadJobQueue | None = None
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = RedisFactory.client()
+        return self._redis
+
+    @property
+    def user(self) -> UserService:
+        if self._user is None:
+            self._user = UserService(self.redis)
+        return self._user
+
+    @property
+    def org(self) -> OrganisationService:
+        if self._org is None:
+            c = self._container
+            repo = OrgRepository(
+                self.redis,
+                key_cache=c.key_cache,
+                executor=c.executor,
+                cipher=c.cipher,
+                hasher=c.hasher,
+            )
+            self._org = OrganisationService(self.redis, cache=c.org_cache, repo=repo)
+        return self._org
+
+    @property
+    def integration(self) -> IntegrationService:
+        if self._integration is None:
+            c = self._container
+            self._integration = IntegrationService(stack_service=c.stack, org_service=self.org, link_cache=c.link_cache)
+        return self._integration
+
+    @property
+    def sts(self) -> STSService:
+        if self._sts is None:
+            c = self._container
+            self._sts = STSService(self.org, role_cache=c.role_cache, sts_client=c.sts_client)
+        return self._sts
+
+    @property
+    def workload(self) -> WorkloadStackService:
+        if self._workload is None:
+            c = self._container
+            self._workload = WorkloadStackService(
+                template_body=c.workload_template,
+                org_service=self.org,
+                role_cache=c.role_cache,
+            )
+        return self._workload
+
+    @property
+    def validation(self) -> ValidationWebhookService:
+        if self._validation is None:
+            self._validation = ValidationWebhookService(org_service=self.org, redis=self.redis)
+        return self._validation
+
+    @property
+    def idempotency(self) -> IdempotencyService:
+        if self._idempotency is None:
+            self._idempotency = IdempotencyService(self.redis, cipher=self._container.cipher)
+        return self._idempotency
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        if self._rate_limiter is None:
+            self._rate_limiter = RateLimiter(redis=self.redis)
+        return self._rate_limiter
+
+    @property
+    def jobs(self) -> WorkloadJobQueue:
+        if self._jobs is None:
+            self._jobs = WorkloadJobQueue(self.redis)
+        return self._jobs
+
+
+_container: ServiceContainer | None = None
+_lock = threading.Lock()
+
+
+def get_container() -> ServiceContainer:
+    """The process container, built on first use if the startup hook has not run."""
+    global _container
+    if _container is None:
+        with _lock:
+            if _container is None:
+                _container = ServiceContainer.build()
+    return _container
+
+
+def request_services(redis: Redis | None = None) -> RequestServices:
+    return get_container().request(redis)
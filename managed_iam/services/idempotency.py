@@ -1,24 +1,139 @@
-"""Simple Redis-backed idempotency enforcement."""
+"""Redis-backed idempotency with stored-response replay."""
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import hashlib
+import json
+import secrets
+from dataclasses import dataclass
+from typing import Any
+
 from redis.asyncio import Redis
 
 from managed_iam.config import settings
+from managed_iam.crypto import EnvelopeCipher, get_crypto_executor
+from managed_iam.services.singleflight import release_redis_lock
 from managed_iam.storage import RedisFactory
 
+_KEY_TEMPLATE = "v1:idempotency:{key}"
+_POLL_SECONDS = 0.05
+
+_COMPLETE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
 
 class IdempotencyError(Exception):
     """Raised when an idempotency key has already been used."""
 
 
+class IdempotencyInProgress(IdempotencyError):
+    """Raised when the original request is still running after the wait period."""
+
+
+class IdempotencyMismatch(IdempotencyError):
+    """Raised when a key is reused for a different request payload."""
+
+
+@dataclass
+class StoredResponse:
+    status: int
+    body: Any
+
+
+@dataclass
+class IdempotencyClaim:
+    key: str
+    fingerprint: str
+    pending_value: str | None = None
+    replay: StoredResponse | None = None
+
+    @property
+    def acquired(self) -> bool:
+        return self.pending_value is not None
+
+
 class IdempotencyService:
-    def __init__(self, redis: Redis | None = None) -> None:
+    """Claim an ``Idempotency-Key`` and replay the first response to retries.
+
+    A key moves from ``pending`` (claimed with one ``SET NX EX``; the short
+    lock TTL frees it if the worker dies) to ``completed``, which holds the
+    AES-GCM encrypted response for ``idempotency_ttl_seconds``. Retries that
+    arrive while the key is pending wait briefly for the result.
+    """
+
+    def __init__(self, redis: Redis | None = None, cipher: EnvelopeCipher | None = None) -> None:
         self._redis = redis or RedisFactory.client()
+        self._cipher = cipher or EnvelopeCipher(settings.decode_encryption_key())
+
+    @staticmethod
+    def fingerprint(*parts: Any) -> str:
+        material = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    async def claim(self, key: str, fingerprint: str = "") -> IdempotencyClaim:
+        redis_key = _KEY_TEMPLATE.format(key=key)
+        pending = json.dumps({"state": "pending", "token": secrets.token_hex(16), "fingerprint": fingerprint})
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.idempotency_wait_ms / 1000
+        while True:
+            if await self._redis.set(redis_key, pending, nx=True, ex=settings.idempotency_lock_seconds):
+                return IdempotencyClaim(key=redis_key, fingerprint=fingerprint, pending_value=pending)
+
+            raw = await self._redis.get(redis_key)
+            if raw is None:
+                # Released or expired between SET and GET; try to claim again.
+                continue
+            state = json.loads(raw)
+            if state.get("fingerprint") != fingerprint:
+                raise IdempotencyMismatch("idempotency key reused with a different request")
+            if state["state"] == "completed":
+                return IdempotencyClaim(key=redis_key, fingerprint=fingerprint, replay=await self._open(redis_key, state))
+            if loop.time() >= deadline:
+                raise IdempotencyInProgress("request with this idempotency key is still in progress")
+            await asyncio.sleep(_POLL_SECONDS)
+
+    async def complete(self, claim: IdempotencyClaim, *, status: int, body: Any) -> None:
+        """Store the response for replay; a no-op if the claim was lost to expiry."""
+        if not claim.acquired:
+            return
+        sealed = await get_crypto_executor().run(
+            self._cipher.encrypt,
+            json.dumps(body).encode(),
+            claim.key.encode(),
+        )
+        completed = json.dumps(
+            {
+                "state": "completed",
+                "fingerprint": claim.fingerprint,
+                "status": status,
+                "body": base64.b64encode(sealed).decode(),
+            }
+        )
+        await self._redis.eval(
+            _COMPLETE_SCRIPT,
+            1,
+            claim.key,
+            claim.pending_value,
+            completed,
+            settings.idempotency_ttl_seconds,
+        )
+
+    async def release(self, claim: IdempotencyClaim) -> None:
+        """Give the key back after a failure that the client should be able to retry."""
+        if claim.acquired:
+            await release_redis_lock(self._redis, claim.key, claim.pending_value)
 
-    async def claim(self, key: str) -> None:
-        redis_key = f"v1:idempotency:{key}"
-        added = await self._redis.setnx(redis_key, "1")
-        if not added:
-            raise IdempotencyError("idempotency key already used")
-        await self._redis.expire(redis_key, settings.idempotency_ttl_seconds)
+    async def _open(self, redis_key: str, state: dict[str, Any]) -> StoredResponse:
+        plaintext = await get_crypto_executor().run(
+            self._cipher.decrypt,
+            base64.b64decode(state["body"]),
+            redis_key.encode(),
+        )
+        return StoredResponse(status=int(state["status"]), body=json.loads(plaintext))
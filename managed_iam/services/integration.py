@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from shlex import quote as shell_quote
+from typing import Awaitable, Callable
 
 from managed_iam.config import settings
 from managed_iam.services.orgs import OrganisationService
+from managed_iam.services.singleflight import SingleFlight
 from managed_iam.services.stack import StackService
 
 
@@ -18,14 +24,115 @@ class IntegrationLinks:
     region: str
 
 
+LinkCacheKey = tuple[str, str | None, int]
+# Built links plus when their template URL stops working (``None``: it does not expire).
+BuiltLinks = tuple[IntegrationLinks, datetime | None]
+
+
+@dataclass
+class LinkCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    coalesced: int = 0
+    size: int = 0
+    hit_ratio: float = 0.0
+
+
+class IntegrationLinkCache:
+    """Reuse built links per (org, profile, ``expires_in``) until shortly before the template URL expires.
+
+    The URL expires after ``expires_in`` or when the credentials that signed
+    it do, whichever comes first; links that would not outlive the refresh
+    margin are not cached at all. Links embed the organisation's API key and external ID, so they are only
+    ever kept in process memory. Concurrent misses share one build.
+    """
+
+    def __init__(self, *, max_entries: int = 512, refresh_margin_seconds: int = 300) -> None:
+        self._max_entries = max_entries
+        self._refresh_margin = refresh_margin_seconds
+        self._entries: OrderedDict[LinkCacheKey, tuple[IntegrationLinks, float]] = OrderedDict()
+        self._flights: SingleFlight[IntegrationLinks] = SingleFlight()
+        self._lock = threading.Lock()
+        self._stats = LinkCacheStats()
+
+    def _lifetime(self, expires_in: int) -> float:
+        return expires_in - self._refresh_margin if self._max_entries > 0 else 0
+
+    def get(self, key: LinkCacheKey) -> IntegrationLinks | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[0]
+
+    async def get_or_build(self, key: LinkCacheKey, build: Callable[[], Awaitable[BuiltLinks]]) -> IntegrationLinks:
+        lifetime = self._lifetime(key[2])
+        if lifetime <= 0:
+            return (await build())[0]
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return await self._flights.do(key, lambda: self._build_and_store(key, lifetime, build))
+
+    async def _build_and_store(
+        self,
+        key: LinkCacheKey,
+        lifetime: float,
+        build: Callable[[], Awaitable[BuiltLinks]],
+    ) -> IntegrationLinks:
+        # Measured from before signing, so the cached URL always outlives its entry by the margin.
+        expires_at = time.monotonic() + lifetime
+        links, url_expires_at = await build()
+        if url_expires_at is not None:
+            remaining = (url_expires_at - datetime.now(timezone.utc)).total_seconds()
+            expires_at = min(expires_at, time.monotonic() + remaining - self._refresh_margin)
+            if expires_at <= time.monotonic():
+                return links
+        with self._lock:
+            self._entries[key] = (links, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self._stats.stores += 1
+        return links
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> LinkCacheStats:
+        with self._lock:
+            snapshot = LinkCacheStats(**self._stats.__dict__)
+            snapshot.size = len(self._entries)
+        snapshot.coalesced = self._flights.stats().coalesced
+        lookups = snapshot.hits + snapshot.misses
+        snapshot.hit_ratio = snapshot.hits / lookups if lookups else 0.0
+        return snapshot
+
+
+integration_link_cache = IntegrationLinkCache(
+    max_entries=settings.integration_links_cache_max_entries,
+    refresh_margin_seconds=settings.integration_links_refresh_margin_seconds,
+)
+
+
 class IntegrationService:
     def __init__(
         self,
         stack_service: StackService | None = None,
         org_service: OrganisationService | None = None,
+        link_cache: IntegrationLinkCache | None = None,
     ) -> None:
-        self._stack_service = stack_service or StackService()
+        self._stack_service = stack_service
         self._org_service = org_service or OrganisationService()
+        self._link_cache = link_cache or integration_link_cache
 
     async def build_links(
         self,
@@ -34,13 +141,21 @@ class IntegrationService:
         aws_profile: str | None = None,
         expires_in: int = 3600,
     ) -> IntegrationLinks:
-        record = await self._org_service.get_org(org_name)
+        return await self._link_cache.get_or_build(
+            (org_name, aws_profile, expires_in),
+            lambda: self._build_links(org_name=org_name, aws_profile=aws_profile, expires_in=expires_in),
+        )
+
+    async def _build_links(self, *, org_name: str, aws_profile: str | None, expires_in: int) -> BuiltLinks:
+        if self._stack_service is None:
+            self._stack_service = StackService()
+        record = await self._org_service.get_org(org_name, fields=("api_key_cipher", "external_id_cipher"))
         if not record:
             raise ValueError("organisation not found")
 
-        external_id = self._org_service.decrypt_external_id(record)
-        api_key = self._org_service.decrypt_api_key(record)
-        template_info = self._stack_service.generate_template_url(org_name=org_name, expires_in=expires_in)
+        external_id = await self._org_service.decrypt_external_id(record)
+        api_key = await self._org_service.decrypt_api_key(record)
+        template_info = await self._stack_service.generate_template_url(org_name=org_name, expires_in=expires_in)
         parameters = {
             "OrganizationName": org_name,
             "ExternalId": external_id,
@@ -74,9 +189,10 @@ class IntegrationService:
         )
         cli_command = f"{download_command} && {deploy_command}"
 
-        return IntegrationLinks(
+        links = IntegrationLinks(
             console_url=console_url,
             aws_cli_command=cli_command,
             template_url=template_info.template_url,
             region=template_info.region,
         )
+        return links, template_info.expires_at
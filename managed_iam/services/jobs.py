@@ -0,0 +1,287 @@
+"""Redis Streams job queue for workload stack deploys and deletes."""
+
+from __future__ import annotations
+
+import json
+import random
+import secrets
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Literal
+
+from botocore.exceptions import BotoCoreError, ClientError
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from managed_iam.config import settings
+from managed_iam.services.singleflight import release_redis_lock
+from managed_iam.services.workload import WorkloadActionResult
+from managed_iam.storage import RedisFactory
+
+STREAM_KEY = "v1:workload-jobs"
+CONSUMER_GROUP = "workload-workers"
+_DELAYED_KEY = "v1:workload-jobs:delayed"
+_JOB_KEY_TEMPLATE = "v1:workload-job:{job_id}"
+_LATEST_KEY_TEMPLATE = "v1:workload-job:latest:{org_name}"
+_ACTIVE_KEY_TEMPLATE = "v1:workload-job:active:{org_name}"
+_PROMOTE_BATCH = 100
+
+# Moves one due retry from the delayed set to the stream and marks its record
+# queued in the same step, so a worker dying midway cannot drop the retry.
+_PROMOTE_SCRIPT = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+if ARGV[4] == '' or redis.call('SET', KEYS[3], ARGV[4], 'XX', 'KEEPTTL') == false then
+    return 0
+end
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], '*', 'job_id', ARGV[1], 'attempt', ARGV[3])
+return 1
+"""
+
+JobKind = Literal["deploy", "delete"]
+JobState = Literal["queued", "running", "retrying", "succeeded", "failed"]
+
+# Error codes worth another attempt; anything else (bad parameters, stack in a
+# state that cannot be updated, missing permissions) fails the job at once.
+_RETRYABLE_CODES = frozenset(
+    {
+        "Throttling",
+        "ThrottlingException",
+        "RequestLimitExceeded",
+        "TooManyRequestsException",
+        "ServiceUnavailable",
+        "InternalFailure",
+        "InternalError",
+    }
+)
+
+
+class WorkloadJobInProgress(ValueError):
+    """Raised when the organisation already has a queued or running workload job."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class WorkloadJob:
+    job_id: str
+    kind: JobKind
+    org_name: str
+    parameters: dict[str, Any] = field(default_factory=dict)
+    aws_profile: str | None = None
+    state: JobState = "queued"
+    attempts: int = 0
+    created_at: str = field(default_factory=_now)
+    updated_at: str = field(default_factory=_now)
+    next_attempt_at: str | None = None
+    action: str | None = None
+    stack_id: str | None = None
+    message: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("succeeded", "failed")
+
+    def runnable_from(self, attempt: int) -> bool:
+        """Whether a stream entry queued after ``attempt`` attempts should run this job now.
+
+        The entry is current while the job is queued with that many attempts
+        made, or is running the next one (a worker died during it). Anything
+        else is an entry left over from an earlier attempt: the job is waiting
+        out a retry delay, has been queued again under a newer entry, or ended.
+        """
+        if self.state == "queued":
+            return self.attempts == attempt
+        return self.state == "running" and self.attempts == attempt + 1
+
+    def dumps(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, raw: bytes | str) -> WorkloadJob:
+        return cls(**json.loads(raw))
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Throttling, AWS-side faults and network errors are retried; everything else is final."""
+    if isinstance(exc, ClientError):
+        return exc.response.get("Error", {}).get("Code") in _RETRYABLE_CODES
+    return isinstance(exc, (BotoCoreError, ConnectionError, TimeoutError))
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter: ``base * 2**(attempt-1)``, capped, scaled by 0.5-1.0."""
+    delay = min(
+        settings.workload_job_retry_max_seconds,
+        settings.workload_job_retry_base_seconds * 2 ** max(attempt - 1, 0),
+    )
+    return delay * random.uniform(0.5, 1.0)
+
+
+class WorkloadJobQueue:
+    """Workload jobs as status records plus a Redis stream read by a consumer group.
+
+    Each job has a JSON record (``v1:workload-job:{id}``) that the portal
+    reads and the worker updates; the stream only carries job ids. Workers
+    in the ``workload-workers`` group split the stream between them and
+    reclaim entries a crashed worker left unacknowledged. Retries wait in a
+    sorted set until due and are then added to the stream again, tagged with
+    the attempt count they follow so stale entries can be told apart. One job
+    per organisation may be queued or running at a time.
+    """
+
+    def __init__(self, redis: Redis | None = None) -> None:
+        self._redis = redis or RedisFactory.client()
+
+    async def enqueue(
+        self,
+        kind: JobKind,
+        org_name: str,
+        *,
+        parameters: dict[str, Any] | None = None,
+        aws_profile: str | None = None,
+    ) -> WorkloadJob:
+        job = WorkloadJob(
+            job_id=secrets.token_hex(8),
+            kind=kind,
+            org_name=org_name,
+            parameters=parameters or {},
+            aws_profile=aws_profile,
+        )
+        active_key = _ACTIVE_KEY_TEMPLATE.format(org_name=org_name)
+        if not await self._redis.set(active_key, job.job_id, nx=True, ex=settings.workload_job_lock_seconds):
+            current = await self._redis.get(active_key)
+            detail = f" (job {current.decode()})" if current else ""
+            raise WorkloadJobInProgress(f"a workload job for this organisation is already queued or running{detail}")
+
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.set(_JOB_KEY_TEMPLATE.format(job_id=job.job_id), job.dumps(), ex=settings.workload_job_ttl_seconds)
+                pipe.set(_LATEST_KEY_TEMPLATE.format(org_name=org_name), job.job_id, ex=settings.workload_job_ttl_seconds)
+                pipe.xadd(
+                    STREAM_KEY,
+                    {"job_id": job.job_id, "attempt": 0},
+                    maxlen=settings.workload_job_stream_maxlen,
+                    approximate=True,
+                )
+                await pipe.execute()
+        except BaseException:
+            await release_redis_lock(self._redis, active_key, job.job_id)
+            raise
+        return job
+
+    async def get(self, job_id: str) -> WorkloadJob | None:
+        raw = await self._redis.get(_JOB_KEY_TEMPLATE.format(job_id=job_id))
+        return WorkloadJob.loads(raw) if raw else None
+
+    async def latest(self, org_name: str) -> WorkloadJob | None:
+        job_id = await self._redis.get(_LATEST_KEY_TEMPLATE.format(org_name=org_name))
+        return await self.get(job_id.decode()) if job_id else None
+
+    async def save(self, job: WorkloadJob) -> None:
+        job.updated_at = _now()
+        await self._redis.set(_JOB_KEY_TEMPLATE.format(job_id=job.job_id), job.dumps(), ex=settings.workload_job_ttl_seconds)
+
+    async def succeed(self, job: WorkloadJob, result: WorkloadActionResult) -> None:
+        job.state = "succeeded"
+        job.action, job.stack_id, job.message = result.action, result.stack_id, result.message
+        job.next_attempt_at = None
+        await self._finish(job)
+
+    async def fail(self, job: WorkloadJob, message: str) -> None:
+        job.state = "failed"
+        job.message = message
+        job.next_attempt_at = None
+        await self._finish(job)
+
+    async def retry_later(self, job: WorkloadJob, message: str, delay: float) -> None:
+        due = time.time() + delay
+        job.state = "retrying"
+        job.message = message
+        job.next_attempt_at = datetime.fromtimestamp(due, timezone.utc).isoformat()
+        job.updated_at = _now()
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(_JOB_KEY_TEMPLATE.format(job_id=job.job_id), job.dumps(), ex=settings.workload_job_ttl_seconds)
+            pipe.zadd(_DELAYED_KEY, {job.job_id: due})
+            await pipe.execute()
+
+    async def _finish(self, job: WorkloadJob) -> None:
+        await self.save(job)
+        await release_redis_lock(self._redis, _ACTIVE_KEY_TEMPLATE.format(org_name=job.org_name), job.job_id)
+
+    # Consumer side -----------------------------------------------------------------
+
+    async def ensure_group(self) -> None:
+        try:
+            await self._redis.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def read(self, consumer: str, *, count: int, block_ms: int) -> list[tuple[str, str, int]]:
+        """New ``(entry_id, job_id, attempt)`` entries for this consumer, waiting up to ``block_ms``."""
+        response = await self._redis.xreadgroup(
+            CONSUMER_GROUP, consumer, {STREAM_KEY: ">"}, count=count, block=block_ms
+        )
+        return [entry for _, entries in response or () for entry in _entries(entries)]
+
+    async def reclaim(self, consumer: str, *, min_idle_ms: int, count: int) -> list[tuple[str, str, int]]:
+        """Take over entries other consumers received but did not acknowledge in ``min_idle_ms``."""
+        response = await self._redis.xautoclaim(
+            STREAM_KEY, CONSUMER_GROUP, consumer, min_idle_time=min_idle_ms, start_id="0-0", count=count
+        )
+        return list(_entries(response[1]))
+
+    async def ack(self, entry_id: str) -> None:
+        await self._redis.xack(STREAM_KEY, CONSUMER_GROUP, entry_id)
+
+    async def promote_due(self) -> int:
+        """Move retries whose backoff has elapsed back onto the stream; returns how many moved."""
+        due = await self._redis.zrangebyscore(_DELAYED_KEY, "-inf", time.time(), start=0, num=_PROMOTE_BATCH)
+        promote = self._redis.register_script(_PROMOTE_SCRIPT)
+        promoted = 0
+        for raw_id in due:
+            job = await self.get(raw_id.decode())
+            queued = ""
+            if job is not None and job.state == "retrying":
+                job.state, job.next_attempt_at, job.updated_at = "queued", None, _now()
+                queued = job.dumps()
+            # An expired or no longer retrying record is only dropped from the set. The ZREM
+            # inside the script succeeds for exactly one worker, so each retry is queued once.
+            promoted += await promote(
+                keys=[_DELAYED_KEY, STREAM_KEY, _JOB_KEY_TEMPLATE.format(job_id=raw_id.decode())],
+                args=[raw_id, settings.workload_job_stream_maxlen, job.attempts if job else 0, queued],
+            )
+        return promoted
+
+    async def release_consumer(self, consumer: str) -> None:
+        """Drop a stopping consumer from the group unless it still owns unacknowledged entries."""
+        pending = await self._redis.xpending_range(
+            STREAM_KEY, CONSUMER_GROUP, min="-", max="+", count=1, consumername=consumer
+        )
+        if not pending:
+            await self._redis.xgroup_delconsumer(STREAM_KEY, CONSUMER_GROUP, consumer)
+
+
+def _entries(entries) -> list[tuple[str, str, int]]:
+    parsed = []
+    for entry_id, fields in entries:
+        # XAUTOCLAIM reports entries trimmed from the stream with no fields.
+        if fields and b"job_id" in fields:
+            parsed.append((entry_id.decode(), fields[b"job_id"].decode(), int(fields.get(b"attempt", 0))))
+    return parsed
+
+
+__all__ = [
+    "CONSUMER_GROUP",
+    "STREAM_KEY",
+    "WorkloadJob",
+    "WorkloadJobInProgress",
+    "WorkloadJobQueue",
+    "is_retryable",
+    "retry_delay",
+]
@@ -0,0 +1,194 @@
+"""In-process cache of organisation hashes, invalidated over Redis pub/sub."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import redis
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from managed_iam.config import settings
+
+INVALIDATION_CHANNEL = "v1:orgs:invalidate"
+_RECONNECT_SECONDS = 1.0
+_SUBSCRIBE_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class OrgCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    stores: int = 0
+    stale_stores_skipped: int = 0
+    invalidations: int = 0
+    remote_invalidations: int = 0
+    subscribed: bool = False
+    size: int = 0
+    hit_ratio: float = 0.0
+
+
+class OrgRecordCache:
+    """Keep recently read org hashes (``HGETALL`` replies) for a short TTL.
+
+    Writers drop their local entry and publish the org name on
+    ``INVALIDATION_CHANNEL``; a daemon thread in every process listens and
+    drops the entry there too. A thread (with a sync client) rather than a
+    task is used because WSGI workers run each request on its own event loop.
+
+    With pub/sub enabled, entries are only served while the listener is
+    subscribed: on disconnect the cache is emptied and bypassed until the
+    subscription is back, so a missed message can never leave a stale entry
+    behind. Without pub/sub, staleness is bounded by the TTL alone.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: float = 30.0,
+        use_pubsub: bool = True,
+        subscriber: Callable[[], Any] | None = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._use_pubsub = use_pubsub
+        self._subscriber = subscriber or (lambda: redis.Redis.from_url(settings.redis_url))
+        self._entries: OrderedDict[str, tuple[dict[bytes, bytes], float]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = OrgCacheStats()
+        self._listener: threading.Thread | None = None
+        self._subscribed = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._ttl > 0
+
+    def usable(self) -> bool:
+        """Whether ``get``/``put`` are in use right now (enabled and, with pub/sub, subscribed)."""
+        if not self.enabled:
+            return False
+        if not self._use_pubsub:
+            return True
+        self._ensure_listener()
+        return self._subscribed.is_set()
+
+    def generation(self) -> int:
+        """Token to pass to ``put`` so a read that raced an invalidation is not cached."""
+        with self._lock:
+            return self._generation
+
+    def get(self, org_name: str) -> dict[bytes, bytes] | None:
+        if not self.usable():
+            with self._lock:
+                self._stats.bypassed += 1
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(org_name)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[org_name]
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(org_name)
+            self._stats.hits += 1
+            return entry[0]
+
+    def put(self, org_name: str, raw: dict[bytes, bytes], *, generation: int) -> None:
+        if not self.usable():
+            return
+        with self._lock:
+            if generation != self._generation:
+                self._stats.stale_stores_skipped += 1
+                return
+            self._entries[org_name] = (raw, time.monotonic() + self._ttl)
+            self._entries.move_to_end(org_name)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self._stats.stores += 1
+
+    def discard(self, org_name: str, *, remote: bool = False) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(org_name, None)
+            if remote:
+                self._stats.remote_invalidations += 1
+            else:
+                self._stats.invalidations += 1
+
+    async def invalidate(self, redis_client: Redis, org_name: str) -> None:
+        """Drop ``org_name`` here and tell every other process to do the same."""
+        self.discard(org_name)
+        if not (self.enabled and self._use_pubsub):
+            return
+        try:
+            await redis_client.publish(INVALIDATION_CHANNEL, org_name)
+        except RedisError:
+            # Other processes fall back to the TTL; the write itself already succeeded.
+            pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name="org-cache-invalidation", daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            client = None
+            try:
+                client = self._subscriber()
+                pubsub = client.pubsub()
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Only trust the cache once Redis has confirmed the subscription.
+                confirmation = pubsub.get_message(timeout=_SUBSCRIBE_TIMEOUT_SECONDS)
+                if not confirmation or confirmation.get("type") != "subscribe":
+                    raise RedisError("subscription not confirmed")
+                self.clear()
+                self._subscribed.set()
+                for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = message["data"]
+                    self.discard(data.decode() if isinstance(data, bytes) else str(data), remote=True)
+            except (RedisError, OSError):
+                pass
+            finally:
+                self._subscribed.clear()
+                self.clear()
+                if client is not None:
+                    try:
+                        client.close()
+                    except (RedisError, OSError):
+                        pass
+            time.sleep(_RECONNECT_SECONDS)
+
+    def stats(self) -> OrgCacheStats:
+        with self._lock:
+            snapshot = OrgCacheStats(**self._stats.__dict__)
+            snapshot.size = len(self._entries)
+        snapshot.subscribed = self._subscribed.is_set()
+        lookups = snapshot.hits + snapshot.misses
+        snapshot.hit_ratio = snapshot.hits / lookups if lookups else 0.0
+        return snapshot
+
+
+org_record_cache = OrgRecordCache(
+    max_entries=settings.org_cache_max_entries,
+    ttl_seconds=settings.org_cache_ttl_seconds,
+    use_pubsub=settings.org_cache_pubsub_enabled,
+)
@@ -4,16 +4,15 @@ from __future__ import annotations
 
 import secrets
 from dataclasses import dataclass
-from typing import Mapping
+from typing import Iterable, Mapping
 
 from redis.asyncio import Redis
 
-from managed_iam.crypto import EnvelopeCipher
-from managed_iam.repos import OrgRecord, OrgRepository
+from managed_iam.repos import AnyOrgRecord, LazyOrgRecord, OrgRepository
+from managed_iam.repos.orgs import VERIFY_FIELDS
+from managed_iam.services.org_cache import OrgRecordCache, org_record_cache
 from managed_iam.storage import RedisFactory
 
-from managed_iam.config import settings
-
 
 @dataclass
 class OrgRegistrationResult:
@@ -23,10 +22,23 @@ class OrgRegistrationResult:
 
 
 class OrganisationService:
-    def __init__(self, redis: Redis | None = None) -> None:
+    """Organisation reads and writes.
+
+    Reads go through the process-wide ``OrgRecordCache`` and are also
+    remembered on the instance; views build one service per request, so a
+    request never reads the same organisation from Redis twice.
+    """
+
+    def __init__(
+        self,
+        redis: Redis | None = None,
+        cache: OrgRecordCache | None = None,
+        repo: OrgRepository | None = None,
+    ) -> None:
         self._redis = redis or RedisFactory.client()
-        self._repo = OrgRepository(self._redis)
-        self._cipher = EnvelopeCipher(settings.decode_encryption_key())
+        self._repo = repo or OrgRepository(self._redis)
+        self._cache = cache or org_record_cache
+        self._seen: dict[str, LazyOrgRecord] = {}
 
     def _generate_secret(self, length: int = 32) -> str:
         alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
@@ -36,13 +48,45 @@ class OrganisationService:
         api_key = self._generate_secret(40)
         external_id = self._generate_secret(48)
         await self._repo.create_org(org_name=org_name, owner_user_id=owner_user_id, api_key=api_key, external_id=external_id)
+        await self._forget(org_name)
         return OrgRegistrationResult(org_name=org_name, api_key=api_key, external_id=external_id)
 
-    async def verify_api_key(self, *, org_name: str, api_key: str) -> OrgRecord | None:
-        return await self._repo.verify_api_key(org_name=org_name, api_key=api_key)
-
-    async def get_org(self, org_name: str) -> OrgRecord | None:
-        return await self._repo.get_org(org_name)
+    async def verify_api_key(
+        self,
+        *,
+        org_name: str,
+        api_key: str,
+        fields: Iterable[str] | None = VERIFY_FIELDS,
+    ) -> LazyOrgRecord | None:
+        record = await self.get_org(org_name, fields=None if fields is None else ["api_key_hash", *fields])
+        if not record or not await self._repo.check_api_key(record, api_key):
+            return None
+        return record
+
+    async def get_org(self, org_name: str, fields: Iterable[str] | None = None) -> LazyOrgRecord | None:
+        fields = None if fields is None else tuple(fields)
+        seen = self._seen.get(org_name)
+        if seen is not None and (seen.complete or (fields is not None and all(map(seen.loaded, fields)))):
+            return seen
+
+        raw = self._cache.get(org_name)
+        if raw is not None:
+            record = LazyOrgRecord(org_name, raw, complete=True)
+        else:
+            generation = self._cache.generation()
+            # A cache fill needs the whole hash (one HGETALL per TTL); project with HMGET only
+            # when the result will not be stored, i.e. the cache is disabled or bypassed.
+            record = await self._repo.get_org(org_name, fields=None if self._cache.usable() else fields)
+            if record is None:
+                return None
+            if record.complete:
+                self._cache.put(org_name, record.snapshot(), generation=generation)
+
+        if seen is not None and not record.complete:
+            seen.load(record.snapshot())
+            return seen
+        self._seen[org_name] = record
+        return record
 
     async def mark_validated(
         self,
@@ -58,9 +102,14 @@ class OrganisationService:
             account_partition=account_partition,
             account_tags=account_tags,
         )
+        await self._forget(org_name)
+
+    async def _forget(self, org_name: str) -> None:
+        self._seen.pop(org_name, None)
+        await self._cache.invalidate(self._redis, org_name)
 
-    def decrypt_api_key(self, record: OrgRecord) -> str:
-        return self._repo.decrypt_api_key(record)
+    async def decrypt_api_key(self, record: AnyOrgRecord) -> str:
+        return await self._repo.decrypt_api_key(record)
 
-    def decrypt_external_id(self, record: OrgRecord) -> str:
-        return self._repo.decrypt_external_id(record)
+    async def decrypt_external_id(self, record: AnyOrgRecord) -> str:
+        return await self._repo.decrypt_external_id(record)
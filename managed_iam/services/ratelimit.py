@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import math
+import secrets
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 
 from redis.asyncio import Redis
@@ -10,22 +14,288 @@ from redis.asyncio import Redis
 from managed_iam.config import settings
 from managed_iam.storage import RedisFactory
 
+# Each script returns {allowed, remaining, reset_ms, retry_ms} in one round trip.
+# Time comes from the Redis server so every worker agrees on the clock.
+
+_FIXED_WINDOW = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local count = redis.call('INCR', KEYS[1])
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl < 0 then
+    redis.call('PEXPIRE', KEYS[1], window)
+    ttl = window
+end
+if count > limit then
+    return {0, 0, ttl, ttl}
+end
+return {1, limit - count, ttl, 0}
+"""
+
+_SLIDING_WINDOW = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {1, limit - count - 1, tonumber(oldest[2]) + window - now, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local retry = tonumber(oldest[2]) + window - now
+return {0, 0, retry, retry}
+"""
+
+_GCRA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local interval = window / limit
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + tonumber(t[2]) / 1000
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if now < allow_at then
+    return {0, 0, math.ceil(tat - now), math.ceil(allow_at - now)}
+end
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor((window - (new_tat - now)) / interval), math.ceil(new_tat - now), 0}
+"""
+
+# Leases up to ARGV[3] units from a fixed-window counter after handing back
+# ARGV[4] unused units; returns {granted, shared_remaining}.
+_LEASE = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local give_back = tonumber(ARGV[4])
+local used = tonumber(redis.call('GET', KEYS[1]) or '0') - give_back
+if used < 0 then
+    used = 0
+end
+local grant = math.min(want, limit - used)
+if grant < 0 then
+    grant = 0
+end
+used = used + grant
+redis.call('SET', KEYS[1], used, 'PX', window)
+return {grant, limit - used}
+"""
+
+_MAX_LOCAL_SUBJECTS = 4096
+
+_SCRIPTS = {
+    "fixed_window": _FIXED_WINDOW,
+    "sliding_window": _SLIDING_WINDOW,
+    "gcra": _GCRA,
+}
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    window_seconds: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+    def headers(self) -> dict[str, str]:
+        """``RateLimit-*`` headers (IETF draft) plus ``Retry-After`` when the request was rejected."""
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+            "RateLimit-Policy": f"{self.limit};w={self.window_seconds}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
 
 class RateLimitExceeded(Exception):
     """Raised when a subject exceeds configured rate limits."""
 
+    def __init__(self, message: str, result: RateLimitResult | None = None) -> None:
+        super().__init__(message)
+        self.result = result
+
+
+@dataclass
+class LeasedRateLimiterStats:
+    local_decisions: int = 0
+    leases: int = 0
+    units_leased: int = 0
+    units_returned: int = 0
+    denials: int = 0
+    subjects: int = 0
+    local_ratio: float = 0.0
+
+
+@dataclass
+class _Lease:
+    bucket: int
+    tokens: int
+    shared_remaining: int
+    sync_at: float
+
+
+class LeasedRateLimiter:
+    """Fixed-window limiter that decides most requests from a per-process lease.
+
+    Each process takes up to ``lease_size`` units of a subject's window from
+    Redis at once and spends them locally. After ``sync_seconds`` (or when the
+    lease runs out) unused units are handed back in the same call that takes a
+    new lease, so one process never holds more than ``lease_size`` units the
+    others cannot see. Leases never cross a window boundary, so the shared
+    counter is still never exceeded; the cost is that a subject can be refused
+    while other processes hold unspent units. Refusals are also remembered until
+    the next sync, which keeps a throttled client from reaching Redis at all.
+    """
+
+    def __init__(self, *, lease_size: int = 5, sync_seconds: float = 1.0) -> None:
+        self._lease_size = max(1, lease_size)
+        self._sync_seconds = sync_seconds
+        self._leases: OrderedDict[str, _Lease] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = LeasedRateLimiterStats()
+
+    async def check(self, client: Redis, subject: str, *, limit: int, window: int) -> RateLimitResult:
+        now = time.time()
+        bucket = int(now // window)
+        reset_after = (bucket + 1) * window - now
+
+        with self._lock:
+            lease = self._leases.get(subject)
+            usable = lease is not None and lease.bucket == bucket and now < lease.sync_at
+            if usable and lease.tokens > 0:
+                lease.tokens -= 1
+                self._leases.move_to_end(subject)
+                self._stats.local_decisions += 1
+                return RateLimitResult(
+                    allowed=True,
+                    limit=limit,
+                    window_seconds=window,
+                    remaining=lease.tokens + lease.shared_remaining,
+                    reset_after=reset_after,
+                    retry_after=0,
+                )
+            if usable and lease.shared_remaining <= 0:
+                self._stats.local_decisions += 1
+                self._stats.denials += 1
+                raise self._refusal(subject, limit, window, reset_after)
+            give_back = lease.tokens if lease is not None and lease.bucket == bucket else 0
+            # Hand the units to this call; a concurrent caller must not return them twice.
+            self._leases.pop(subject, None)
+
+        script = client.register_script(_LEASE)
+        granted, shared_remaining = await script(
+            keys=[f"v1:ratelimit:leased:{subject}:{bucket}"],
+            args=[limit, window * 1000, self._lease_size, give_back],
+        )
+        granted = int(granted)
+        shared_remaining = max(0, int(shared_remaining))
+
+        with self._lock:
+            self._stats.leases += 1
+            self._stats.units_leased += granted
+            self._stats.units_returned += give_back
+            self._leases[subject] = _Lease(
+                bucket=bucket,
+                tokens=max(0, granted - 1),
+                shared_remaining=shared_remaining,
+                sync_at=min(now + self._sync_seconds, (bucket + 1) * window),
+            )
+            self._leases.move_to_end(subject)
+            while len(self._leases) > _MAX_LOCAL_SUBJECTS:
+                self._leases.popitem(last=False)
+            if granted <= 0:
+                self._stats.denials += 1
+                raise self._refusal(subject, limit, window, reset_after)
+
+        return RateLimitResult(
+            allowed=True,
+            limit=limit,
+            window_seconds=window,
+            remaining=granted - 1 + shared_remaining,
+            reset_after=reset_after,
+            retry_after=0,
+        )
+
+    @staticmethod
+    def _refusal(subject: str, limit: int, window: int, reset_after: float) -> RateLimitExceeded:
+        result = RateLimitResult(
+            allowed=False,
+            limit=limit,
+            window_seconds=window,
+            remaining=0,
+            reset_after=reset_after,
+            retry_after=reset_after,
+        )
+        return RateLimitExceeded(f"rate limit exceeded for {subject}", result)
+
+    def stats(self) -> LeasedRateLimiterStats:
+        with self._lock:
+            snapshot = LeasedRateLimiterStats(**self._stats.__dict__)
+            snapshot.subjects = len(self._leases)
+        decisions = snapshot.local_decisions + snapshot.leases
+        snapshot.local_ratio = snapshot.local_decisions / decisions if decisions else 0.0
+        return snapshot
+
+
+leased_rate_limiter = LeasedRateLimiter(
+    lease_size=settings.rate_limit_lease_size,
+    sync_seconds=settings.rate_limit_lease_sync_ms / 1000,
+)
+
 
 @dataclass
 class RateLimiter:
+    """Count a request against ``subject`` with one atomic EVALSHA.
+
+    ``fixed_window`` matches the original INCR/EXPIRE behaviour, ``sliding_window``
+    keeps a log of request times so there is no burst at window edges, and
+    ``gcra`` spaces requests evenly while still allowing ``limit`` at once.
+    ``leased`` hands the decision to the process-wide ``LeasedRateLimiter``.
+    """
+
     redis: Redis | None = None
+    algorithm: str | None = None
+    limit: int | None = None
+    window_seconds: int | None = None
+    leased: LeasedRateLimiter | None = None
 
-    async def check(self, subject: str) -> None:
+    async def check(self, subject: str) -> RateLimitResult:
         client = self.redis or RedisFactory.client()
-        window = settings.rate_limit_window_seconds
-        bucket = int(time.time() // window)
-        key = f"v1:ratelimit:{subject}:{bucket}"
-        count = await client.incr(key)
-        if count == 1:
-            await client.expire(key, window)
-        if count > settings.rate_limit_max_requests:
-            raise RateLimitExceeded(f"rate limit exceeded for {subject}")
+        algorithm = self.algorithm or settings.rate_limit_algorithm
+        limit = self.limit or settings.rate_limit_max_requests
+        window = self.window_seconds or settings.rate_limit_window_seconds
+        if algorithm == "leased":
+            return await (self.leased or leased_rate_limiter).check(client, subject, limit=limit, window=window)
+        try:
+            script = client.register_script(_SCRIPTS[algorithm])
+        except KeyError:
+            raise ValueError(f"unknown rate limit algorithm '{algorithm}'") from None
+
+        allowed, remaining, reset_ms, retry_ms = await script(
+            keys=[f"v1:ratelimit:{algorithm}:{subject}"],
+            args=[limit, window * 1000, secrets.token_hex(8)],
+        )
+        result = RateLimitResult(
+            allowed=bool(allowed),
+            limit=limit,
+            window_seconds=window,
+            remaining=max(0, int(remaining)),
+            reset_after=max(0, int(reset_ms)) / 1000,
+            retry_after=max(0, int(retry_ms)) / 1000,
+        )
+        if not result.allowed:
+            raise RateLimitExceeded(f"rate limit exceeded for {subject}", result)
+        return result
@@ -0,0 +1,309 @@
+"""Expiry-aware cache for assumed-role credentials."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Mapping
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from managed_iam.config import settings
+from managed_iam.crypto import EnvelopeCipher, get_crypto_executor
+from managed_iam.services.singleflight import SingleFlight, acquire_redis_lock, release_redis_lock
+from managed_iam.storage import RedisFactory
+
+_REDIS_KEY_TEMPLATE = "v1:sts-cache:{digest}"
+_LOCK_KEY_TEMPLATE = "v1:sts-flight:{digest}"
+_LOCK_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class RoleCacheKey:
+    org_name: str
+    account_id: str
+    role_name: str
+    profile: str | None = None
+
+    def encode(self) -> str:
+        return "|".join([self.org_name, self.account_id, self.role_name, self.profile or ""])
+
+
+@dataclass
+class CachedRoleCredentials:
+    access_key_id: str
+    secret_access_key: str
+    session_token: str
+    expiration: datetime
+    refresh_at: datetime
+
+    def as_boto_credentials(self) -> dict[str, Any]:
+        """Return the shape STS ``assume_role`` responses use for ``Credentials``."""
+        return {
+            "AccessKeyId": self.access_key_id,
+            "SecretAccessKey": self.secret_access_key,
+            "SessionToken": self.session_token,
+            "Expiration": self.expiration,
+        }
+
+
+@dataclass
+class RoleCacheStats:
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    early_refreshes: int = 0
+    stores: int = 0
+    size: int = 0
+    hit_ratio: float = 0.0
+    sts_calls_saved: int = 0
+    coalesced: int = 0
+    lock_waits: int = 0
+    lock_wait_hits: int = 0
+
+
+def _as_utc(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+class AssumedRoleCache:
+    """Reuse STS credentials until shortly before they expire.
+
+    The in-process tier is always on; the Redis tier (AES-GCM encrypted, so
+    secrets never sit in Redis as plaintext) lets gunicorn workers share entries.
+    Each entry carries its own refresh deadline: the configured margin plus a
+    little jitter, so entries created together do not all refresh at once.
+
+    ``get_or_fetch`` additionally coalesces concurrent misses for the same key
+    into one AssumeRole, in-process always and across workers through a short
+    Redis lock when the Redis tier is enabled.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 512,
+        refresh_margin_seconds: int = 300,
+        refresh_jitter_seconds: int = 60,
+        use_redis: bool = False,
+        lock_ttl_ms: int = 0,
+        redis: Redis | None = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._refresh_margin = refresh_margin_seconds
+        self._refresh_jitter = refresh_jitter_seconds
+        self._use_redis = use_redis
+        self._lock_ttl_ms = lock_ttl_ms
+        self._redis = redis
+        self._flights: SingleFlight[CachedRoleCredentials] = SingleFlight()
+        self._cipher = EnvelopeCipher(settings.decode_encryption_key())
+        self._entries: OrderedDict[RoleCacheKey, CachedRoleCredentials] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = RoleCacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def _redis_client(self) -> Redis:
+        return self._redis or RedisFactory.client()
+
+    @staticmethod
+    def _digest(key: RoleCacheKey) -> str:
+        return hashlib.sha256(key.encode().encode()).hexdigest()
+
+    @classmethod
+    def _redis_key(cls, key: RoleCacheKey) -> str:
+        return _REDIS_KEY_TEMPLATE.format(digest=cls._digest(key))
+
+    def _remember(self, key: RoleCacheKey, entry: CachedRoleCredentials) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    async def get(self, key: RoleCacheKey) -> CachedRoleCredentials | None:
+        if not self.enabled:
+            return None
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now < entry.refresh_at:
+                    self._entries.move_to_end(key)
+                    self._stats.l1_hits += 1
+                    return entry
+                del self._entries[key]
+                self._stats.early_refreshes += 1
+
+        if self._use_redis:
+            entry = await self._load_shared(key, now)
+            if entry is not None:
+                self._remember(key, entry)
+                with self._lock:
+                    self._stats.l2_hits += 1
+                return entry
+
+        with self._lock:
+            self._stats.misses += 1
+        return None
+
+    async def get_or_fetch(
+        self,
+        key: RoleCacheKey,
+        fetch: Callable[[], Awaitable[Mapping[str, Any]]],
+    ) -> CachedRoleCredentials:
+        """Return cached credentials, or run ``fetch`` (STS ``Credentials``) once for all concurrent callers."""
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        return await self._flights.do(key, lambda: self._fetch_and_store(key, fetch))
+
+    async def _fetch_and_store(
+        self,
+        key: RoleCacheKey,
+        fetch: Callable[[], Awaitable[Mapping[str, Any]]],
+    ) -> CachedRoleCredentials:
+        if not (self.enabled and self._use_redis and self._lock_ttl_ms > 0):
+            return await self.put(key, await fetch())
+
+        lock_key = _LOCK_KEY_TEMPLATE.format(digest=self._digest(key))
+        redis = self._redis_client()
+        try:
+            token = await acquire_redis_lock(redis, lock_key, self._lock_ttl_ms)
+        except RedisError:
+            return await self.put(key, await fetch())
+
+        if token is None:
+            # Another worker is assuming this role right now; wait for it to publish.
+            with self._lock:
+                self._stats.lock_waits += 1
+            deadline = asyncio.get_running_loop().time() + self._lock_ttl_ms / 1000
+            while asyncio.get_running_loop().time() < deadline:
+                await asyncio.sleep(_LOCK_POLL_SECONDS)
+                entry = await self._load_shared(key, datetime.now(timezone.utc))
+                if entry is not None:
+                    self._remember(key, entry)
+                    with self._lock:
+                        self._stats.lock_wait_hits += 1
+                    return entry
+            return await self.put(key, await fetch())
+
+        try:
+            return await self.put(key, await fetch())
+        finally:
+            await release_redis_lock(redis, lock_key, token)
+
+    async def put(
+        self,
+        key: RoleCacheKey,
+        credentials: Mapping[str, Any],
+        *,
+        margin_seconds: int | None = None,
+    ) -> CachedRoleCredentials:
+        """Store STS ``Credentials`` and return them; too short-lived credentials are returned uncached."""
+        expiration = _as_utc(credentials["Expiration"])
+        if margin_seconds is None:
+            margin_seconds = self._refresh_margin + random.randint(0, max(0, self._refresh_jitter))
+        entry = CachedRoleCredentials(
+            access_key_id=credentials["AccessKeyId"],
+            secret_access_key=credentials["SecretAccessKey"],
+            session_token=credentials["SessionToken"],
+            expiration=expiration,
+            refresh_at=expiration - timedelta(seconds=margin_seconds),
+        )
+        if not self.enabled or entry.refresh_at <= datetime.now(timezone.utc):
+            return entry
+
+        self._remember(key, entry)
+        with self._lock:
+            self._stats.stores += 1
+        if self._use_redis:
+            await self._store_shared(key, entry)
+        return entry
+
+    async def _load_shared(self, key: RoleCacheKey, now: datetime) -> CachedRoleCredentials | None:
+        try:
+            payload = await self._redis_client().get(self._redis_key(key))
+        except RedisError:
+            return None
+        if not payload:
+            return None
+        try:
+            plaintext = await get_crypto_executor().run(self._cipher.decrypt, payload, key.encode().encode())
+            raw = json.loads(plaintext)
+        except Exception:  # noqa: BLE001 - corrupt or foreign entries are simply misses
+            return None
+        entry = CachedRoleCredentials(
+            access_key_id=raw["access_key_id"],
+            secret_access_key=raw["secret_access_key"],
+            session_token=raw["session_token"],
+            expiration=_as_utc(raw["expiration"]),
+            refresh_at=_as_utc(raw["refresh_at"]),
+        )
+        if now >= entry.refresh_at:
+            return None
+        return entry
+
+    async def _store_shared(self, key: RoleCacheKey, entry: CachedRoleCredentials) -> None:
+        ttl = int((entry.refresh_at - datetime.now(timezone.utc)).total_seconds())
+        if ttl <= 0:
+            return
+        raw = json.dumps(
+            {
+                "access_key_id": entry.access_key_id,
+                "secret_access_key": entry.secret_access_key,
+                "session_token": entry.session_token,
+                "expiration": entry.expiration.isoformat(),
+                "refresh_at": entry.refresh_at.isoformat(),
+            }
+        ).encode()
+        payload = await get_crypto_executor().run(self._cipher.encrypt, raw, key.encode().encode())
+        try:
+            await self._redis_client().set(self._redis_key(key), payload, ex=ttl)
+        except RedisError:
+            # The shared tier is an optimisation; the local entry is already stored.
+            pass
+
+    async def invalidate(self, key: RoleCacheKey) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self._use_redis:
+            try:
+                await self._redis_client().delete(self._redis_key(key))
+            except RedisError:
+                pass
+
+    def stats(self) -> RoleCacheStats:
+        with self._lock:
+            snapshot = RoleCacheStats(**self._stats.__dict__)
+            snapshot.size = len(self._entries)
+        hits = snapshot.l1_hits + snapshot.l2_hits
+        lookups = hits + snapshot.misses
+        snapshot.coalesced = self._flights.stats().coalesced
+        snapshot.sts_calls_saved = hits + snapshot.coalesced + snapshot.lock_wait_hits
+        snapshot.hit_ratio = hits / lookups if lookups else 0.0
+        return snapshot
+
+
+assumed_role_cache = AssumedRoleCache(
+    max_entries=settings.sts_cache_max_entries,
+    refresh_margin_seconds=settings.sts_cache_refresh_margin_seconds,
+    refresh_jitter_seconds=settings.sts_cache_refresh_jitter_seconds,
+    use_redis=settings.sts_cache_redis_enabled,
+    lock_ttl_ms=settings.sts_singleflight_lock_ms,
+)
@@ -0,0 +1,89 @@
+"""Coalesce concurrent identical calls into one in-flight execution."""
+
+from __future__ import annotations
+
+import asyncio
+import secrets
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+T = TypeVar("T")
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class SingleFlightStats:
+    leaders: int = 0
+    coalesced: int = 0
+    in_flight: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """Share one running call between coroutines asking for the same key.
+
+    Calls are tracked per event loop because asyncio futures cannot be awaited
+    from a different loop. The shared call runs as its own task, so a caller
+    that gets cancelled does not cancel the work the others are waiting on.
+    """
+
+    def __init__(self) -> None:
+        self._calls: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, asyncio.Task]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self._stats = SingleFlightStats()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._calls.setdefault(loop, {})
+            task = calls.get(key)
+            if task is not None:
+                self._stats.coalesced += 1
+            else:
+                task = loop.create_task(func())
+                calls[key] = task
+                self._stats.leaders += 1
+                self._stats.in_flight += 1
+                task.add_done_callback(lambda _task: self._forget(loop, key, _task))
+        return await asyncio.shield(task)
+
+    def _forget(self, loop: asyncio.AbstractEventLoop, key: Hashable, task: asyncio.Task) -> None:
+        with self._lock:
+            calls = self._calls.get(loop)
+            if calls is not None and calls.get(key) is task:
+                del calls[key]
+            self._stats.in_flight -= 1
+        if not task.cancelled():
+            # Mark the exception retrieved so an unawaited failure is not logged twice.
+            task.exception()
+
+    def stats(self) -> SingleFlightStats:
+        with self._lock:
+            return SingleFlightStats(**self._stats.__dict__)
+
+
+async def acquire_redis_lock(redis: Redis, key: str, ttl_ms: int) -> str | None:
+    """Try to take a short-lived Redis lock; returns the owner token, or None if it is held."""
+    token = secrets.token_hex(16)
+    acquired = await redis.set(key, token, nx=True, px=ttl_ms)
+    return token if acquired else None
+
+
+async def release_redis_lock(redis: Redis, key: str, token: str) -> None:
+    try:
+        await redis.eval(_RELEASE_SCRIPT, 1, key, token)
+    except RedisError:
+        # The lock expires on its own; failing to release only delays waiters.
+        pass
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import Mapping
+from datetime import datetime, timedelta, timezone
+from typing import Any, Mapping
 from urllib.parse import quote, quote_plus
 
-import boto3
-
+from managed_iam.aws import client_registry, credential_provider, presign_s3_url
 from managed_iam.config import settings
 
 
@@ -16,26 +17,30 @@ class StackTemplateInfo:
     template_url: str
     stack_name: str
     region: str
+    # When a presigned ``template_url`` stops working: ``expires_in`` or the signing credentials' expiry.
+    expires_at: datetime | None = None
 
 
 class StackService:
-    def __init__(self, s3_client: boto3.client | None = None) -> None:
+    def __init__(self, s3_client: Any | None = None) -> None:
         self._bucket = settings.template_bucket
         self._template_key = settings.template_key
-        self._s3 = None
-        if not settings.template_public_access:
-            self._s3 = s3_client or boto3.client("s3", region_name=settings.aws_region)
+        self._s3 = s3_client
+        if self._s3 is None and not settings.template_public_access and settings.template_presign_mode == "boto3":
+            self._s3 = client_registry.client("s3", region=settings.aws_region)
 
-    def generate_template_url(self, *, org_name: str, expires_in: int = 3600) -> StackTemplateInfo:
+    async def generate_template_url(self, *, org_name: str, expires_in: int = 3600) -> StackTemplateInfo:
         stack_name = f"Sunrin-iam-{org_name}"
+        expires_at = None
         if settings.template_public_access:
             url = self._public_template_url(self._template_key)
         else:
-            url = self._presign(self._template_key, expires_in)
+            url, expires_at = await self._presign(self._template_key, expires_in)
         return StackTemplateInfo(
             template_url=url,
             stack_name=stack_name,
             region=settings.aws_region,
+            expires_at=expires_at,
         )
 
     def console_url(
@@ -60,11 +65,26 @@ class StackService:
         region_segment = f".{settings.aws_region}" if settings.aws_region != "us-east-1" else ""
         return f"https://{self._bucket}.s3{region_segment}.amazonaws.com/{key_path}"
 
-    def _presign(self, key: str, expires_in: int) -> str:
+    async def _presign(self, key: str, expires_in: int) -> tuple[str, datetime]:
+        # Resolving or refreshing credentials (IMDS, SSO) happens off-loop; signing itself is cheap.
+        # Temporary credentials end the URL's validity early if they expire first.
+        credentials, credentials_expire_at = await credential_provider.signing_credentials_with_expiry()
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+        if credentials_expire_at is not None:
+            expires_at = min(expires_at, credentials_expire_at)
         if self._s3 is None:
-            raise RuntimeError("S3 client not initialized for presigned URL generation")
-        return self._s3.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": self._bucket, "Key": key},
-            ExpiresIn=expires_in,
-        )
+            url = presign_s3_url(
+                bucket=self._bucket,
+                key=key,
+                region=settings.aws_region,
+                credentials=credentials,
+                expires_in=expires_in,
+            )
+        else:
+            url = await asyncio.to_thread(
+                self._s3.generate_presigned_url,
+                "get_object",
+                Params={"Bucket": self._bucket, "Key": key},
+                ExpiresIn=expires_in,
+            )
+        return url, expires_at
@@ -0,0 +1,240 @@
+"""Shared per-stack pollers that fan CloudFormation activity out to many viewers."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from managed_iam.config import settings
+from managed_iam.loops import LoopLocal
+from managed_iam.services.workload import StackActivity, StackEvent, WorkloadStatus
+
+logger = logging.getLogger(__name__)
+
+ActivityFetch = Callable[[str | None], Awaitable[StackActivity]]
+# Messages put on subscriber queues: ("status", WorkloadStatus | None), ("event", StackEvent) or ("error", str).
+StackMessage = tuple[str, Any]
+
+_UNSET: Any = object()
+
+
+@dataclass
+class StackWatchStats:
+    polls: int = 0
+    poll_errors: int = 0
+    coalesced: int = 0
+    served_from_state: int = 0
+    watches: int = 0
+    pollers: int = 0
+    subscribers: int = 0
+
+
+@dataclass
+class StackSnapshot:
+    status: WorkloadStatus | None
+    events: list[StackEvent]
+
+
+def _in_progress(status: WorkloadStatus | None) -> bool:
+    return bool(status and status.status and status.status.endswith("_IN_PROGRESS"))
+
+
+class StackWatch:
+    """Latest status and recent events of one stack, refreshed by at most one poll at a time.
+
+    While anyone is subscribed, a single task polls with adaptive backoff:
+    every ``min_interval`` while the stack is changing or in progress,
+    doubling up to ``max_interval`` while it is idle. ``nudge`` resets it,
+    e.g. right after a deploy was started.
+    """
+
+    def __init__(self, hub: StackWatchHub, fetch: ActivityFetch) -> None:
+        self._hub = hub
+        self._fetch = fetch
+        self._status: WorkloadStatus | None = _UNSET
+        self._events: deque[StackEvent] = deque(maxlen=hub.history)
+        self._polled_at: float | None = None
+        self._touched = asyncio.get_running_loop().time()
+        self._poll: asyncio.Task[None] | None = None
+        self._runner: asyncio.Task[None] | None = None
+        self._subscribers: set[asyncio.Queue[StackMessage]] = set()
+        self._wake = asyncio.Event()
+        self._interval = hub.min_interval
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def polling(self) -> bool:
+        return self._runner is not None and not self._runner.done()
+
+    def idle_for(self, now: float) -> float:
+        return 0.0 if self._subscribers else now - self._touched
+
+    def snapshot_state(self) -> StackSnapshot | None:
+        if self._status is _UNSET:
+            return None
+        return StackSnapshot(status=self._status, events=list(self._events))
+
+    async def snapshot(self, max_age: float) -> StackSnapshot:
+        """Current state, polling first unless a poll finished within ``max_age`` seconds."""
+        loop = asyncio.get_running_loop()
+        self._touched = loop.time()
+        if self._polled_at is not None and self._touched - self._polled_at < max_age:
+            self._hub.record(served_from_state=1)
+            return self.snapshot_state()
+        await self.refresh()
+        return self.snapshot_state()
+
+    async def refresh(self) -> None:
+        """Poll once; callers that arrive while a poll is running share it."""
+        if self._poll is None or self._poll.done():
+            self._poll = asyncio.get_running_loop().create_task(self._poll_once())
+        else:
+            self._hub.record(coalesced=1)
+        await asyncio.shield(self._poll)
+
+    async def _poll_once(self) -> None:
+        after = self._events[-1].event_id if self._events else None
+        try:
+            activity = await self._fetch(after)
+        except Exception:
+            self._hub.record(poll_errors=1)
+            raise
+        self._hub.record(polls=1)
+        self._polled_at = self._touched = asyncio.get_running_loop().time()
+
+        changed = bool(activity.events)
+        if activity.status != self._status:
+            changed = True
+            self._status = activity.status
+            self._publish(("status", activity.status))
+        for event in activity.events:
+            self._events.append(event)
+            self._publish(("event", event))
+        self._interval = (
+            self._hub.min_interval
+            if changed or _in_progress(activity.status)
+            else min(self._interval * 2, self._hub.max_interval)
+        )
+
+    def _publish(self, message: StackMessage) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait(message)
+
+    def subscribe(self) -> asyncio.Queue[StackMessage]:
+        queue: asyncio.Queue[StackMessage] = asyncio.Queue()
+        self._subscribers.add(queue)
+        if not self.polling:
+            self._runner = asyncio.get_running_loop().create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[StackMessage]) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers:
+            self._wake.set()
+
+    def nudge(self) -> None:
+        self._interval = self._hub.min_interval
+        self._wake.set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._subscribers:
+            if self._polled_at is not None:
+                delay = self._polled_at + self._interval - loop.time()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                    except TimeoutError:
+                        pass
+                self._wake.clear()
+                if not self._subscribers:
+                    break
+            try:
+                await self.refresh()
+            except Exception as exc:  # noqa: BLE001 - reported to viewers; the loop keeps polling
+                logger.warning("stack poll failed", exc_info=True)
+                self._publish(("error", str(exc)))
+                self._polled_at = loop.time()
+                self._interval = self._hub.max_interval
+
+
+class StackWatchHub:
+    """One ``StackWatch`` per (org, profile) per event loop, so N viewers cost one poll loop.
+
+    Watches are per loop like ``SingleFlight`` calls: tasks and queues belong
+    to the loop that created them. Under ASGI that is one loop per worker;
+    under WSGI each request runs on its own loop, so a watch only lives for
+    that request and is dropped with its loop (see ``LoopLocal``).
+    """
+
+    def __init__(
+        self,
+        *,
+        min_interval: float = 2.0,
+        max_interval: float = 30.0,
+        history: int = 25,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.history = history
+        self._watches: LoopLocal[dict[Hashable, StackWatch]] = LoopLocal(dict)
+        self._lock = threading.Lock()
+        self._stats = StackWatchStats()
+
+    def watch(self, key: Hashable, fetch: ActivityFetch) -> StackWatch:
+        watches = self._watches.get()
+        with self._lock:
+            self._prune(watches, asyncio.get_running_loop().time())
+            watch = watches.get(key)
+            if watch is None:
+                watch = watches[key] = StackWatch(self, fetch)
+        return watch
+
+    def nudge(self, org_name: str) -> None:
+        """Poll the org's stacks soon on this loop (after a deploy or delete was started)."""
+        try:
+            per_loop = self._watches.peek()
+        except RuntimeError:
+            return
+        with self._lock:
+            watches = list((per_loop or {}).items())
+        for key, watch in watches:
+            if isinstance(key, tuple) and key and key[0] == org_name:
+                watch.nudge()
+
+    def _prune(self, watches: dict[Hashable, StackWatch], now: float) -> None:
+        stale = [
+            key
+            for key, watch in watches.items()
+            if not watch.polling and watch.idle_for(now) > self.max_interval
+        ]
+        for key in stale:
+            del watches[key]
+
+    def record(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self._stats, name, getattr(self._stats, name) + value)
+
+    def stats(self) -> StackWatchStats:
+        with self._lock:
+            snapshot = StackWatchStats(**self._stats.__dict__)
+            watches = [watch for per_loop in self._watches.values() for watch in per_loop.values()]
+        snapshot.watches = len(watches)
+        snapshot.pollers = sum(1 for watch in watches if watch.polling)
+        snapshot.subscribers = sum(watch.subscribers for watch in watches)
+        return snapshot
+
+
+stack_watch_hub = StackWatchHub(
+    min_interval=settings.stack_watch_min_interval_seconds,
+    max_interval=settings.stack_watch_max_interval_seconds,
+    history=settings.stack_watch_history,
+)
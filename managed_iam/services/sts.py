@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Iterable
 
-import boto3
-from botocore.exceptions import ClientError, ProfileNotFound
+from botocore.exceptions import ClientError
 
+from managed_iam.aws import AsyncSTSClient, SigningCredentials, STSTransportError, client_registry
 from managed_iam.config import settings
-from managed_iam.repos import OrgRecord
+from managed_iam.repos import AnyOrgRecord
 from managed_iam.services.orgs import OrganisationService
+from managed_iam.services.role_cache import AssumedRoleCache, RoleCacheKey, assumed_role_cache
 
 
 @dataclass
@@ -21,24 +24,32 @@ class TemporaryCredentials:
     expiration: str
 
 
+@dataclass
+class BatchIssueResult:
+    target_account_id: str
+    credentials: TemporaryCredentials | None = None
+    error: str | None = None
+
+
 ROLE_MAP = {
     "readonly": settings.provider_readonly_role,
 }
 
 
 class STSService:
-    def __init__(self, org_service: OrganisationService | None = None) -> None:
+    def __init__(
+        self,
+        org_service: OrganisationService | None = None,
+        role_cache: AssumedRoleCache | None = None,
+        sts_client: AsyncSTSClient | None = None,
+    ) -> None:
         self._org_service = org_service or OrganisationService()
+        self._role_cache = role_cache or assumed_role_cache
+        self._sts_client = sts_client or AsyncSTSClient()
 
     def _build_client(self, aws_profile: str | None = None):
         profile = aws_profile or settings.default_assume_profile
-        if profile:
-            try:
-                session = boto3.session.Session(profile_name=profile)
-            except ProfileNotFound as exc:
-                raise ValueError(f"aws profile '{profile}' not found") from exc
-            return session.client("sts", region_name=settings.aws_region)
-        return boto3.client("sts", region_name=settings.aws_region)
+        return client_registry.client("sts", profile=profile, region=settings.aws_region)
 
     async def issue_credentials(
         self,
@@ -50,40 +61,186 @@ class STSService:
         api_key: str,
         aws_profile: str | None = None,
     ) -> TemporaryCredentials:
+        record = await self.authorize(org_name=org_name, api_key=api_key, user_id=user_id)
+        return await self.issue_for_record(
+            record=record,
+            user_id=user_id,
+            role_type=role_type,
+            target_account_id=target_account_id,
+            aws_profile=aws_profile,
+        )
+
+    async def authorize(self, *, org_name: str, api_key: str, user_id: str) -> AnyOrgRecord:
+        """Verify the API key, owner and validation state once, ahead of any number of AssumeRole calls.
+
+        Ownership is checked before validation so that callers who are not the
+        owner learn nothing about the org (the 412 response carries its links).
+        """
         record = await self._org_service.verify_api_key(org_name=org_name, api_key=api_key)
-        if not record:
+        if not record or record.owner_user_id != user_id:
             raise ValueError("invalid api key")
         if not record.validation_status:
             raise PermissionError("org not validated")
+        return record
 
+    @staticmethod
+    def _role_name(role_type: str) -> str:
         role_name = ROLE_MAP.get(role_type.lower())
         if not role_name:
             raise ValueError("invalid role type")
+        return role_name
+
+    async def issue_for_record(
+        self,
+        *,
+        record: AnyOrgRecord,
+        user_id: str,
+        role_type: str,
+        target_account_id: str,
+        aws_profile: str | None = None,
+    ) -> TemporaryCredentials:
+        """Issue credentials for an already authorised organisation."""
+        return await self._issue(
+            record=record,
+            user_id=user_id,
+            role_name=self._role_name(role_type),
+            target_account_id=target_account_id,
+            aws_profile=aws_profile,
+        )
+
+    async def issue_many(
+        self,
+        *,
+        record: AnyOrgRecord,
+        user_id: str,
+        role_type: str,
+        target_account_ids: Iterable[str],
+        aws_profile: str | None = None,
+        concurrency: int = 8,
+    ) -> AsyncIterator[BatchIssueResult]:
+        """Assume the role in each account, at most ``concurrency`` at a time, yielding results as they finish.
+
+        A failure in one account is reported in its result rather than aborting the rest.
+        """
+        role_name = self._role_name(role_type)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def issue_one(account_id: str) -> BatchIssueResult:
+            async with semaphore:
+                try:
+                    credentials = await self._issue(
+                        record=record,
+                        user_id=user_id,
+                        role_name=role_name,
+                        target_account_id=account_id,
+                        aws_profile=aws_profile,
+                    )
+                except (RuntimeError, ValueError) as exc:
+                    return BatchIssueResult(target_account_id=account_id, error=str(exc))
+            return BatchIssueResult(target_account_id=account_id, credentials=credentials)
+
+        tasks = [asyncio.ensure_future(issue_one(account_id)) for account_id in target_account_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # A client that disconnects mid-stream should not leave AssumeRole calls running.
+            for task in tasks:
+                task.cancel()
+
+    async def _issue(
+        self,
+        *,
+        record: AnyOrgRecord,
+        user_id: str,
+        role_name: str,
+        target_account_id: str,
+        aws_profile: str | None,
+    ) -> TemporaryCredentials:
+        cache_key = RoleCacheKey(
+            org_name=record.org_name,
+            account_id=target_account_id,
+            role_name=role_name,
+            profile=aws_profile or settings.default_assume_profile,
+        )
+        creds = await self._role_cache.get_or_fetch(
+            cache_key,
+            lambda: self._assume_role(
+                record=record,
+                user_id=user_id,
+                role_name=role_name,
+                target_account_id=target_account_id,
+                aws_profile=aws_profile,
+            ),
+        )
+        return TemporaryCredentials(
+            access_key_id=creds.access_key_id,
+            secret_access_key=creds.secret_access_key,
+            session_token=creds.session_token,
+            expiration=creds.expiration.isoformat(),
+        )
 
-        external_id = self._org_service.decrypt_external_id(record)
-        session_base = settings.session_name_format.format(org_name=org_name, user_id=user_id)
+    async def _assume_role(
+        self,
+        *,
+        record: AnyOrgRecord,
+        user_id: str,
+        role_name: str,
+        target_account_id: str,
+        aws_profile: str | None,
+    ) -> dict[str, Any]:
+        external_id = await self._org_service.decrypt_external_id(record)
+        session_base = settings.session_name_format.format(org_name=record.org_name, user_id=user_id)
         timestamp_suffix = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
         available = 64 - (len(timestamp_suffix) + 1)
         if available < 1:
             available = 1
         session_name = f"{session_base[:available]}-{timestamp_suffix}"
         role_arn = f"arn:aws:iam::{target_account_id}:role/{role_name}"
-        sts_client = self._build_client(aws_profile)
 
         try:
-            response = sts_client.assume_role(
-                RoleArn=role_arn,
-                RoleSessionName=session_name,
-                ExternalId=external_id,
-                DurationSeconds=3600,
+            if settings.sts_client_mode == "boto3":
+                sts_client = await asyncio.to_thread(self._build_client, aws_profile)
+                response = await asyncio.to_thread(
+                    sts_client.assume_role,
+                    RoleArn=role_arn,
+                    RoleSessionName=session_name,
+                    ExternalId=external_id,
+                    DurationSeconds=3600,
+                )
+                return response["Credentials"]
+            return await self._sts_client.assume_role(
+                role_arn=role_arn,
+                role_session_name=session_name,
+                external_id=external_id,
+                duration_seconds=3600,
+                profile=aws_profile or settings.default_assume_profile,
             )
-        except ClientError as exc:  # pragma: no cover - boto3 handles error codes
+        except (ClientError, STSTransportError) as exc:  # pragma: no cover - STS handles error codes
             raise RuntimeError("sts assume role failed") from exc
 
-        creds = response["Credentials"]
-        return TemporaryCredentials(
-            access_key_id=creds["AccessKeyId"],
-            secret_access_key=creds["SecretAccessKey"],
-            session_token=creds["SessionToken"],
-            expiration=creds["Expiration"].isoformat() if hasattr(creds["Expiration"], "isoformat") else str(creds["Expiration"]),
+    async def get_caller_identity(
+        self,
+        *,
+        access_key_id: str,
+        secret_access_key: str,
+        session_token: str,
+        region: str | None = None,
+    ) -> dict[str, Any]:
+        """Resolve the identity behind caller-supplied credentials; raises ClientError if STS rejects them."""
+        if settings.sts_client_mode == "boto3":
+            client = await asyncio.to_thread(
+                client_registry.client,
+                "sts",
+                region=region,
+                credentials={
+                    "AccessKeyId": access_key_id,
+                    "SecretAccessKey": secret_access_key,
+                    "SessionToken": session_token,
+                },
+            )
+            return await asyncio.to_thread(client.get_caller_identity)
+        return await self._sts_client.get_caller_identity(
+            SigningCredentials(access_key_id, secret_access_key, session_token),
+            region=region,
         )
@@ -26,9 +26,10 @@ class UserService:
     async def create_user(self, metadata: Optional[dict[str, Any]] = None) -> UserRecord:
         user_id = shortuuid.ShortUUID().random(length=12)
         key = f"{USER_KEY_PREFIX}:{user_id}"
-        await self._redis.hset(key, mapping={"active": "1"})
+        mapping = {"active": "1"}
         if metadata:
-            await self._redis.hset(key, mapping={f"meta:{k}": str(v) for k, v in metadata.items()})
+            mapping.update({f"meta:{k}": str(v) for k, v in metadata.items()})
+        await self._redis.hset(key, mapping=mapping)
         return UserRecord(user_id=user_id, metadata=metadata or {})
 
     async def ensure_user(self, user_id: str) -> bool:
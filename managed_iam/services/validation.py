@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 
 from redis.asyncio import Redis
 
 from managed_iam.crypto import HmacVerifier
+from managed_iam.schemas.validation import ValidationWebhookPayload
 from managed_iam.services.orgs import OrganisationService
 from managed_iam.storage import RedisFactory
 
@@ -42,24 +42,19 @@ class ValidationWebhookService:
         except (TypeError, ValueError) as exc:
             raise ValueError("invalid signature timestamp") from exc
 
-        payload = json.loads(body)
-        org_name = payload["org_name"]
-        supplied_api_key = payload.get("api_key")
-        account_id = payload.get("account_id")
-        account_partition = payload.get("account_partition")
-        raw_tags = payload.get("account_tags")
+        # Parsed and validated from the raw bytes in one pass; the HMAC below still covers ``body`` as sent.
+        payload = ValidationWebhookPayload.model_validate_json(body)
+        org_name = payload.org_name
+        supplied_api_key = payload.api_key
+        account_id = payload.account_id
+        account_partition = payload.account_partition
+        account_tags = payload.account_tags
 
-        account_tags: dict[str, str] | None = None
-        if raw_tags is not None:
-            if not isinstance(raw_tags, dict):
-                raise ValueError("account_tags must be an object")
-            account_tags = {str(key): str(value) for key, value in raw_tags.items()}
-
-        record = await self._org_service.get_org(org_name)
+        record = await self._org_service.get_org(org_name, fields=("api_key_cipher",))
         if not record:
             raise ValueError("unknown organisation")
 
-        stored_api_key = self._org_service.decrypt_api_key(record)
+        stored_api_key = await self._org_service.decrypt_api_key(record)
         if supplied_api_key != stored_api_key:
             raise ValueError("api key mismatch")
 
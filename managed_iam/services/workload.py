@@ -7,12 +7,13 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-import boto3
 from botocore.exceptions import ClientError
 
+from managed_iam.aws import client_registry
 from managed_iam.config import settings
-from managed_iam.repos import OrgRecord
+from managed_iam.repos import AnyOrgRecord
 from managed_iam.services.orgs import OrganisationService
+from managed_iam.services.role_cache import AssumedRoleCache, RoleCacheKey, assumed_role_cache
 
 
 WORKLOAD_TEMPLATE_PATH = Path(__file__).resolve().parents[2] / "cloudformation" / "workload-stack.yaml"
@@ -27,6 +28,24 @@ class WorkloadStatus:
     last_updated: str | None
 
 
+@dataclass
+class StackEvent:
+    event_id: str
+    timestamp: str | None
+    logical_resource_id: str | None
+    resource_type: str | None
+    resource_status: str | None
+    reason: str | None
+
+
+@dataclass
+class StackActivity:
+    """A stack's current status plus the events recorded since the last poll (oldest first)."""
+
+    status: WorkloadStatus | None
+    events: list[StackEvent]
+
+
 @dataclass
 class WorkloadActionResult:
     action: str
@@ -41,17 +60,22 @@ class WorkloadStackService:
         self,
         *,
         template_path: Path | None = None,
+        template_body: str | None = None,
         org_service: OrganisationService | None = None,
+        role_cache: AssumedRoleCache | None = None,
     ) -> None:
         self._template_path = template_path or WORKLOAD_TEMPLATE_PATH
-        self._template_body = self._template_path.read_text(encoding="utf-8")
+        if template_body is None:
+            template_body = self._template_path.read_text(encoding="utf-8")
+        self._template_body = template_body
         self._org_service = org_service or OrganisationService()
+        self._role_cache = role_cache or assumed_role_cache
 
     def _stack_name(self, org_name: str) -> str:
         return f"Sunrin-Workload-{org_name}"
 
-    async def _require_validated_org(self, org_name: str) -> OrgRecord:
-        record = await self._org_service.get_org(org_name)
+    async def _require_validated_org(self, org_name: str) -> AnyOrgRecord:
+        record = await self._org_service.get_org(org_name, fields=("validation_status", "account_id"))
         if not record:
             raise ValueError("organisation not found")
         if not record.validation_status or not record.account_id:
@@ -60,7 +84,21 @@ class WorkloadStackService:
 
     async def describe_stack(self, org_name: str, aws_profile: str | None = None) -> WorkloadStatus | None:
         record = await self._require_validated_org(org_name)
-        return await self._run_in_thread(self._describe_stack_sync, record, aws_profile)
+        creds = await self._role_credentials(record, aws_profile)
+        return await self._run_in_thread(self._describe_stack_sync, record, creds)
+
+    async def stack_activity(
+        self,
+        org_name: str,
+        *,
+        after_event_id: str | None = None,
+        limit: int = 50,
+        aws_profile: str | None = None,
+    ) -> StackActivity:
+        """Status plus up to ``limit`` events newer than ``after_event_id``, in one thread hop."""
+        record = await self._require_validated_org(org_name)
+        creds = await self._role_credentials(record, aws_profile)
+        return await self._run_in_thread(self._stack_activity_sync, record, creds, after_event_id, limit)
 
     async def deploy_stack(
         self,
@@ -69,25 +107,39 @@ class WorkloadStackService:
         aws_profile: str | None = None,
     ) -> WorkloadActionResult:
         record = await self._require_validated_org(org_name)
-        return await self._run_in_thread(self._deploy_stack_sync, record, parameters, aws_profile)
+        creds = await self._role_credentials(record, aws_profile)
+        return await self._run_in_thread(self._deploy_stack_sync, record, creds, parameters)
 
     async def delete_stack(self, org_name: str, aws_profile: str | None = None) -> WorkloadActionResult:
         record = await self._require_validated_org(org_name)
-        return await self._run_in_thread(self._delete_stack_sync, record, aws_profile)
+        creds = await self._role_credentials(record, aws_profile)
+        return await self._run_in_thread(self._delete_stack_sync, record, creds)
 
     async def _run_in_thread(self, func, *args, **kwargs):
         import asyncio
 
         return await asyncio.to_thread(func, *args, **kwargs)
 
-    def _session(self, aws_profile: str | None = None) -> boto3.session.Session:
+    async def _role_credentials(self, record: AnyOrgRecord, aws_profile: str | None) -> dict[str, Any]:
+        cache_key = RoleCacheKey(
+            org_name=record.org_name,
+            account_id=record.account_id or "",
+            role_name=settings.provider_readonly_role,
+            profile=aws_profile or settings.default_assume_profile,
+        )
+
+        async def assume() -> dict[str, Any]:
+            external_id = await self._org_service.decrypt_external_id(record)
+            return await self._run_in_thread(self._assume_role, record, external_id, aws_profile)
+
+        cached = await self._role_cache.get_or_fetch(cache_key, assume)
+        return cached.as_boto_credentials()
+
+    def _sts_client(self, aws_profile: str | None = None):
         profile = aws_profile or settings.default_assume_profile
-        if profile:
-            return boto3.session.Session(profile_name=profile)
-        return boto3.session.Session()
+        return client_registry.client("sts", profile=profile, region=settings.aws_region)
 
-    def _assume_role(self, record: OrgRecord, aws_profile: str | None) -> dict[str, Any]:
-        external_id = self._org_service.decrypt_external_id(record)
+    def _assume_role(self, record: AnyOrgRecord, external_id: str, aws_profile: str | None) -> dict[str, Any]:
         session_base = settings.session_name_format.format(org_name=record.org_name, user_id=record.owner_user_id)
         timestamp_suffix = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
         available = 64 - (len(timestamp_suffix) + 1)
@@ -95,8 +147,7 @@ class WorkloadStackService:
             available = 1
         session_name = f"{session_base[:available]}-{timestamp_suffix}"
         role_arn = f"arn:aws:iam::{record.account_id}:role/{settings.provider_readonly_role}"
-        session = self._session(aws_profile)
-        sts_client = session.client("sts", region_name=settings.aws_region)
+        sts_client = self._sts_client(aws_profile)
         response = sts_client.assume_role(
             RoleArn=role_arn,
             RoleSessionName=session_name,
@@ -106,16 +157,9 @@ class WorkloadStackService:
         return response["Credentials"]
 
     def _cfn_client(self, creds: dict[str, Any]):
-        return boto3.client(
-            "cloudformation",
-            region_name=settings.aws_region,
-            aws_access_key_id=creds["AccessKeyId"],
-            aws_secret_access_key=creds["SecretAccessKey"],
-            aws_session_token=creds["SessionToken"],
-        )
+        return client_registry.client("cloudformation", region=settings.aws_region, credentials=creds)
 
-    def _describe_stack_sync(self, record: OrgRecord, aws_profile: str | None) -> WorkloadStatus | None:
-        creds = self._assume_role(record, aws_profile)
+    def _describe_stack_sync(self, record: AnyOrgRecord, creds: dict[str, Any]) -> WorkloadStatus | None:
         client = self._cfn_client(creds)
         stack_name = self._stack_name(record.org_name)
         try:
@@ -138,8 +182,43 @@ class WorkloadStackService:
             else None,
         )
 
-    def _deploy_stack_sync(self, record: OrgRecord, parameters: dict[str, Any], aws_profile: str | None) -> WorkloadActionResult:
-        creds = self._assume_role(record, aws_profile)
+    def _stack_activity_sync(
+        self,
+        record: AnyOrgRecord,
+        creds: dict[str, Any],
+        after_event_id: str | None,
+        limit: int,
+    ) -> StackActivity:
+        status = self._describe_stack_sync(record, creds)
+        if status is None:
+            return StackActivity(status=None, events=[])
+
+        client = self._cfn_client(creds)
+        events: list[StackEvent] = []
+        # Pages come newest first; stop at the last event the caller has already seen.
+        paginator = client.get_paginator("describe_stack_events")
+        for page in paginator.paginate(StackName=status.stack_id or status.stack_name):
+            for item in page.get("StackEvents", []):
+                if item["EventId"] == after_event_id or len(events) >= limit:
+                    events.reverse()
+                    return StackActivity(status=status, events=events)
+                timestamp = item.get("Timestamp")
+                events.append(
+                    StackEvent(
+                        event_id=item["EventId"],
+                        timestamp=timestamp.isoformat() if hasattr(timestamp, "isoformat") else None,
+                        logical_resource_id=item.get("LogicalResourceId"),
+                        resource_type=item.get("ResourceType"),
+                        resource_status=item.get("ResourceStatus"),
+                        reason=item.get("ResourceStatusReason"),
+                    )
+                )
+        events.reverse()
+        return StackActivity(status=status, events=events)
+
+    def _deploy_stack_sync(
+        self, record: AnyOrgRecord, creds: dict[str, Any], parameters: dict[str, Any]
+    ) -> WorkloadActionResult:
         client = self._cfn_client(creds)
         stack_name = self._stack_name(record.org_name)
         exists = self._stack_exists(client, stack_name)
@@ -182,8 +261,7 @@ class WorkloadStackService:
             message="Workload stack update started.",
         )
 
-    def _delete_stack_sync(self, record: OrgRecord, aws_profile: str | None) -> WorkloadActionResult:
-        creds = self._assume_role(record, aws_profile)
+    def _delete_stack_sync(self, record: AnyOrgRecord, creds: dict[str, Any]) -> WorkloadActionResult:
         client = self._cfn_client(creds)
         stack_name = self._stack_name(record.org_name)
         exists = self._stack_exists(client, stack_name)
@@ -1,5 +1,5 @@
 """Storage helpers."""
 
-from .redis import RedisFactory
+from .redis import PoolStats, RedisFactory
 
-__all__ = ["RedisFactory"]
+__all__ = ["PoolStats", "RedisFactory"]
@@ -4,25 +4,92 @@ from __future__ import annotations
 
 import asyncio
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from typing import AsyncIterator
 
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 
 from managed_iam.config import settings
+from managed_iam.loops import LoopLocal
+
+
+@dataclass
+class PoolStats:
+    pools: int = 0
+    max_connections: int = 0
+    created_connections: int = 0
+    in_use_connections: int = 0
+    available_connections: int = 0
+    utilisation: float = 0.0
+
+
+async def _close_client(client: Redis) -> None:
+    await client.aclose()
+    await client.connection_pool.disconnect()
 
 
 class RedisFactory:
-    """Provide Redis asyncio connections."""
+    """Provide Redis asyncio connections.
+
+    asyncio connections cannot be shared across event loops, so one pooled client
+    is kept per running loop and reused by every service constructed on that
+    loop. Under the ASGI lifespan that is one client per worker, closed on
+    shutdown; under WSGI each request's loop gets its own, closed when the
+    request's loop ends (see ``LoopLocal``).
+    """
+
+    _clients: LoopLocal[Redis] = LoopLocal(
+        lambda: Redis(connection_pool=RedisFactory._build_pool()),
+        close=_close_client,
+    )
+
+    @classmethod
+    def _build_pool(cls) -> BlockingConnectionPool:
+        return BlockingConnectionPool.from_url(
+            settings.redis_url,
+            decode_responses=False,
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout_seconds,
+            socket_keepalive=settings.redis_socket_keepalive,
+            health_check_interval=settings.redis_health_check_interval,
+        )
 
     @classmethod
     def client(cls) -> Redis:
-        return Redis.from_url(settings.redis_url, decode_responses=False)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside a loop there is nothing safe to share the pool with.
+            return Redis(connection_pool=cls._build_pool())
+        return cls._clients.get()
+
+    @classmethod
+    async def warm_up(cls, connections: int | None = None) -> None:
+        """Open ``connections`` pooled sockets ahead of the first request."""
+        count = settings.redis_warm_connections if connections is None else connections
+        client = cls.client()
+        # Concurrent commands each hold their own connection, forcing the pool to fill.
+        await asyncio.gather(*(client.ping() for _ in range(max(1, count))))
 
     @classmethod
     async def close(cls) -> None:
-        if cls._client is not None:
-            await cls._client.aclose()
-            cls._client = None
+        await cls._clients.close()
+
+    @classmethod
+    def stats(cls) -> PoolStats:
+        clients = cls._clients.values()
+        stats = PoolStats(pools=len(clients))
+        for client in clients:
+            pool = client.connection_pool
+            in_use = len(getattr(pool, "_in_use_connections", ()))
+            available = len(getattr(pool, "_available_connections", ()))
+            stats.max_connections += pool.max_connections
+            stats.in_use_connections += in_use
+            stats.available_connections += available
+            stats.created_connections += in_use + available
+        if stats.max_connections:
+            stats.utilisation = stats.in_use_connections / stats.max_connections
+        return stats
 
     @classmethod
     @asynccontextmanager
@@ -0,0 +1,129 @@
+"""Worker process that runs queued workload deploy/delete jobs."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+
+from redis.exceptions import RedisError
+
+from managed_iam.config import settings
+from managed_iam.services.container import request_services
+from managed_iam.services.jobs import WorkloadJob, WorkloadJobQueue, is_retryable, retry_delay
+from managed_iam.services.workload import WorkloadActionResult
+
+logger = logging.getLogger(__name__)
+
+# How long one XREADGROUP waits for new entries; bounds how late retries are
+# promoted and how quickly a stop request is noticed.
+_BLOCK_MS = 1000
+
+
+def default_consumer_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+async def run_job(job: WorkloadJob) -> WorkloadActionResult:
+    # Fresh request services per job, so the org record is read when the job runs.
+    workload = request_services().workload
+    if job.kind == "deploy":
+        return await workload.deploy_stack(job.org_name, job.parameters, aws_profile=job.aws_profile)
+    return await workload.delete_stack(job.org_name, aws_profile=job.aws_profile)
+
+
+class WorkloadJobWorker:
+    """One consumer of the ``workload-workers`` group, running up to ``concurrency`` jobs at once.
+
+    Scale out by starting more worker processes: each joins the group under
+    its own consumer name and Redis hands every stream entry to exactly one
+    of them. Entries are acknowledged only after the job record is updated,
+    so jobs held by a worker that died are reclaimed by the others once they
+    have been idle for ``workload_job_claim_idle_seconds``.
+    """
+
+    def __init__(self, *, consumer: str | None = None, concurrency: int | None = None) -> None:
+        self.consumer = consumer or default_consumer_name()
+        self.concurrency = concurrency or settings.workload_worker_concurrency
+        self._running: set[asyncio.Task[None]] = set()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        queue = WorkloadJobQueue()
+        await queue.ensure_group()
+        loop = asyncio.get_running_loop()
+        claim_idle_ms = int(settings.workload_job_claim_idle_seconds * 1000)
+        next_reclaim = loop.time()
+        logger.info("workload worker %s started (concurrency=%d)", self.consumer, self.concurrency)
+
+        while not stop.is_set():
+            free = self.concurrency - len(self._running)
+            try:
+                await queue.promote_due()
+                if free and loop.time() >= next_reclaim:
+                    for entry in await queue.reclaim(self.consumer, min_idle_ms=claim_idle_ms, count=free):
+                        self._dispatch(queue, *entry)
+                    next_reclaim = loop.time() + settings.workload_job_claim_idle_seconds / 2
+                    free = self.concurrency - len(self._running)
+                if free:
+                    for entry in await queue.read(self.consumer, count=free, block_ms=_BLOCK_MS):
+                        self._dispatch(queue, *entry)
+                    continue
+            except RedisError:
+                logger.warning("workload queue unavailable, retrying", exc_info=True)
+                await asyncio.sleep(_BLOCK_MS / 1000)
+                continue
+            await asyncio.wait(self._running, timeout=_BLOCK_MS / 1000, return_when=asyncio.FIRST_COMPLETED)
+
+        if self._running:
+            logger.info("waiting for %d running job(s)", len(self._running))
+            _, unfinished = await asyncio.wait(self._running, timeout=settings.workload_worker_shutdown_seconds)
+            # Cancelled jobs stay unacknowledged and are reclaimed by another worker.
+            for task in unfinished:
+                task.cancel()
+        await queue.release_consumer(self.consumer)
+        logger.info("workload worker %s stopped", self.consumer)
+
+    def _dispatch(self, queue: WorkloadJobQueue, entry_id: str, job_id: str, attempt: int) -> None:
+        task = asyncio.get_running_loop().create_task(self._handle(queue, entry_id, job_id, attempt))
+        self._running.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task: asyncio.Task[None]) -> None:
+        self._running.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # Usually Redis trouble; the entry stays pending and is reclaimed later.
+            logger.error("workload job handler crashed", exc_info=task.exception())
+
+    async def _handle(self, queue: WorkloadJobQueue, entry_id: str, job_id: str, attempt: int) -> None:
+        job = await queue.get(job_id)
+        if job is None or not job.runnable_from(attempt):
+            # Expired record, or a stale entry: the job ended, waits for a retry or was queued again.
+            await queue.ack(entry_id)
+            return
+        if job.state == "running" and job.attempts >= settings.workload_job_max_attempts:
+            # Its last attempt was cut short by a worker that died; do not start another.
+            await queue.fail(job, "worker stopped while running the job's last attempt")
+            await queue.ack(entry_id)
+            return
+
+        job.state = "running"
+        job.attempts += 1
+        job.next_attempt_at = None
+        await queue.save(job)
+        try:
+            result = await run_job(job)
+        except Exception as exc:  # noqa: BLE001 - recorded on the job for the portal
+            if is_retryable(exc) and job.attempts < settings.workload_job_max_attempts:
+                delay = retry_delay(job.attempts)
+                logger.warning("job %s attempt %d failed, retrying in %.0fs: %s", job.job_id, job.attempts, delay, exc)
+                await queue.retry_later(job, str(exc), delay)
+            else:
+                logger.warning("job %s failed after %d attempt(s): %s", job.job_id, job.attempts, exc)
+                await queue.fail(job, str(exc))
+        else:
+            await queue.succeed(job, result)
+        await queue.ack(entry_id)
+
+
+__all__ = ["WorkloadJobWorker", "default_consumer_name", "run_job"]
@@ -6,3 +6,10 @@ from django.apps import AppConfig
 class ManagedIamAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "managed_iam_app"
+
+    def ready(self) -> None:
+        from managed_iam.app import on_startup
+        from managed_iam_app.views.docs import openapi_document_cache
+
+        # Build the OpenAPI spec in the worker's startup hook rather than on the first /openapi.json.
+        on_startup(openapi_document_cache.warm)
@@ -0,0 +1,495 @@
+"""Micro-benchmarks for request hot paths, run against fakeredis by ``manage.py benchmark``."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from managed_iam.aws import SigningCredentials, presign_s3_url
+from managed_iam.repos import LazyOrgRecord, codec
+from managed_iam.repos.orgs import VERIFY_FIELDS, OrgRepository
+from managed_iam.services.ratelimit import LeasedRateLimiter, RateLimiter, RateLimitExceeded
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    operations: int
+    seconds: float
+    redis_calls: int
+    notes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.operations / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class BenchmarkOptions:
+    iterations: int = 2000
+    concurrency: int = 20
+    latency_ms: float = 0.0
+
+
+Scenario = Callable[[Callable[[], Any], BenchmarkOptions], Awaitable[list[BenchmarkResult]]]
+
+SCENARIOS: dict[str, tuple[str, Scenario]] = {}
+
+
+def scenario(name: str, description: str) -> Callable[[Scenario], Scenario]:
+    def register(func: Scenario) -> Scenario:
+        SCENARIOS[name] = (description, func)
+        return func
+
+    return register
+
+
+def fake_redis_factory(latency_ms: float = 0.0) -> Callable[[], Any]:
+    """Return a factory of fakeredis clients that share one server, count calls and add round-trip latency."""
+    from fakeredis import FakeServer
+    from fakeredis.aioredis import FakeRedis
+
+    server = FakeServer()
+    delay = latency_ms / 1000
+
+    class CountingRedis(FakeRedis):
+        calls = 0
+
+        async def execute_command(self, *args: Any, **options: Any) -> Any:
+            CountingRedis.calls += 1
+            if delay:
+                await asyncio.sleep(delay)
+            return await super().execute_command(*args, **options)
+
+    def build() -> CountingRedis:
+        return CountingRedis(server=server)
+
+    build.counter = CountingRedis  # type: ignore[attr-defined]
+    return build
+
+
+async def run_concurrently(options: BenchmarkOptions, operation: Callable[[int], Awaitable[Any]]) -> float:
+    """Run ``operation(i)`` ``options.iterations`` times across ``options.concurrency`` workers; returns seconds."""
+    counter = iter(range(options.iterations))
+
+    async def worker() -> None:
+        for index in counter:
+            await operation(index)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(options.concurrency)))
+    return time.perf_counter() - started
+
+
+@scenario("ratelimit", "RateLimiter.check per algorithm, including the leased in-process tier")
+async def ratelimit_scenario(redis_factory: Callable[[], Any], options: BenchmarkOptions) -> list[BenchmarkResult]:
+    subjects = [f"credentials:user-{n}:org-{n}" for n in range(10)]
+    results = []
+    for algorithm in ("fixed_window", "sliding_window", "gcra", "leased"):
+        redis = redis_factory()
+        leased = LeasedRateLimiter(lease_size=20, sync_seconds=1.0)
+        # Generous enough that every request is admitted; refusals would skew the comparison.
+        limiter = RateLimiter(
+            redis=redis,
+            algorithm=algorithm,
+            limit=options.iterations,
+            window_seconds=3600,
+            leased=leased,
+        )
+        refused = 0
+
+        async def check(index: int) -> None:
+            nonlocal refused
+            try:
+                await limiter.check(subjects[index % len(subjects)])
+            except RateLimitExceeded:
+                refused += 1
+
+        calls_before = redis_factory.counter.calls  # type: ignore[attr-defined]
+        seconds = await run_concurrently(options, check)
+        notes: dict[str, Any] = {"refused": refused}
+        if algorithm == "leased":
+            notes["local_ratio"] = round(leased.stats().local_ratio, 3)
+        results.append(
+            BenchmarkResult(
+                name=algorithm,
+                operations=options.iterations,
+                seconds=seconds,
+                redis_calls=redis_factory.counter.calls - calls_before,  # type: ignore[attr-defined]
+                notes=notes,
+            )
+        )
+    return results
+
+
+@scenario("org_read", "OrgRepository reads: eager HGETALL decoding vs lazy records and HMGET projections")
+async def org_read_scenario(redis_factory: Callable[[], Any], options: BenchmarkOptions) -> list[BenchmarkResult]:
+    redis = redis_factory()
+    repo = OrgRepository(redis)
+    await repo.create_org(org_name="bench-org", owner_user_id="bench-user", api_key="k" * 40, external_id="e" * 48)
+    await repo.mark_validated(
+        "bench-org",
+        account_id="123456789012",
+        account_partition="aws",
+        account_tags={f"tag-{n}": f"value-{n}" for n in range(8)},
+    )
+
+    verify_fields = ["api_key_hash", *VERIFY_FIELDS]
+
+    def touch_verify_fields(record: LazyOrgRecord) -> None:
+        record.owner_user_id, record.api_key_hash, record.validation_status, record.account_id
+
+    async def eager(_: int) -> None:
+        (await repo.get_org("bench-org")).materialise()
+
+    async def lazy(_: int) -> None:
+        touch_verify_fields(await repo.get_org("bench-org"))
+
+    async def projected(_: int) -> None:
+        touch_verify_fields(await repo.get_org("bench-org", fields=verify_fields))
+
+    # fakeredis' own per-command cost dwarfs decoding, so time the client-side work separately too.
+    full_raw = await redis.hgetall("v1:orgs:bench-org")
+    projected_names = codec.stored_names(["owner_user_id", *verify_fields])
+    projected_values = await redis.hmget("v1:orgs:bench-org", projected_names)
+    projected_raw = dict(zip(projected_names, projected_values))
+
+    def reply_bytes(raw: dict[bytes, bytes | None]) -> int:
+        return sum(len(key) + len(value) for key, value in raw.items() if value is not None)
+
+    variants = (
+        (
+            "hgetall+decode_all",
+            eager,
+            lambda: LazyOrgRecord("bench-org", full_raw, complete=True).materialise(),
+            full_raw,
+        ),
+        (
+            "hgetall+lazy",
+            lazy,
+            lambda: touch_verify_fields(LazyOrgRecord("bench-org", full_raw, complete=True)),
+            full_raw,
+        ),
+        (
+            "hmget_verify_fields",
+            projected,
+            lambda: touch_verify_fields(LazyOrgRecord("bench-org", projected_raw)),
+            projected_raw,
+        ),
+    )
+    results = []
+    for name, operation, decode, raw in variants:
+        calls_before = redis_factory.counter.calls  # type: ignore[attr-defined]
+        seconds = await run_concurrently(options, operation)
+        started = time.perf_counter()
+        for _ in range(options.iterations):
+            decode()
+        decode_seconds = time.perf_counter() - started
+        results.append(
+            BenchmarkResult(
+                name=name,
+                operations=options.iterations,
+                seconds=seconds,
+                redis_calls=redis_factory.counter.calls - calls_before,  # type: ignore[attr-defined]
+                notes={
+                    "decode_us_per_call": round(decode_seconds / options.iterations * 1_000_000, 2),
+                    "reply_bytes": reply_bytes(raw),
+                },
+            )
+        )
+    return results
+
+
+@scenario("presign", "S3 template URL presigning: boto3 generate_presigned_url vs the in-process SigV4 presigner")
+async def presign_scenario(redis_factory: Callable[[], Any], options: BenchmarkOptions) -> list[BenchmarkResult]:
+    import boto3
+    from botocore.config import Config
+
+    credentials = SigningCredentials("AKIDEXAMPLE", "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY", "session-token")
+    s3 = boto3.session.Session(
+        aws_access_key_id=credentials.access_key,
+        aws_secret_access_key=credentials.secret_key,
+        aws_session_token=credentials.token,
+        region_name="ap-northeast-2",
+    ).client("s3", config=Config(signature_version="s3v4"))
+
+    variants = (
+        (
+            "boto3",
+            lambda: s3.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": "bench-templates", "Key": "stack.yaml"},
+                ExpiresIn=3600,
+            ),
+        ),
+        (
+            "sigv4",
+            lambda: presign_s3_url(
+                bucket="bench-templates",
+                key="stack.yaml",
+                region="ap-northeast-2",
+                credentials=credentials,
+                expires_in=3600,
+            ),
+        ),
+    )
+    results = []
+    for name, presign in variants:
+        # Signing is pure CPU, so run it serially; concurrency would only add scheduling noise.
+        started = time.perf_counter()
+        for _ in range(options.iterations):
+            presign()
+        seconds = time.perf_counter() - started
+        results.append(
+            BenchmarkResult(
+                name=name,
+                operations=options.iterations,
+                seconds=seconds,
+                redis_calls=0,
+                notes={"us_per_url": round(seconds / options.iterations * 1_000_000, 1)},
+            )
+        )
+    return results
+
+
+@scenario("services", "Per-request service setup (credentials view + portal workload): constructors vs the shared container")
+async def services_scenario(redis_factory: Callable[[], Any], options: BenchmarkOptions) -> list[BenchmarkResult]:
+    from managed_iam.services import (
+        IntegrationService,
+        OrganisationService,
+        RateLimiter,
+        STSService,
+        UserService,
+        WorkloadStackService,
+    )
+    from managed_iam.services.container import ServiceContainer
+
+    redis = redis_factory()
+    container = ServiceContainer.build()
+
+    def constructed() -> None:
+        # What the views did before the container existed.
+        org_service = OrganisationService(redis)
+        RateLimiter(redis=redis)
+        UserService(redis)
+        IntegrationService(org_service=org_service)
+        STSService(org_service)
+        WorkloadStackService(org_service=org_service)
+
+    def from_container() -> None:
+        services = container.request(redis)
+        services.rate_limiter, services.user, services.org, services.integration, services.sts, services.workload
+
+    results = []
+    for name, setup in (("constructed", constructed), ("container", from_container)):
+        started = time.perf_counter()
+        for _ in range(options.iterations):
+            setup()
+        seconds = time.perf_counter() - started
+        results.append(
+            BenchmarkResult(
+                name=name,
+                operations=options.iterations,
+                seconds=seconds,
+                redis_calls=0,
+                notes={"us_per_request": round(seconds / options.iterations * 1_000_000, 1)},
+            )
+        )
+    return results
+
+
+@scenario("middleware", "GET /api/health through the full Django middleware stack vs the lean API handler")
+async def middleware_scenario(redis_factory: Callable[[], Any], options: BenchmarkOptions) -> list[BenchmarkResult]:
+    from django.conf import settings as django_settings
+    from django.core.handlers.asgi import ASGIHandler
+
+    from managed_iam_site.handlers import ApiASGIHandler
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/health",
+        "raw_path": b"/api/health",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8000),
+    }
+
+    async def call(handler: ASGIHandler) -> int:
+        delivered = False
+        status = 0
+
+        async def receive() -> dict[str, Any]:
+            nonlocal delivered
+            if delivered:
+                # Django listens for a disconnect after the body; the client never leaves.
+                await asyncio.Event().wait()
+            delivered = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await handler(scope, receive, send)
+        return status
+
+    results = []
+    handlers = (
+        ("full_stack", ASGIHandler(), django_settings.MIDDLEWARE),
+        ("api_chain", ApiASGIHandler(), django_settings.API_MIDDLEWARE),
+    )
+    for name, handler, middleware in handlers:
+        await call(handler)
+        statuses: set[int] = set()
+        started = time.perf_counter()
+        for _ in range(options.iterations):
+            statuses.add(await call(handler))
+        seconds = time.perf_counter() - started
+        results.append(
+            BenchmarkResult(
+                name=name,
+                operations=options.iterations,
+                seconds=seconds,
+                redis_calls=0,
+                notes={
+                    "middleware": len(middleware),
+                    "statuses": sorted(statuses),
+                    "us_per_request": round(seconds / options.iterations * 1_000_000, 1),
+                },
+            )
+        )
+    return results
+
+
+@scenario("json", "Per-endpoint request validation + response encoding: json/model_validate/JsonResponse vs the codec layer")
+async def json_scenario(redis_factory: Callable[[], Any], options: BenchmarkOptions) -> list[BenchmarkResult]:
+    import json
+
+    from django.core.serializers.json import DjangoJSONEncoder
+
+    from managed_iam.app import runtime_stats
+    from managed_iam.schemas import (
+        CredentialsBatchItem,
+        CredentialsBatchRequest,
+        CredentialsBatchResponse,
+        CredentialsRequest,
+        CredentialsResponse,
+        IntegrationRequest,
+        IntegrationResponse,
+        OrgRegisterRequest,
+        OrgRegisterResponse,
+        ValidationWebhookPayload,
+        ValidationWebhookResponse,
+    )
+    from managed_iam_app.views.utils import StdlibJSONCodec, load_json_codec, model_json, validate_json
+
+    links = {
+        "console_url": "https://console.aws.amazon.com/cloudformation/home?region=ap-northeast-2#/stacks/quickcreate",
+        "aws_cli_command": "aws cloudformation create-stack --stack-name sunrin --template-url https://example",
+        "template_url": "https://sunrin-templates.s3.amazonaws.com/org.yaml?X-Amz-Signature=" + "0" * 64,
+        "region": "ap-northeast-2",
+    }
+    credentials = {
+        "access_key_id": "ASIA" + "A" * 16,
+        "secret_access_key": "s" * 40,
+        "session_token": "t" * 600,
+        "expiration": "2026-01-01T00:00:00+00:00",
+    }
+    accounts = [f"{index:012d}" for index in range(1, 21)]
+    endpoints: list[tuple[str, type[Any], dict[str, Any], Any]] = [
+        (
+            "register",
+            OrgRegisterRequest,
+            {"org_name": "acme-corp"},
+            OrgRegisterResponse(org_name="acme-corp", api_key="k" * 43, external_id="x" * 32),
+        ),
+        (
+            "integrate",
+            IntegrationRequest,
+            {"org_name": "acme-corp", "api_key": "k" * 43, "expires_in": 3600},
+            IntegrationResponse(**links),
+        ),
+        (
+            "credentials",
+            CredentialsRequest,
+            {"org_name": "acme-corp", "target_account_id": "123456789012", "role_type": "readonly", "api_key": "k" * 43},
+            CredentialsResponse(**credentials, **links),
+        ),
+        (
+            "credentials/batch",
+            CredentialsBatchRequest,
+            {"org_name": "acme-corp", "target_account_ids": accounts, "role_type": "readonly", "api_key": "k" * 43},
+            CredentialsBatchResponse(
+                results=[
+                    CredentialsBatchItem(target_account_id=account, status="issued", **credentials)
+                    for account in accounts
+                ],
+                issued=len(accounts),
+                failed=0,
+                **links,
+            ),
+        ),
+        (
+            "integrations/validate",
+            ValidationWebhookPayload,
+            {"org_name": "acme-corp", "api_key": "k" * 43, "account_id": "123456789012", "account_tags": {"team": "infra"}},
+            ValidationWebhookResponse(org_name="acme-corp", validated=True, account_id="123456789012"),
+        ),
+    ]
+
+    def timed(name: str, operation: Callable[[], Any]) -> BenchmarkResult:
+        started = time.perf_counter()
+        for _ in range(options.iterations):
+            operation()
+        seconds = time.perf_counter() - started
+        return BenchmarkResult(
+            name=name,
+            operations=options.iterations,
+            seconds=seconds,
+            redis_calls=0,
+            notes={"us_per_request": round(seconds / options.iterations * 1_000_000, 1)},
+        )
+
+    results = []
+    for endpoint, schema, payload, response in endpoints:
+        body = json.dumps(payload).encode()
+
+        def before() -> None:
+            # What the views did before: json.loads, model_validate, model_dump, JsonResponse's encoder.
+            schema.model_validate(json.loads(body))
+            json.dumps(response.model_dump(), cls=DjangoJSONEncoder, ensure_ascii=False).encode("utf-8")
+
+        def after() -> None:
+            validate_json(schema, body)
+            model_json(response)
+
+        results.append(timed(f"{endpoint}:before", before))
+        results.append(timed(f"{endpoint}:codec", after))
+
+    # Plain-dict responses (metrics, health, errors) go through the configured codec instead.
+    stats = runtime_stats()
+    codecs = [StdlibJSONCodec()]
+    if (fastest := load_json_codec("auto")).name != "stdlib":
+        codecs.append(fastest)
+    for codec in codecs:
+        results.append(timed(f"metrics:{codec.name}", lambda codec=codec: codec.dumps(stats)))
+    return results
+
+
+__all__ = [
+    "BenchmarkOptions",
+    "BenchmarkResult",
+    "SCENARIOS",
+    "fake_redis_factory",
+    "run_concurrently",
+    "scenario",
+]
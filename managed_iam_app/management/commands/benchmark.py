@@ -0,0 +1,55 @@
+"""Run hot-path micro-benchmarks against an in-memory fakeredis server."""
+
+from __future__ import annotations
+
+import asyncio
+
+from django.core.management.base import BaseCommand, CommandError
+
+from managed_iam_app.benchmarks import SCENARIOS, BenchmarkOptions, fake_redis_factory
+
+
+class Command(BaseCommand):
+    help = "Benchmark request hot paths (rate limiting, Redis access, ...) against fakeredis."
+
+    def add_arguments(self, parser) -> None:  # pragma: no cover - Django wires parser.
+        parser.add_argument(
+            "scenarios",
+            nargs="*",
+            help=f"Scenarios to run (default: all). Available: {', '.join(sorted(SCENARIOS))}.",
+        )
+        parser.add_argument("--iterations", type=int, default=2000, help="Operations per variant.")
+        parser.add_argument("--concurrency", type=int, default=20, help="Concurrent callers.")
+        parser.add_argument(
+            "--latency-ms",
+            type=float,
+            default=0.0,
+            help="Simulated Redis round-trip latency added to every command.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            import fakeredis  # noqa: F401
+        except ImportError as exc:  # pragma: no cover - dev dependency
+            raise CommandError("fakeredis is required; install the dev dependencies (poetry install --with dev)") from exc
+
+        names = options["scenarios"] or sorted(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"unknown scenario(s): {', '.join(unknown)}")
+
+        bench_options = BenchmarkOptions(
+            iterations=options["iterations"],
+            concurrency=options["concurrency"],
+            latency_ms=options["latency_ms"],
+        )
+        for name in names:
+            description, run = SCENARIOS[name]
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}: {description}"))
+            results = asyncio.run(run(fake_redis_factory(bench_options.latency_ms), bench_options))
+            for result in results:
+                notes = " ".join(f"{key}={value}" for key, value in result.notes.items())
+                self.stdout.write(
+                    f"  {result.name:<22} {result.ops_per_second:>10.0f} ops/s"
+                    f"  {result.seconds * 1000:>9.1f} ms  redis_calls={result.redis_calls:<6} {notes}"
+                )
@@ -0,0 +1,119 @@
+"""Rewrite organisation hashes in the compact v2 layout, online and in SCAN batches."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+from django.core.management.base import BaseCommand
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from managed_iam.repos import OrgRepository
+from managed_iam.repos.orgs import ORG_KEY_TEMPLATE
+from managed_iam.storage import RedisFactory
+
+
+@dataclass
+class MigrationStats:
+    scanned: int = 0
+    migrated: int = 0
+    already_compact: int = 0
+    conflicts: int = 0
+
+
+@dataclass
+class MemoryReport:
+    records: int = 0
+    payload_bytes: int = 0
+    memory_usage_bytes: int | None = None
+
+    def per_org(self, total: int | None) -> str:
+        if total is None or not self.records:
+            return "n/a"
+        return f"{total / self.records:.0f}"
+
+
+async def measure(redis: Redis, org_names: list[str]) -> MemoryReport:
+    """Field+value bytes per org, plus ``MEMORY USAGE`` where the server supports it."""
+    report = MemoryReport()
+    for org_name in org_names:
+        key = ORG_KEY_TEMPLATE.format(org_name=org_name)
+        raw = await redis.hgetall(key)
+        if not raw:
+            continue
+        report.records += 1
+        report.payload_bytes += sum(len(field) + len(value) for field, value in raw.items())
+        try:
+            usage = await redis.memory_usage(key)
+        except ResponseError:
+            continue
+        report.memory_usage_bytes = (report.memory_usage_bytes or 0) + (usage or 0)
+    return report
+
+
+class Command(BaseCommand):
+    help = "Migrate v1:orgs:* hashes to the compact v2 layout and report memory per organisation."
+
+    def add_arguments(self, parser) -> None:  # pragma: no cover - Django wires parser.
+        parser.add_argument("--batch-size", type=int, default=100, help="SCAN COUNT hint per batch.")
+        parser.add_argument(
+            "--pause-ms",
+            type=int,
+            default=10,
+            help="Sleep between batches to keep the migration's load on Redis low.",
+        )
+        parser.add_argument("--sample", type=int, default=1000, help="Organisations measured for the memory report.")
+        parser.add_argument("--report-only", action="store_true", help="Only print the memory report.")
+
+    def handle(self, *args, **options) -> None:
+        asyncio.run(self._run(options))
+
+    async def _run(self, options) -> None:
+        redis = RedisFactory.client()
+        repo = OrgRepository(redis)
+        try:
+            sample: list[str] = []
+            async for names in repo.scan_org_names(batch_size=options["batch_size"]):
+                sample.extend(names[: options["sample"] - len(sample)])
+                if len(sample) >= options["sample"]:
+                    break
+
+            before = await measure(redis, sample)
+            self._print_report("before", before)
+            if options["report_only"]:
+                return
+
+            stats = MigrationStats()
+            async for names in repo.scan_org_names(batch_size=options["batch_size"]):
+                for org_name in names:
+                    stats.scanned += 1
+                    outcome = await repo.migrate_to_compact(org_name)
+                    if outcome == "conflict":
+                        # Someone wrote the record mid-migration; one retry normally succeeds.
+                        outcome = await repo.migrate_to_compact(org_name)
+                    if outcome == "migrated":
+                        stats.migrated += 1
+                    elif outcome == "compact":
+                        stats.already_compact += 1
+                    else:
+                        stats.conflicts += 1
+                if options["pause_ms"]:
+                    await asyncio.sleep(options["pause_ms"] / 1000)
+
+            self.stdout.write(
+                f"scanned={stats.scanned} migrated={stats.migrated} "
+                f"already_compact={stats.already_compact} conflicts={stats.conflicts}"
+            )
+            self._print_report("after", await measure(redis, sample))
+            if stats.conflicts:
+                self.stdout.write(self.style.WARNING("some records changed during migration; run the command again"))
+        finally:
+            await redis.aclose()
+
+    def _print_report(self, label: str, report: MemoryReport) -> None:
+        self.stdout.write(
+            f"{label}: orgs={report.records} "
+            f"payload_bytes_per_org={report.per_org(report.payload_bytes)} "
+            f"memory_usage_per_org={report.per_org(report.memory_usage_bytes)}"
+        )
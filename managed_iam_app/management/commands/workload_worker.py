@@ -0,0 +1,36 @@
+"""Run queued workload deploy/delete jobs until SIGTERM/SIGINT."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+
+from django.core.management.base import BaseCommand
+
+from managed_iam.app import serving_lifespan
+from managed_iam.worker import WorkloadJobWorker
+
+
+class Command(BaseCommand):
+    help = "Consume the workload job stream; run one per host or container and add more to scale out."
+
+    def add_arguments(self, parser) -> None:  # pragma: no cover - Django wires parser.
+        parser.add_argument("--concurrency", type=int, default=None, help="Jobs run at once (default from settings).")
+        parser.add_argument("--consumer", default=None, help="Consumer name in the group (default host-pid).")
+
+    def handle(self, *args, **options) -> None:
+        if not logging.getLogger().handlers:
+            logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+        asyncio.run(self._run(options))
+
+    async def _run(self, options) -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+
+        worker = WorkloadJobWorker(consumer=options["consumer"], concurrency=options["concurrency"])
+        # Same warm-up and teardown as an ASGI worker: shared services, boto3 clients, Redis pool.
+        async with serving_lifespan():
+            await worker.run(stop)
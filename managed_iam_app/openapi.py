@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
 
 from managed_iam import get_version
 from managed_iam.schemas.integrate import IntegrationRequest, IntegrationResponse
 from managed_iam.schemas.orgs import OrgRegisterRequest, OrgRegisterResponse
-from managed_iam.schemas.sts import CredentialsRequest, CredentialsResponse
+from managed_iam.schemas.sts import (
+    CredentialsBatchRequest,
+    CredentialsBatchResponse,
+    CredentialsPartialResponse,
+    CredentialsRequest,
+    CredentialsResponse,
+)
 from managed_iam.schemas.users import UserCreateRequest, UserCreateResponse
 from managed_iam.schemas.validate import ValidateRequest, ValidateResponse
 from managed_iam.schemas.validation import ValidationWebhookPayload, ValidationWebhookResponse
@@ -45,6 +58,23 @@ def _error_response(description: str) -> Dict[str, Any]:
     }
 
 
+def _rate_limited_response() -> Dict[str, Any]:
+    response = _error_response("Rate limit exceeded.")
+    response["headers"] = {
+        "Retry-After": {
+            "description": "Seconds to wait before retrying.",
+            "schema": {"type": "integer"},
+        },
+        "RateLimit-Limit": {"schema": {"type": "integer"}},
+        "RateLimit-Remaining": {"schema": {"type": "integer"}},
+        "RateLimit-Reset": {
+            "description": "Seconds until the quota is fully restored.",
+            "schema": {"type": "integer"},
+        },
+    }
+    return response
+
+
 def build_openapi_schema(*, server_url: Optional[str] = None) -> Dict[str, Any]:
     """Return an OpenAPI 3.0 specification for the external API surface."""
     component_models: dict[str, type] = {
@@ -56,6 +86,9 @@ def build_openapi_schema(*, server_url: Optional[str] = None) -> Dict[str, Any]:
         "IntegrationResponse": IntegrationResponse,
         "CredentialsRequest": CredentialsRequest,
         "CredentialsResponse": CredentialsResponse,
+        "CredentialsPartialResponse": CredentialsPartialResponse,
+        "CredentialsBatchRequest": CredentialsBatchRequest,
+        "CredentialsBatchResponse": CredentialsBatchResponse,
         "ValidateRequest": ValidateRequest,
         "ValidateResponse": ValidateResponse,
         "ValidationWebhookPayload": ValidationWebhookPayload,
@@ -119,7 +152,10 @@ def build_openapi_schema(*, server_url: Optional[str] = None) -> Dict[str, Any]:
         "in": "header",
         "required": True,
         "schema": {"type": "string"},
-        "description": "Opaque identifier that prevents duplicate organisation registrations.",
+        "description": (
+            "Opaque identifier that prevents duplicate organisation registrations. Retries with the same key "
+            "and body receive the original response again, marked with `Idempotent-Replayed: true`."
+        ),
     }
 
     paths: Dict[str, Any] = {
@@ -170,7 +206,8 @@ def build_openapi_schema(*, server_url: Optional[str] = None) -> Dict[str, Any]:
                 "responses": {
                     **_success_response("OrgRegisterResponse", "Organisation registered.", status="201"),
                     "404": _error_response("User not found."),
-                    "409": _error_response("Organisation already exists or idempotency conflict."),
+                    "409": _error_response("Organisation already exists or the original request is still in progress."),
+                    "422": _error_response("Idempotency-Key reused with a different request."),
                     **error_common,
                 },
             }
@@ -209,22 +246,78 @@ def build_openapi_schema(*, server_url: Optional[str] = None) -> Dict[str, Any]:
                         "schema": {"type": "string"},
                         "description": "Optional AWS profile label echoed back in responses.",
                     },
+                    {
+                        "name": "fields",
+                        "in": "query",
+                        "required": False,
+                        "schema": {"type": "string"},
+                        "description": (
+                            "Comma-separated response fields to return; `credentials` and `links` select "
+                            "their groups. Omitting every link field skips link generation. Default: all. "
+                            "With `fields` the body is a `CredentialsPartialResponse` holding only those fields."
+                        ),
+                    },
                 ],
                 "requestBody": {
                     "required": True,
                     "content": _json_response("CredentialsRequest"),
                 },
                 "responses": {
-                    **_success_response("CredentialsResponse", "STS credentials issued."),
+                    "200": {
+                        "description": "STS credentials issued.",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "oneOf": [
+                                        _json_ref("CredentialsResponse"),
+                                        _json_ref("CredentialsPartialResponse"),
+                                    ]
+                                },
+                            }
+                        },
+                    },
                     "401": _error_response("API key mismatch."),
                     "404": _error_response("User not found."),
                     "412": _error_response("Organisation validation incomplete."),
-                    "429": _error_response("Rate limit exceeded."),
+                    "429": _rate_limited_response(),
                     "502": _error_response("Upstream AWS error during assume_role."),
                     **error_common,
                 },
             }
         },
+        "/api/credentials/batch": {
+            "post": {
+                "operationId": "issueCredentialsBatch",
+                "summary": "Assume roles in many managed accounts with a single API key check.",
+                "description": (
+                    "Results are returned in request order. Send `Accept: application/x-ndjson` to receive "
+                    "one `CredentialsBatchItem` per line as each account completes instead."
+                ),
+                "tags": ["Credentials"],
+                "parameters": [
+                    user_id_param,
+                    {
+                        "name": "aws_profile",
+                        "in": "query",
+                        "required": False,
+                        "schema": {"type": "string"},
+                        "description": "Optional AWS profile label echoed back in responses.",
+                    },
+                ],
+                "requestBody": {
+                    "required": True,
+                    "content": _json_response("CredentialsBatchRequest"),
+                },
+                "responses": {
+                    **_success_response("CredentialsBatchResponse", "Per-account STS credentials or errors."),
+                    "401": _error_response("API key mismatch."),
+                    "404": _error_response("User not found."),
+                    "412": _error_response("Organisation validation incomplete."),
+                    "429": _rate_limited_response(),
+                    **error_common,
+                },
+            }
+        },
         "/api/validate": {
             "post": {
                 "operationId": "validateCredentials",
@@ -239,7 +332,7 @@ def build_openapi_schema(*, server_url: Optional[str] = None) -> Dict[str, Any]:
                     "401": _error_response("API key mismatch."),
                     "404": _error_response("User not found."),
                     "412": _error_response("Organisation validation incomplete."),
-                    "429": _error_response("Rate limit exceeded."),
+                    "429": _rate_limited_response(),
                     **error_common,
                 },
             }
@@ -289,4 +382,79 @@ def build_openapi_schema(*, server_url: Optional[str] = None) -> Dict[str, Any]:
     return spec
 
 
-__all__ = ["build_openapi_schema"]
+@dataclass(frozen=True)
+class RenderedDocument:
+    body: bytes
+    gzipped: bytes
+    etag: str
+    gzip_etag: str
+
+
+class OpenAPIDocumentCache:
+    """Build the spec once per process and keep its rendered bytes per server URL.
+
+    Only ``servers`` depends on the request, so the model schemas are generated
+    once (by ``warm`` from the process startup hook); each base URL's JSON,
+    gzip body and strong ETags are kept in a small LRU, since the host comes
+    from the client (``ALLOWED_HOSTS`` has wildcards). Building the spec and
+    rendering a new host are CPU-bound, so async callers use ``arender``,
+    which does both in a worker thread.
+    """
+
+    def __init__(self, *, max_variants: int = 16, dumps: Callable[[Any], bytes] | None = None) -> None:
+        self._max_variants = max_variants
+        self._dumps = dumps or (lambda data: json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        self._spec: Dict[str, Any] | None = None
+        self._variants: OrderedDict[str, RenderedDocument] = OrderedDict()
+        # ``_lock`` only guards the LRU, so lookups never wait behind a spec build.
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def warm(self) -> Dict[str, Any]:
+        """Build the spec if it has not been built yet and return it."""
+        with self._build_lock:
+            if self._spec is None:
+                self._spec = build_openapi_schema()
+            return self._spec
+
+    def cached(self, server_url: str) -> RenderedDocument | None:
+        with self._lock:
+            document = self._variants.get(server_url)
+            if document is not None:
+                self._variants.move_to_end(server_url)
+            return document
+
+    def render(self, server_url: str) -> RenderedDocument:
+        document = self.cached(server_url)
+        if document is not None:
+            return document
+        spec = {**self.warm(), "servers": [{"url": server_url, "description": "API base URL"}]}
+        body = self._dumps(spec)
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # A strong ETag identifies exact bytes, so the gzip representation gets its own.
+        document = RenderedDocument(
+            body=body,
+            gzipped=gzip.compress(body, compresslevel=9, mtime=0),
+            etag=f'"{digest}"',
+            gzip_etag=f'"{digest}-gzip"',
+        )
+        with self._lock:
+            self._variants[server_url] = document
+            while len(self._variants) > self._max_variants:
+                self._variants.popitem(last=False)
+        return document
+
+    async def arender(self, server_url: str) -> RenderedDocument:
+        """``render`` without blocking the event loop: cache hits return directly, misses run in a thread."""
+        document = self.cached(server_url)
+        if document is None:
+            document = await asyncio.to_thread(self.render, server_url)
+        return document
+
+    def clear(self) -> None:
+        with self._build_lock, self._lock:
+            self._spec = None
+            self._variants.clear()
+
+
+__all__ = ["OpenAPIDocumentCache", "RenderedDocument", "build_openapi_schema"]
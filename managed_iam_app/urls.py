@@ -9,10 +9,12 @@ app_name = "managed_iam_app"
 
 urlpatterns = [
     path("health", views.health, name="health"),
+    path("metrics", views.metrics, name="metrics"),
     path("users", views.create_user, name="create_user"),
     path("register", views.register_org, name="register_org"),
     path("integrate", views.integrate, name="integrate"),
     path("credentials", views.issue_credentials, name="issue_credentials"),
+    path("credentials/batch", views.issue_credentials_batch, name="issue_credentials_batch"),
     path("validate", views.validate_credentials, name="validate_credentials"),
     path("integrations/validate", views.validation_webhook, name="validation_webhook"),
 ]
@@ -4,23 +4,28 @@ from .api import (
     create_user,
     integrate,
     issue_credentials,
+    issue_credentials_batch,
     register_org,
     validate_credentials,
     validation_webhook,
 )
 from .docs import openapi_document, swagger_ui
 from .health import health
-from .portal import portal
+from .metrics import metrics
+from .portal import portal, stack_status
 
 __all__ = [
     "health",
+    "metrics",
     "openapi_document",
     "swagger_ui",
     "portal",
+    "stack_status",
     "create_user",
     "register_org",
     "integrate",
     "issue_credentials",
+    "issue_credentials_batch",
     "validate_credentials",
     "validation_webhook",
 ]
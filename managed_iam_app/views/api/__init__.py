@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from .credentials import issue_credentials, validate_credentials
+from .credentials import issue_credentials, issue_credentials_batch, validate_credentials
 from .orgs import integrate, register_org
 from .users import create_user
 from .validation import validation_webhook
@@ -10,6 +10,7 @@ __all__ = [
     "register_org",
     "integrate",
     "issue_credentials",
+    "issue_credentials_batch",
     "validate_credentials",
     "validation_webhook",
 ]
@@ -1,25 +1,60 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import asdict
+from typing import AsyncIterator
 
-import boto3
 from botocore.exceptions import ClientError
-from django.http import HttpRequest, HttpResponseNotAllowed
+from django.http import HttpRequest, HttpResponseNotAllowed, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from pydantic import ValidationError
 
-from managed_iam.schemas.sts import CredentialsRequest, CredentialsResponse
+from managed_iam.aws import STSTransportError
+from managed_iam.config import settings
+from managed_iam.schemas.sts import (
+    CREDENTIAL_FIELDS,
+    LINK_FIELDS,
+    CredentialsBatchItem,
+    CredentialsBatchRequest,
+    CredentialsBatchResponse,
+    CredentialsPartialResponse,
+    CredentialsRequest,
+    CredentialsResponse,
+)
 from managed_iam.schemas.validate import ValidateRequest, ValidateResponse
-from managed_iam.services import RateLimitExceeded, RateLimiter
-from managed_iam.services.integration import IntegrationService
-from managed_iam.services.orgs import OrganisationService
-from managed_iam.services.sts import STSService
-from managed_iam.services.users import UserService
-from managed_iam_app.views.utils import json_error, json_response, parse_json_body
+from managed_iam.services import RateLimitExceeded
+from managed_iam.services.container import request_services
+from managed_iam.services.sts import BatchIssueResult
+from managed_iam_app.views.utils import (
+    json_error,
+    model_json,
+    model_response,
+    parse_model,
+    with_rate_limit_headers,
+)
 
 
 logger = logging.getLogger("managed_iam.audit")
 
+_FIELD_GROUPS = {"credentials": CREDENTIAL_FIELDS, "links": LINK_FIELDS}
+
+
+def _response_fields(raw: str | None) -> set[str]:
+    """Expand ``?fields=`` (field names and/or the ``credentials``/``links`` groups); default is everything."""
+    if raw is None:
+        return {*CREDENTIAL_FIELDS, *LINK_FIELDS}
+    selected: set[str] = set()
+    for name in filter(None, (part.strip() for part in raw.split(","))):
+        if name in _FIELD_GROUPS:
+            selected.update(_FIELD_GROUPS[name])
+        elif name in CREDENTIAL_FIELDS or name in LINK_FIELDS:
+            selected.add(name)
+        else:
+            raise ValueError(f"unknown field '{name}'")
+    if not selected:
+        raise ValueError("fields must name at least one response field")
+    return selected
+
 
 @csrf_exempt
 async def issue_credentials(request: HttpRequest):
@@ -33,25 +68,26 @@ async def issue_credentials(request: HttpRequest):
     aws_profile = request.GET.get("aws_profile")
 
     try:
-        payload = await parse_json_body(request)
-        model = CredentialsRequest.model_validate(payload)
+        fields = _response_fields(request.GET.get("fields"))
+        model = await parse_model(request, CredentialsRequest)
     except ValueError as exc:
         return json_error(str(exc), status=400)
     except ValidationError as exc:
         return json_error(exc.errors(), status=400)
 
-    limiter = RateLimiter()
+    services = request_services()
+    limiter = services.rate_limiter
     try:
-        await limiter.check(f"credentials:{user_id}:{model.org_name}")
+        rate_limit = await limiter.check(f"credentials:{user_id}:{model.org_name}")
     except RateLimitExceeded as exc:
-        return json_error(str(exc), status=429)
+        return with_rate_limit_headers(json_error(str(exc), status=429), exc.result)
 
-    user_service = UserService()
+    user_service = services.user
     if not await user_service.ensure_user(user_id):
         return json_error("user not found", status=404)
 
-    org_service = OrganisationService()
-    integration_service = IntegrationService(org_service=org_service)
+    org_service = services.org
+    integration_service = services.integration
     record = await org_service.verify_api_key(org_name=model.org_name, api_key=model.api_key)
     if not record or record.owner_user_id != user_id:
         return json_error("invalid credentials", status=401)
@@ -68,7 +104,7 @@ async def issue_credentials(request: HttpRequest):
             status=412,
         )
 
-    sts_service = STSService(org_service)
+    sts_service = services.sts
     try:
         credentials = await sts_service.issue_credentials(
             org_name=model.org_name,
@@ -94,7 +130,10 @@ async def issue_credentials(request: HttpRequest):
     except RuntimeError as exc:
         return json_error(str(exc), status=502)
 
-    links = await integration_service.build_links(org_name=model.org_name, aws_profile=aws_profile)
+    # Clients that only want the credentials skip link building (org read, decryption, S3 presign).
+    links: dict[str, str] = {}
+    if not fields.isdisjoint(LINK_FIELDS):
+        links = asdict(await integration_service.build_links(org_name=model.org_name, aws_profile=aws_profile))
 
     logger.info(
         "sts_credentials_issued",
@@ -106,17 +145,151 @@ async def issue_credentials(request: HttpRequest):
         },
     )
 
-    response = CredentialsResponse(
-        access_key_id=credentials.access_key_id,
-        secret_access_key=credentials.secret_access_key,
-        session_token=credentials.session_token,
-        expiration=credentials.expiration,
+    payload = {
+        "access_key_id": credentials.access_key_id,
+        "secret_access_key": credentials.secret_access_key,
+        "session_token": credentials.session_token,
+        "expiration": credentials.expiration,
+        **links,
+    }
+    if request.GET.get("fields") is None:
+        response = model_response(CredentialsResponse(**payload))
+    else:
+        response = model_response(CredentialsPartialResponse(**payload), include=fields)
+    return with_rate_limit_headers(response, rate_limit)
+
+
+def _batch_item(result: BatchIssueResult) -> CredentialsBatchItem:
+    if result.credentials is None:
+        return CredentialsBatchItem(
+            target_account_id=result.target_account_id,
+            status="failed",
+            error=result.error,
+        )
+    return CredentialsBatchItem(
+        target_account_id=result.target_account_id,
+        status="issued",
+        access_key_id=result.credentials.access_key_id,
+        secret_access_key=result.credentials.secret_access_key,
+        session_token=result.credentials.session_token,
+        expiration=result.credentials.expiration,
+    )
+
+
+def _log_batch_result(item: CredentialsBatchItem, *, user_id: str, model: CredentialsBatchRequest) -> None:
+    if item.status != "issued":
+        return
+    logger.info(
+        "sts_credentials_issued",
+        extra={
+            "user_id": user_id,
+            "org_name": model.org_name,
+            "role_type": model.role_type,
+            "target_account_id": item.target_account_id,
+            "batch": True,
+        },
+    )
+
+
+@csrf_exempt
+async def issue_credentials_batch(request: HttpRequest):
+    """Issue credentials for many accounts of one organisation, authenticating once.
+
+    Per-account results are returned together, or streamed as NDJSON lines in
+    completion order when the client sends ``Accept: application/x-ndjson``.
+    """
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    user_id = request.GET.get("user_id")
+    if not user_id:
+        return json_error("user_id query parameter required", status=400)
+
+    aws_profile = request.GET.get("aws_profile")
+
+    try:
+        model = await parse_model(request, CredentialsBatchRequest)
+    except ValueError as exc:
+        return json_error(str(exc), status=400)
+    except ValidationError as exc:
+        return json_error(exc.errors(), status=400)
+
+    if len(model.target_account_ids) > settings.credentials_batch_max_accounts:
+        return json_error(
+            f"at most {settings.credentials_batch_max_accounts} target accounts per request",
+            status=400,
+        )
+
+    services = request_services()
+    limiter = services.rate_limiter
+    try:
+        rate_limit = await limiter.check(f"credentials:{user_id}:{model.org_name}")
+    except RateLimitExceeded as exc:
+        return with_rate_limit_headers(json_error(str(exc), status=429), exc.result)
+
+    user_service = services.user
+    if not await user_service.ensure_user(user_id):
+        return json_error("user not found", status=404)
+
+    org_service = services.org
+    integration_service = services.integration
+    sts_service = services.sts
+    try:
+        record = await sts_service.authorize(org_name=model.org_name, api_key=model.api_key, user_id=user_id)
+    except ValueError:
+        return json_error("invalid credentials", status=401)
+    except PermissionError:
+        links = await integration_service.build_links(org_name=model.org_name, aws_profile=aws_profile)
+        return json_error(
+            {
+                "message": "org validation incomplete",
+                "console_url": links.console_url,
+                "template_url": links.template_url,
+                "aws_cli_command": links.aws_cli_command,
+            },
+            status=412,
+        )
+    results = sts_service.issue_many(
+        record=record,
+        user_id=user_id,
+        role_type=model.role_type,
+        target_account_ids=model.target_account_ids,
+        aws_profile=aws_profile,
+        concurrency=settings.credentials_batch_concurrency,
+    )
+
+    if "application/x-ndjson" in request.headers.get("Accept", ""):
+
+        async def stream() -> AsyncIterator[bytes]:
+            async for result in results:
+                item = _batch_item(result)
+                _log_batch_result(item, user_id=user_id, model=model)
+                yield model_json(item) + b"\n"
+
+        return with_rate_limit_headers(
+            StreamingHttpResponse(stream(), content_type="application/x-ndjson"),
+            rate_limit,
+        )
+
+    items: dict[str, CredentialsBatchItem] = {}
+    async for result in results:
+        item = _batch_item(result)
+        _log_batch_result(item, user_id=user_id, model=model)
+        items[item.target_account_id] = item
+
+    links = await integration_service.build_links(org_name=model.org_name, aws_profile=aws_profile)
+    ordered = [items[account_id] for account_id in model.target_account_ids]
+    issued = sum(1 for item in ordered if item.status == "issued")
+    response = CredentialsBatchResponse(
+        results=ordered,
+        issued=issued,
+        failed=len(ordered) - issued,
         console_url=links.console_url,
         aws_cli_command=links.aws_cli_command,
         template_url=links.template_url,
         region=links.region,
     )
-    return json_response(response.model_dump())
+    return with_rate_limit_headers(model_response(response), rate_limit)
 
 
 @csrf_exempt
@@ -125,29 +298,29 @@ async def validate_credentials(request: HttpRequest):
         return HttpResponseNotAllowed(["POST"])
 
     try:
-        payload = await parse_json_body(request)
-        model = ValidateRequest.model_validate(payload)
+        model = await parse_model(request, ValidateRequest)
     except ValueError as exc:
         return json_error(str(exc), status=400)
     except ValidationError as exc:
         return json_error(exc.errors(), status=400)
 
-    limiter = RateLimiter()
+    services = request_services()
+    limiter = services.rate_limiter
     try:
-        await limiter.check(f"validate:{model.user_id}:{model.org_name}")
+        rate_limit = await limiter.check(f"validate:{model.user_id}:{model.org_name}")
     except RateLimitExceeded as exc:
-        return json_error(str(exc), status=429)
+        return with_rate_limit_headers(json_error(str(exc), status=429), exc.result)
 
-    user_service = UserService()
+    user_service = services.user
     if not await user_service.ensure_user(model.user_id):
         return json_error("user not found", status=404)
 
-    org_service = OrganisationService()
+    org_service = services.org
     record = await org_service.verify_api_key(org_name=model.org_name, api_key=model.api_key)
     if not record or record.owner_user_id != model.user_id:
         return json_error("invalid credentials", status=401)
 
-    integration_service = IntegrationService(org_service=org_service)
+    integration_service = services.integration
     if not record.validation_status:
         links = await integration_service.build_links(
             org_name=model.org_name,
@@ -163,15 +336,13 @@ async def validate_credentials(request: HttpRequest):
             status=412,
         )
 
-    session = boto3.Session(
-        aws_access_key_id=model.access_key_id,
-        aws_secret_access_key=model.secret_access_key,
-        aws_session_token=model.session_token,
-        region_name=model.region,
-    )
-
     try:
-        identity = session.client("sts").get_caller_identity()
+        identity = await services.sts.get_caller_identity(
+            access_key_id=model.access_key_id,
+            secret_access_key=model.secret_access_key,
+            session_token=model.session_token,
+            region=model.region,
+        )
         logger.info(
             "sts_credentials_validated",
             extra={
@@ -181,9 +352,11 @@ async def validate_credentials(request: HttpRequest):
             },
         )
         response = ValidateResponse(success=True, identity_arn=identity.get("Arn"), message="credentials validated")
-        return json_response(response.model_dump())
+        return with_rate_limit_headers(model_response(response), rate_limit)
     except ClientError as exc:
         return json_error(str(exc), status=400)
+    except STSTransportError as exc:
+        return json_error(str(exc), status=502)
 
 
-__all__ = ["issue_credentials", "validate_credentials"]
+__all__ = ["issue_credentials", "issue_credentials_batch", "validate_credentials"]
@@ -8,11 +8,9 @@ from pydantic import ValidationError
 
 from managed_iam.schemas.integrate import IntegrationRequest, IntegrationResponse
 from managed_iam.schemas.orgs import OrgRegisterRequest, OrgRegisterResponse
-from managed_iam.services import IdempotencyError, IdempotencyService
-from managed_iam.services.integration import IntegrationService
-from managed_iam.services.orgs import OrganisationService
-from managed_iam.services.users import UserService
-from managed_iam_app.views.utils import json_error, json_response, parse_json_body
+from managed_iam.services import IdempotencyError, IdempotencyMismatch, IdempotencyService
+from managed_iam.services.container import request_services
+from managed_iam_app.views.utils import json_error, json_response, model_response, parse_model
 
 
 logger = logging.getLogger("managed_iam.audit")
@@ -32,27 +30,39 @@ async def register_org(request: HttpRequest):
         return json_error("Idempotency-Key header required", status=400)
 
     try:
-        payload = await parse_json_body(request)
-        model = OrgRegisterRequest.model_validate(payload)
+        model = await parse_model(request, OrgRegisterRequest)
     except ValueError as exc:
         return json_error(str(exc), status=400)
     except ValidationError as exc:
         return json_error(exc.errors(), status=400)
 
-    user_service = UserService()
-    if not await user_service.ensure_user(user_id):
+    services = request_services()
+    if not await services.user.ensure_user(user_id):
         return json_error("user not found", status=404)
 
+    idempotency = services.idempotency
     try:
-        await IdempotencyService().claim(idempotency_key)
+        claim = await idempotency.claim(
+            f"register:{user_id}:{idempotency_key}",
+            fingerprint=IdempotencyService.fingerprint(user_id, model.model_dump()),
+        )
+    except IdempotencyMismatch as exc:
+        return json_error(str(exc), status=422)
     except IdempotencyError as exc:
         return json_error(str(exc), status=409)
+    if claim.replay is not None:
+        response = json_response(claim.replay.body, status=claim.replay.status)
+        response["Idempotent-Replayed"] = "true"
+        return response
 
-    org_service = OrganisationService()
     try:
-        result = await org_service.register_org(org_name=model.org_name, owner_user_id=user_id)
+        result = await services.org.register_org(org_name=model.org_name, owner_user_id=user_id)
     except ValueError as exc:
+        await idempotency.complete(claim, status=409, body={"detail": str(exc)})
         return json_error(str(exc), status=409)
+    except BaseException:
+        await idempotency.release(claim)
+        raise
 
     logger.info(
         "org_registered",
@@ -63,7 +73,8 @@ async def register_org(request: HttpRequest):
     )
 
     response = OrgRegisterResponse(org_name=result.org_name, api_key=result.api_key, external_id=result.external_id)
-    return json_response(response.model_dump(), status=201)
+    await idempotency.complete(claim, status=201, body=response.model_dump())
+    return model_response(response, status=201)
 
 
 @csrf_exempt
@@ -76,30 +87,28 @@ async def integrate(request: HttpRequest):
         return json_error("user_id query parameter required", status=400)
 
     try:
-        payload = await parse_json_body(request)
-        model = IntegrationRequest.model_validate(payload)
+        model = await parse_model(request, IntegrationRequest)
     except ValueError as exc:
         return json_error(str(exc), status=400)
     except ValidationError as exc:
         return json_error(exc.errors(), status=400)
 
-    user_service = UserService()
-    if not await user_service.ensure_user(user_id):
+    services = request_services()
+    if not await services.user.ensure_user(user_id):
         return json_error("user not found", status=404)
 
-    org_service = OrganisationService()
-    record = await org_service.verify_api_key(org_name=model.org_name, api_key=model.api_key)
+    record = await services.org.verify_api_key(org_name=model.org_name, api_key=model.api_key)
     if not record or record.owner_user_id != user_id:
         return json_error("invalid credentials", status=401)
 
-    links = await IntegrationService(org_service=org_service).build_links(
+    links = await services.integration.build_links(
         org_name=model.org_name,
         aws_profile=model.aws_profile,
         expires_in=model.expires_in,
     )
 
     response = IntegrationResponse(**links.__dict__)
-    return json_response(response.model_dump())
+    return model_response(response)
 
 
 __all__ = ["register_org", "integrate"]
@@ -4,8 +4,8 @@ from django.http import HttpRequest, HttpResponseNotAllowed
 from django.views.decorators.csrf import csrf_exempt
 
 from managed_iam.schemas.validation import ValidationWebhookResponse
-from managed_iam.services.validation import ValidationWebhookService
-from managed_iam_app.views.utils import json_error, json_response, read_body
+from managed_iam.services.container import request_services
+from managed_iam_app.views.utils import json_error, model_response, read_body
 
 
 @csrf_exempt
@@ -15,7 +15,7 @@ async def validation_webhook(request: HttpRequest):
 
     headers = {key.lower(): value for key, value in request.headers.items()}
     body = await read_body(request)
-    service = ValidationWebhookService()
+    service = request_services().validation
     try:
         result = await service.process_webhook(headers=headers, body=body)
     except ValueError as exc:
@@ -28,7 +28,7 @@ async def validation_webhook(request: HttpRequest):
         account_partition=result.account_partition,
         account_tags=result.account_tags,
     )
-    return json_response(response.model_dump())
+    return model_response(response)
 
 
 __all__ = ["validation_webhook"]
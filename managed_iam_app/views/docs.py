@@ -2,9 +2,35 @@ from __future__ import annotations
 
 from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
 
-from managed_iam_app.openapi import build_openapi_schema
-from managed_iam_app.views.utils import json_response
+from managed_iam_app.openapi import OpenAPIDocumentCache
+from managed_iam_app.views.utils import JSON_CONTENT_TYPE, json_codec
+
+# The document only changes on deploy; clients revalidate with If-None-Match after this.
+OPENAPI_MAX_AGE_SECONDS = 300
+
+openapi_document_cache = OpenAPIDocumentCache(dumps=json_codec.dumps)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an ``Accept-Encoding`` value allows gzip, honouring ``q=0`` and the ``*`` wildcard."""
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return quality > 0
 
 
 SWAGGER_UI_TEMPLATE = """<!DOCTYPE html>
@@ -39,9 +65,17 @@ async def openapi_document(request: HttpRequest):
     if request.method != "GET":
         return HttpResponseNotAllowed(["GET"])
 
-    base_url = request.build_absolute_uri("/")
-    spec = build_openapi_schema(server_url=base_url.rstrip("/"))
-    return json_response(spec)
+    document = await openapi_document_cache.arender(request.build_absolute_uri("/").rstrip("/"))
+    if accepts_gzip(request.headers.get("Accept-Encoding", "")):
+        response = HttpResponse(document.gzipped, content_type=JSON_CONTENT_TYPE)
+        response["Content-Encoding"] = "gzip"
+        response["ETag"] = document.gzip_etag
+    else:
+        response = HttpResponse(document.body, content_type=JSON_CONTENT_TYPE)
+        response["ETag"] = document.etag
+    patch_cache_control(response, public=True, max_age=OPENAPI_MAX_AGE_SECONDS)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return get_conditional_response(request, etag=response["ETag"], response=response)
 
 
 async def swagger_ui(request: HttpRequest):
@@ -53,4 +87,4 @@ async def swagger_ui(request: HttpRequest):
     return HttpResponse(html, content_type="text/html")
 
 
-__all__ = ["openapi_document", "swagger_ui"]
+__all__ = ["accepts_gzip", "openapi_document", "swagger_ui"]
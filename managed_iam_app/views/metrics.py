@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from django.http import HttpRequest, HttpResponseNotAllowed
+from django.views.decorators.csrf import csrf_exempt
+
+from managed_iam_app.views.utils import json_response
+
+
+@csrf_exempt
+async def metrics(request: HttpRequest):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    from managed_iam.app import runtime_stats
+
+    return json_response(runtime_stats())
+
+
+__all__ = ["metrics"]
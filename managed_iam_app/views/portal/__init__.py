@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from .stack_status import stack_status
 from .view import portal
 
-__all__ = ["portal"]
+__all__ = ["portal", "stack_status"]
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Any, TypeVar
 from urllib.parse import quote
 
-import boto3
 from botocore.exceptions import ClientError
 from django.core.exceptions import ValidationError as DjangoValidationError
 
+from managed_iam.aws import client_registry
 from managed_iam.config import settings
 from managed_iam.schemas.orgs import OrgRegisterResponse
-from managed_iam.services.sts import STSService
+from managed_iam.services.jobs import JobKind, WorkloadJobInProgress
+from managed_iam.services.stack_watch import stack_watch_hub
 from managed_iam_app.forms import (
     KeyPairForm,
     OrgRegisterForm,
@@ -19,6 +22,8 @@ from managed_iam_app.forms import (
 from managed_iam_app.views.portal.context import PortalContext
 from managed_iam_app.views.portal.services import PortalServices
 
+FormT = TypeVar("FormT", WorkloadDeployForm, WorkloadDeleteForm)
+
 
 async def handle_create_user(form: UserCreateForm, *, services: PortalServices, context: PortalContext) -> UserCreateForm:
     if not form.is_valid():
@@ -94,6 +99,12 @@ async def handle_deploy_workload(
         form.add_error(None, "invalid organisation credentials")
         return form
 
+    if settings.workload_job_mode == "queue":
+        if not record.validation_status or not record.account_id:
+            form.add_error(None, "organisation is not validated yet")
+            return form
+        return await _enqueue_workload_job(form, "deploy", selected_org, parameters, services=services, context=context)
+
     try:
         result = await services.workload.deploy_stack(
             org_name=selected_org,
@@ -106,6 +117,7 @@ async def handle_deploy_workload(
     context.selected_org = selected_org
     context.workload_result = result
     context.add_alert("success", result.message)
+    stack_watch_hub.nudge(selected_org)
     return form
 
 
@@ -119,6 +131,16 @@ async def handle_delete_workload(
         return form
 
     selected_org = form.cleaned_data["org_name"]
+    if settings.workload_job_mode == "queue":
+        record = await services.org.get_org(selected_org, fields=("validation_status", "account_id"))
+        if not record:
+            form.add_error(None, "organisation not found")
+            return form
+        if not record.validation_status or not record.account_id:
+            form.add_error(None, "organisation is not validated yet")
+            return form
+        return await _enqueue_workload_job(form, "delete", selected_org, None, services=services, context=context)
+
     try:
         result = await services.workload.delete_stack(org_name=selected_org)
     except (ValueError, PermissionError, ClientError) as exc:
@@ -128,6 +150,30 @@ async def handle_delete_workload(
     context.selected_org = selected_org
     context.workload_result = result
     context.add_alert("info", result.message)
+    stack_watch_hub.nudge(selected_org)
+    return form
+
+
+async def _enqueue_workload_job(
+    form: FormT,
+    kind: JobKind,
+    org_name: str,
+    parameters: dict[str, Any] | None,
+    *,
+    services: PortalServices,
+    context: PortalContext,
+) -> FormT:
+    """Hand the CloudFormation calls to the worker and return without waiting for them."""
+    try:
+        job = await services.jobs.enqueue(kind, org_name, parameters=parameters)
+    except WorkloadJobInProgress as exc:
+        form.add_error(None, str(exc))
+        return form
+
+    context.selected_org = org_name
+    context.workload_job = job
+    context.add_alert("info", f"Workload {kind} queued as job {job.job_id}; stack events appear below as it runs.")
+    stack_watch_hub.nudge(org_name)
     return form
 
 
@@ -152,7 +198,7 @@ async def handle_create_keypair(
         form.add_error(None, "organisation must be validated before creating resources")
         return form
 
-    sts_service = STSService(services.org)
+    sts_service = services.sts
     try:
         creds = await sts_service.issue_credentials(
             org_name=org_name,
@@ -165,15 +211,21 @@ async def handle_create_keypair(
         form.add_error(None, str(exc))
         return form
 
-    session = boto3.Session(
-        aws_access_key_id=creds.access_key_id,
-        aws_secret_access_key=creds.secret_access_key,
-        aws_session_token=creds.session_token,
-        region_name=settings.aws_region,
-    )
-    ec2 = session.client("ec2")
+    def create_key_pair() -> dict[str, Any]:
+        ec2 = client_registry.client(
+            "ec2",
+            region=settings.aws_region,
+            credentials={
+                "AccessKeyId": creds.access_key_id,
+                "SecretAccessKey": creds.secret_access_key,
+                "SessionToken": creds.session_token,
+            },
+        )
+        return ec2.create_key_pair(KeyName=key_name)
+
+    # Building the client and the EC2 call both block, so keep them off the event loop.
     try:
-        response = ec2.create_key_pair(KeyName=key_name)
+        response = await asyncio.to_thread(create_key_pair)
     except ClientError as exc:
         form.add_error(None, str(exc))
         return form
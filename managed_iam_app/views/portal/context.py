@@ -5,7 +5,8 @@ from typing import Any
 
 from managed_iam.schemas.orgs import OrgRegisterResponse
 from managed_iam.services.integration import IntegrationLinks
-from managed_iam.services.workload import WorkloadActionResult, WorkloadStatus
+from managed_iam.services.jobs import WorkloadJob
+from managed_iam.services.workload import StackEvent, WorkloadActionResult, WorkloadStatus
 
 
 @dataclass
@@ -15,9 +16,13 @@ class PortalContext:
     registration_result: OrgRegisterResponse | None = None
     selected_org: str | None = None
     integration_links: IntegrationLinks | None = None
+    integration_links_pending: bool = False
     org_details: dict[str, Any] | None = None
     stack_status: WorkloadStatus | None = None
+    stack_status_pending: bool = False
+    stack_events: list[StackEvent] = field(default_factory=list)
     workload_result: WorkloadActionResult | None = None
+    workload_job: WorkloadJob | None = None
     created_keypair_name: str | None = None
     created_keypair_download: str | None = None
 
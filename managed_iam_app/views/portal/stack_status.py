@@ -0,0 +1,143 @@
+"""Workload stack status for the portal, as a JSON snapshot or a server-sent event stream."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict
+from typing import Any, AsyncIterator
+
+from botocore.exceptions import ClientError
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, HttpResponseNotAllowed, StreamingHttpResponse
+
+from managed_iam.config import settings
+from managed_iam.services.container import request_services
+from managed_iam.services.stack_watch import ActivityFetch, StackEvent, StackWatch, stack_watch_hub
+from managed_iam.services.workload import StackActivity, WorkloadStatus
+from managed_iam_app.views.utils import json_codec, json_error, json_response
+
+# Comment lines keep proxies from closing an idle stream; ``retry`` is the browser's reconnect delay.
+_KEEPALIVE_SECONDS = 15.0
+_RETRY_MS = 3000
+
+
+def _activity_fetch(org_name: str) -> ActivityFetch:
+    async def fetch(after_event_id: str | None) -> StackActivity:
+        # Fresh request services per poll: the watch outlives the request that started it.
+        return await request_services().workload.stack_activity(
+            org_name,
+            after_event_id=after_event_id,
+            limit=stack_watch_hub.history,
+        )
+
+    return fetch
+
+
+def watch_stack(org_name: str) -> StackWatch:
+    """This worker's shared watch of the org's workload stack."""
+    return stack_watch_hub.watch((org_name, None), _activity_fetch(org_name))
+
+
+def sse_enabled(request: HttpRequest) -> bool:
+    """Whether this request can be answered with a live event stream.
+
+    Only the ASGI handler sends a streaming response as it is produced; the
+    WSGI handler drains an async iterator to the end before sending anything,
+    tying up a sync worker for the whole stream.
+    """
+    return isinstance(request, ASGIRequest)
+
+
+def _status_payload(status: WorkloadStatus | None) -> dict[str, Any] | None:
+    return asdict(status) if status is not None else None
+
+
+def _events_after(events: list[StackEvent], event_id: str | None) -> list[StackEvent]:
+    """Events newer than ``event_id``; all of them if it is unknown (or fell out of the history)."""
+    for index, event in enumerate(events):
+        if event.event_id == event_id:
+            return events[index + 1 :]
+    return events
+
+
+def _sse(event: str, payload: Any, *, event_id: str | None = None) -> bytes:
+    lines = [f"id: {event_id}".encode()] if event_id else []
+    lines.append(f"event: {event}".encode())
+    lines.append(b"data: " + json_codec.dumps(payload))
+    return b"\n".join(lines) + b"\n\n"
+
+
+async def stack_status(request: HttpRequest):
+    """``GET ?org_name=`` returns the latest status and recent events (``since=`` filters them).
+
+    Under ASGI, ``Accept: text/event-stream`` (``EventSource``) streams ``status``
+    changes, new ``stack-event``s and ``poll-error``s instead; under WSGI such
+    requests get the JSON snapshot. Every viewer of a stack shares one poll
+    loop per worker.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    org_name = request.GET.get("org_name")
+    if not org_name:
+        return json_error("org_name query parameter required", status=400)
+
+    watch = watch_stack(org_name)
+    try:
+        snapshot = await watch.snapshot(max_age=stack_watch_hub.min_interval)
+    except ValueError as exc:
+        return json_error(str(exc), status=404)
+    except PermissionError as exc:
+        return json_error(str(exc), status=412)
+    except ClientError as exc:
+        return json_error(str(exc), status=502)
+
+    if sse_enabled(request) and "text/event-stream" in request.headers.get("Accept", ""):
+        response = StreamingHttpResponse(
+            _event_stream(watch, last_event_id=request.headers.get("Last-Event-ID")),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    return json_response(
+        {
+            "org_name": org_name,
+            "status": _status_payload(snapshot.status),
+            "events": [asdict(event) for event in _events_after(snapshot.events, request.GET.get("since"))],
+        }
+    )
+
+
+async def _event_stream(watch: StackWatch, *, last_event_id: str | None) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    # Subscribe and read the state without awaiting in between, so no update falls in the gap.
+    queue = watch.subscribe()
+    try:
+        state = watch.snapshot_state()
+        yield f"retry: {_RETRY_MS}\n\n".encode()
+        if state is not None:
+            yield _sse("status", _status_payload(state.status))
+            for event in _events_after(state.events, last_event_id):
+                yield _sse("stack-event", asdict(event), event_id=event.event_id)
+
+        deadline = loop.time() + settings.stack_watch_stream_seconds
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                kind, payload = await asyncio.wait_for(queue.get(), timeout=min(_KEEPALIVE_SECONDS, remaining))
+            except TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if kind == "status":
+                yield _sse("status", _status_payload(payload))
+            elif kind == "event":
+                yield _sse("stack-event", asdict(payload), event_id=payload.event_id)
+            else:
+                # Not "error": EventSource reserves that name for connection failures.
+                yield _sse("poll-error", {"detail": payload})
+    finally:
+        watch.unsubscribe(queue)
+
+
+__all__ = ["sse_enabled", "stack_status", "watch_stack"]
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
 from asgiref.sync import sync_to_async
 from botocore.exceptions import ClientError
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 
+from managed_iam.config import settings
 from managed_iam.schemas.orgs import OrgRegisterResponse
-from managed_iam.services.integration import IntegrationService
+from managed_iam.services.container import request_services
 from managed_iam_app.forms import (
     KeyPairForm,
     OrgLookupForm,
@@ -24,10 +28,13 @@ from managed_iam_app.views.portal.actions import (
 )
 from managed_iam_app.views.portal.context import PortalContext
 from managed_iam_app.views.portal.services import PortalServices
+from managed_iam_app.views.portal.stack_status import sse_enabled, watch_stack
+
+T = TypeVar("T")
 
 
 async def portal(request: HttpRequest) -> HttpResponse:
-    services = PortalServices()
+    services = request_services()
     portal_state = PortalContext()
 
     lookup_form = _resolve_selected_org(OrgLookupForm(request.GET or None), portal_state)
@@ -93,8 +100,14 @@ async def portal(request: HttpRequest) -> HttpResponse:
         "selected_org": portal_state.selected_org,
         "org_details": portal_state.org_details,
         "integration_links": portal_state.integration_links,
+        "integration_links_pending": portal_state.integration_links_pending,
         "stack_status": portal_state.stack_status,
+        "stack_status_pending": portal_state.stack_status_pending,
+        "stack_events": list(reversed(portal_state.stack_events)),
+        "sse_enabled": sse_enabled(request),
+        "stack_poll_ms": int(max(settings.stack_watch_min_interval_seconds, 5.0) * 1000),
         "workload_result": portal_state.workload_result,
+        "workload_job": portal_state.workload_job,
         "created_keypair_name": portal_state.created_keypair_name,
         "created_keypair_download": portal_state.created_keypair_download,
     }
@@ -126,12 +139,40 @@ async def _hydrate_selected_org(
         "account_tags": record.account_tags or {},
     }
 
+    async def load_links() -> None:
+        portal_state.integration_links, portal_state.integration_links_pending = await _load_section(
+            lambda: services.integration.build_links(org_name=record.org_name),
+            timeout=settings.portal_links_timeout_seconds,
+            errors=(ValueError,),
+            portal_state=portal_state,
+        )
+
+    async def load_stack_status() -> None:
+        # Served from the shared watch when another viewer polled it moments ago.
+        snapshot, portal_state.stack_status_pending = await _load_section(
+            lambda: watch_stack(record.org_name).snapshot(max_age=settings.stack_watch_min_interval_seconds),
+            timeout=settings.portal_stack_status_timeout_seconds,
+            errors=(ValueError, PermissionError, ClientError),
+            portal_state=portal_state,
+        )
+        if snapshot is not None:
+            portal_state.stack_status = snapshot.status
+            portal_state.stack_events = snapshot.events
+
+    async def load_job() -> None:
+        # Right after enqueueing the handler already holds the job; otherwise show the latest one.
+        if portal_state.workload_job is None:
+            portal_state.workload_job = await services.jobs.latest(record.org_name)
+
+    # Links and stack status only depend on the record, so fetch them together,
+    # each within its own budget; the page waits for the slower one at most.
     portal_state.integration_links = None
-    integration_service = services.integration or IntegrationService(org_service=services.org)
-    try:
-        portal_state.integration_links = await integration_service.build_links(org_name=record.org_name)
-    except ValueError as exc:
-        portal_state.add_alert("error", str(exc))
+    portal_state.stack_status = None
+    async with asyncio.TaskGroup() as sections:
+        sections.create_task(load_links())
+        if record.validation_status and record.account_id:
+            sections.create_task(load_stack_status())
+            sections.create_task(load_job())
 
     deploy_form = deploy_form or _default_deploy_form(record.org_name, record.owner_user_id, portal_state.registration_result)
     delete_form = delete_form or WorkloadDeleteForm(initial={"org_name": record.org_name})
@@ -144,18 +185,31 @@ async def _hydrate_selected_org(
     if not keypair_form.is_bound:
         keypair_form = KeyPairForm(initial=keypair_initial)
 
-    if record.validation_status and record.account_id:
-        try:
-            portal_state.stack_status = await services.workload.describe_stack(record.org_name)
-        except (ValueError, PermissionError, ClientError) as exc:
-            portal_state.add_alert("error", str(exc))
-            portal_state.stack_status = None
-    else:
-        portal_state.stack_status = None
-
     return deploy_form, delete_form, keypair_form
 
 
+async def _load_section(
+    fetch: Callable[[], Awaitable[T]],
+    *,
+    timeout: float,
+    errors: tuple[type[Exception], ...],
+    portal_state: PortalContext,
+) -> tuple[T | None, bool]:
+    """Return ``(value, pending)``; ``pending`` means the budget ran out and the page shows a placeholder.
+
+    Expected failures become alerts. Work that runs in a thread or behind the
+    shared role cache keeps going after a timeout, so a reload usually finds it done.
+    """
+    try:
+        async with asyncio.timeout(timeout):
+            return await fetch(), False
+    except TimeoutError:
+        return None, True
+    except errors as exc:
+        portal_state.add_alert("error", str(exc))
+        return None, False
+
+
 def _default_deploy_form(
     org_name: str,
     owner_user_id: str,
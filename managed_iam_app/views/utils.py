@@ -2,21 +2,111 @@ from __future__ import annotations
 
 import inspect
 import json
-from typing import Any
+from functools import lru_cache
+from typing import Any, Collection, Protocol, TypeVar
 
-from django.http import HttpRequest, JsonResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
+from managed_iam.config import settings
+from managed_iam.services.ratelimit import RateLimitResult
 
-def json_response(data: Any, *, status: int = 200) -> JsonResponse:
-    """Return a JSON response with UTF-8 safe dumps settings."""
-    return JsonResponse(data, status=status, json_dumps_params={"ensure_ascii": False})
+T = TypeVar("T")
 
+JSON_CONTENT_TYPE = "application/json"
 
-def json_error(detail: Any, *, status: int) -> JsonResponse:
+
+class JSONCodec(Protocol):
+    """Encoder/decoder for JSON payloads that are not pydantic models."""
+
+    name: str
+
+    def dumps(self, data: Any) -> bytes: ...
+
+    def loads(self, raw: bytes) -> Any: ...
+
+
+class StdlibJSONCodec:
+    name = "stdlib"
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, raw: bytes) -> Any:
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError as exc:
+            raise ValueError("invalid JSON body") from exc
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        self._fallback = DjangoJSONEncoder().default
+
+    def dumps(self, data: Any) -> bytes:
+        return self._orjson.dumps(data, default=self._fallback, option=self._orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, raw: bytes) -> Any:
+        try:
+            return self._orjson.loads(raw)
+        except self._orjson.JSONDecodeError as exc:
+            raise ValueError("invalid JSON body") from exc
+
+
+def load_json_codec(backend: str = "auto") -> JSONCodec:
+    """Build the codec for ``backend``; ``auto`` prefers orjson when it is installed."""
+    if backend == "stdlib":
+        return StdlibJSONCodec()
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        if backend == "orjson":
+            raise
+        return StdlibJSONCodec()
+
+
+json_codec: JSONCodec = load_json_codec(settings.json_backend)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter[Any]:
+    """One compiled validator per schema, built on first use."""
+    return TypeAdapter(schema)
+
+
+def json_response(data: Any, *, status: int = 200) -> HttpResponse:
+    """Return a JSON response for plain data, encoded with the configured codec."""
+    return HttpResponse(json_codec.dumps(data), status=status, content_type=JSON_CONTENT_TYPE)
+
+
+def model_json(model: BaseModel, *, include: Collection[str] | None = None) -> bytes:
+    """Serialise a model straight to JSON bytes, without an intermediate dict or str."""
+    return model.__pydantic_serializer__.to_json(model, include=set(include) if include is not None else None)
+
+
+def model_response(model: BaseModel, *, status: int = 200, include: Collection[str] | None = None) -> HttpResponse:
+    return HttpResponse(model_json(model, include=include), status=status, content_type=JSON_CONTENT_TYPE)
+
+
+def json_error(detail: Any, *, status: int) -> HttpResponse:
     """Return a consistent error payload."""
     return json_response({"detail": detail}, status=status)
 
 
+def with_rate_limit_headers(response: HttpResponseBase, result: RateLimitResult | None) -> HttpResponseBase:
+    """Attach ``RateLimit-*``/``Retry-After`` headers describing the caller's quota."""
+    if result is not None:
+        for name, value in result.headers().items():
+            response[name] = value
+    return response
+
+
 async def read_body(request: HttpRequest) -> bytes:
     """Read and normalise the request body into bytes."""
     body = request.body
@@ -32,10 +122,42 @@ async def parse_json_body(request: HttpRequest) -> Any:
     body = await read_body(request)
     if not body:
         return {}
+    return json_codec.loads(body)
+
+
+def validate_json(schema: type[T], raw: bytes) -> T:
+    """Parse and validate raw JSON in one pass; an empty body validates as ``{}``.
+
+    Malformed JSON raises ``ValueError("invalid JSON body")``, as
+    ``parse_json_body`` does; schema violations raise ``ValidationError``.
+    """
     try:
-        return json.loads(body)
-    except json.JSONDecodeError as exc:
-        raise ValueError("invalid JSON body") from exc
+        return type_adapter(schema).validate_json(raw or b"{}")
+    except ValidationError as exc:
+        if any(error["type"] == "json_invalid" for error in exc.errors(include_url=False)):
+            raise ValueError("invalid JSON body") from exc
+        raise
+
+
+async def parse_model(request: HttpRequest, schema: type[T]) -> T:
+    """Validate the request body against ``schema`` straight from bytes."""
+    return validate_json(schema, await read_body(request))
 
 
-__all__ = ["json_response", "json_error", "read_body", "parse_json_body"]
+__all__ = [
+    "JSONCodec",
+    "OrjsonCodec",
+    "StdlibJSONCodec",
+    "json_codec",
+    "json_error",
+    "json_response",
+    "load_json_codec",
+    "model_json",
+    "model_response",
+    "parse_json_body",
+    "parse_model",
+    "read_body",
+    "type_adapter",
+    "validate_json",
+    "with_rate_limit_headers",
+]
@@ -0,0 +1,9 @@
+"""URL configuration for requests served by the lean API handler."""
+
+from __future__ import annotations
+
+from django.urls import include, path
+
+urlpatterns = [
+    path("api/", include("managed_iam_app.urls")),
+]
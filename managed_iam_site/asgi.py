@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import os
 
-from django.core.asgi import get_asgi_application
+from managed_iam_site.handlers import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "managed_iam_site.settings")
 
-application = get_asgi_application()
+from managed_iam.app import with_lifespan  # noqa: E402 - imported after settings are selected
 
+# Shared services and pools are warmed by the server's lifespan startup and closed on shutdown.
+application = with_lifespan(get_asgi_application())
@@ -0,0 +1,131 @@
+"""Entry-point handlers that serve ``/api/`` through a lean middleware chain.
+
+The JSON API is csrf-exempt and authenticates with API keys, so sessions,
+CSRF, auth, messages and clickjacking middleware only add work there (and
+``SessionMiddleware`` touches the database). Each entry point therefore
+builds two Django handlers: one with ``API_MIDDLEWARE`` and ``API_URLCONF``
+for paths under ``/api/``, and the regular one for the portal, docs and admin.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import django
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.core.handlers.wsgi import WSGIHandler
+from django.utils.module_loading import import_string
+
+API_PATH_PREFIX = "/api/"
+
+
+class ApiHandlerMixin:
+    """Build the middleware chain from ``API_MIDDLEWARE`` and resolve against ``API_URLCONF``."""
+
+    def load_middleware(self, is_async: bool = False) -> None:
+        """Same chain-building rules as ``BaseHandler.load_middleware``, over ``API_MIDDLEWARE``.
+
+        Reading the list here, rather than handing Django a patched
+        ``settings.MIDDLEWARE``, keeps the shared settings object untouched
+        while the chain is built.
+        """
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+
+        get_response = self._get_response_async if is_async else self._get_response
+        handler = convert_exception_to_response(get_response)
+        handler_is_async = is_async
+        for middleware_path in reversed(settings.API_MIDDLEWARE):
+            middleware = import_string(middleware_path)
+            middleware_can_sync = getattr(middleware, "sync_capable", True)
+            middleware_can_async = getattr(middleware, "async_capable", False)
+            if not middleware_can_sync and not middleware_can_async:
+                raise RuntimeError(
+                    f"Middleware {middleware_path} must have at least one of sync_capable/async_capable set to True."
+                )
+            middleware_is_async = middleware_can_async if handler_is_async or not middleware_can_sync else False
+            try:
+                adapted_handler = self.adapt_method_mode(
+                    middleware_is_async,
+                    handler,
+                    handler_is_async,
+                    debug=settings.DEBUG,
+                    name=f"middleware {middleware_path}",
+                )
+                mw_instance = middleware(adapted_handler)
+            except MiddlewareNotUsed:
+                continue
+            if mw_instance is None:
+                raise ImproperlyConfigured(f"Middleware factory {middleware_path} returned None.")
+
+            if hasattr(mw_instance, "process_view"):
+                self._view_middleware.insert(0, self.adapt_method_mode(is_async, mw_instance.process_view))
+            if hasattr(mw_instance, "process_template_response"):
+                self._template_response_middleware.append(
+                    self.adapt_method_mode(is_async, mw_instance.process_template_response)
+                )
+            if hasattr(mw_instance, "process_exception"):
+                # Django still runs the exception-handling stack synchronously.
+                self._exception_middleware.append(self.adapt_method_mode(False, mw_instance.process_exception))
+
+            handler = convert_exception_to_response(mw_instance)
+            handler_is_async = middleware_is_async
+
+        handler = self.adapt_method_mode(is_async, handler, handler_is_async)
+        # Assigned last: Django treats a set ``_middleware_chain`` as "initialisation complete".
+        self._middleware_chain = handler
+
+    def resolve_request(self, request):
+        request.urlconf = settings.API_URLCONF
+        return super().resolve_request(request)
+
+
+class ApiWSGIHandler(ApiHandlerMixin, WSGIHandler):
+    pass
+
+
+class ApiASGIHandler(ApiHandlerMixin, ASGIHandler):
+    pass
+
+
+def _is_api_path(path: str) -> bool:
+    return path.startswith(API_PATH_PREFIX)
+
+
+def get_wsgi_application() -> Callable[..., Any]:
+    django.setup(set_prefix=False)
+    site, api = WSGIHandler(), ApiWSGIHandler()
+
+    def application(environ, start_response):
+        handler = api if _is_api_path(environ.get("PATH_INFO", "")) else site
+        return handler(environ, start_response)
+
+    return application
+
+
+def get_asgi_application() -> Callable[..., Any]:
+    django.setup(set_prefix=False)
+    site, api = ASGIHandler(), ApiASGIHandler()
+
+    async def application(scope, receive, send) -> None:
+        path = scope.get("path", "")
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        handler = api if scope["type"] == "http" and _is_api_path(path) else site
+        await handler(scope, receive, send)
+
+    return application
+
+
+__all__ = [
+    "API_PATH_PREFIX",
+    "ApiASGIHandler",
+    "ApiWSGIHandler",
+    "get_asgi_application",
+    "get_wsgi_application",
+]
@@ -0,0 +1,37 @@
+"""Middleware for the lean API chain (``settings.API_MIDDLEWARE``)."""
+
+from __future__ import annotations
+
+from django.middleware import common, security
+
+
+class InlineHooksMixin:
+    """Run a ``MiddlewareMixin``'s hooks on the event loop instead of in a worker thread.
+
+    Under ASGI, Django wraps ``process_request``/``process_response`` in
+    ``sync_to_async``, a thread round trip per hook. That is only needed when a
+    hook may block; use this solely for middleware whose hooks read settings,
+    headers and URL patterns and nothing else.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self._acall_inline(request)
+        return super().__call__(request)
+
+    async def _acall_inline(self, request):
+        response = None
+        if hasattr(self, "process_request"):
+            response = self.process_request(request)
+        response = response or await self.get_response(request)
+        if hasattr(self, "process_response"):
+            response = self.process_response(request, response)
+        return response
+
+
+class SecurityMiddleware(InlineHooksMixin, security.SecurityMiddleware):
+    pass
+
+
+class CommonMiddleware(InlineHooksMixin, common.CommonMiddleware):
+    pass
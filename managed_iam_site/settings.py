@@ -39,8 +39,15 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Paths under /api/ skip sessions, CSRF, auth and messages (see managed_iam_site.handlers).
+API_MIDDLEWARE = [
+    "managed_iam_site.middleware.SecurityMiddleware",
+    "managed_iam_site.middleware.CommonMiddleware",
+]
+
 
 ROOT_URLCONF = "managed_iam_site.urls"
+API_URLCONF = "managed_iam_site.api_urls"
 
 
 TEMPLATES = [
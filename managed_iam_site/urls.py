@@ -13,5 +13,6 @@ urlpatterns = [
     path("docs", managed_views.swagger_ui, name="swagger-ui"),
     path("docs/", managed_views.swagger_ui),
     path("", managed_views.portal, name="portal"),
+    path("portal/stack-status", managed_views.stack_status, name="portal-stack-status"),
     path("api/", include("managed_iam_app.urls")),
 ]
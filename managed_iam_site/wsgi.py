@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import logging
 import os
 
-from django.core.wsgi import get_wsgi_application
+from managed_iam_site.handlers import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "managed_iam_site.settings")
 
 application = get_wsgi_application()
 
+from managed_iam.app import startup  # noqa: E402 - needs Django configured first
+
+# Warming is an optimisation: a failure here must not stop the worker from serving.
+try:
+    startup()
+except Exception:  # noqa: BLE001 - logged; services are built lazily on first request
+    logging.getLogger(__name__).exception("startup warm-up failed; continuing without it")
@@ -0,0 +1,15 @@
+"""Shared pytest configuration.
+
+Settings are read from the environment at import time, so the required
+values get harmless defaults before any ``managed_iam`` module is imported.
+"""
+
+from __future__ import annotations
+
+import base64
+import os
+
+os.environ.setdefault("SUNRIN_ENCRYPTION_KEY", base64.b64encode(b"k" * 32).decode())
+os.environ.setdefault("SUNRIN_HMAC_KEY", base64.b64encode(b"h" * 32).decode())
+os.environ.setdefault("SUNRIN_TEMPLATE_BUCKET", "sunrin-templates")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "managed_iam_site.settings")
@@ -0,0 +1,56 @@
+"""The /api/ handler builds its own middleware chain without touching shared settings."""
+
+from __future__ import annotations
+
+import django
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import RequestFactory, override_settings
+
+django.setup()
+
+from managed_iam_site.handlers import ApiASGIHandler, ApiWSGIHandler  # noqa: E402 - needs Django configured first
+
+PROBE = "tests.test_handlers.ProbeMiddleware"
+UNUSED = "tests.test_handlers.UnusedMiddleware"
+
+
+class ProbeMiddleware:
+    """Records what ``settings.MIDDLEWARE`` held while the chain containing it was built."""
+
+    seen: list[list[str]] = []
+
+    def __init__(self, get_response) -> None:
+        ProbeMiddleware.seen.append(list(settings.MIDDLEWARE))
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+
+class UnusedMiddleware:
+    def __init__(self, get_response) -> None:
+        raise MiddlewareNotUsed
+
+
+def test_api_chain_wraps_views_with_the_api_middleware_in_order():
+    with override_settings(API_MIDDLEWARE=["django.middleware.security.SecurityMiddleware", UNUSED, PROBE]):
+        handler = ApiWSGIHandler()
+
+    response = handler.get_response(RequestFactory().get("/api/health"))
+
+    assert response.status_code == 200
+    assert response["X-Content-Type-Options"] == "nosniff"
+    assert "X-Frame-Options" not in response
+
+
+def test_api_chain_comes_from_api_middleware_and_leaves_settings_alone():
+    ProbeMiddleware.seen.clear()
+    with override_settings(API_MIDDLEWARE=[PROBE]):
+        full_stack = list(settings.MIDDLEWARE)
+        ApiWSGIHandler()
+        ApiASGIHandler()
+
+    assert PROBE not in full_stack
+    # Built once per handler, and other threads reading MIDDLEWARE meanwhile saw the full stack.
+    assert ProbeMiddleware.seen == [full_stack, full_stack]
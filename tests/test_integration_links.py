@@ -0,0 +1,85 @@
+"""Cached integration links never outlive the credentials that signed their template URL."""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+from botocore.credentials import ReadOnlyCredentials
+
+from managed_iam.aws import credential_provider
+from managed_iam.services import stack as stack_module
+from managed_iam.services.integration import IntegrationLinkCache, IntegrationService
+from managed_iam.services.orgs import OrganisationService
+from managed_iam.services.stack import StackService
+
+MARGIN = 300
+
+
+def _credentials(token: str | None, expires_in: float | None) -> SimpleNamespace:
+    frozen = ReadOnlyCredentials("ASIAEXAMPLE", "secret", token)
+    credentials = SimpleNamespace(refresh_needed=lambda: False, get_frozen_credentials=lambda: frozen)
+    if expires_in is not None:
+        # Where botocore's RefreshableCredentials keep their expiry.
+        credentials._expiry_time = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+    return credentials
+
+
+@pytest_asyncio.fixture
+async def links_service(monkeypatch):
+    monkeypatch.setattr(stack_module.settings, "template_public_access", False)
+    monkeypatch.setattr(stack_module.settings, "template_presign_mode", "sigv4")
+    org = OrganisationService(fakeredis.aioredis.FakeRedis())
+    await org.register_org(org_name="acme", owner_user_id="owner")
+    cache = IntegrationLinkCache(refresh_margin_seconds=MARGIN)
+    yield IntegrationService(stack_service=StackService(), org_service=org, link_cache=cache), cache
+    credential_provider.clear()
+
+
+def _use(monkeypatch, credentials: SimpleNamespace) -> None:
+    monkeypatch.setitem(credential_provider._credentials, None, credentials)
+
+
+async def _built_twice(service: IntegrationService) -> bool:
+    first = await service.build_links(org_name="acme")
+    second = await service.build_links(org_name="acme")
+    return first is not second
+
+
+@pytest.mark.asyncio
+async def test_long_term_keys_are_cached_for_expires_in(links_service, monkeypatch):
+    service, cache = links_service
+    _use(monkeypatch, _credentials(token=None, expires_in=None))
+
+    assert not await _built_twice(service)
+    assert cache.stats().stores == 1
+
+
+@pytest.mark.asyncio
+async def test_short_lived_credentials_cap_the_cache_lifetime(links_service, monkeypatch):
+    service, cache = links_service
+    _use(monkeypatch, _credentials(token="session", expires_in=MARGIN + 60))
+
+    assert not await _built_twice(service)
+    ((_, expires_at),) = cache._entries.values()
+    assert expires_at - time.monotonic() <= 60
+
+
+@pytest.mark.parametrize(
+    "credentials",
+    [
+        pytest.param(_credentials(token="session", expires_in=MARGIN - 60), id="expiring-within-margin"),
+        pytest.param(_credentials(token="session", expires_in=None), id="unknown-expiry"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_links_signed_with_expiring_credentials_are_not_cached(links_service, monkeypatch, credentials):
+    service, cache = links_service
+    _use(monkeypatch, credentials)
+
+    assert await _built_twice(service)
+    assert cache.stats().stores == 0
@@ -0,0 +1,58 @@
+"""OpenAPI document caching and content negotiation."""
+
+from __future__ import annotations
+
+import gzip
+import json
+
+import django
+import pytest
+
+from managed_iam_app.openapi import OpenAPIDocumentCache
+
+django.setup()
+
+from managed_iam_app.views.docs import accepts_gzip  # noqa: E402 - needs Django configured first
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip", True),
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.8", True),
+        ("GZIP", True),
+        ("x-gzip", True),
+        ("*", True),
+        ("", False),
+        ("identity", False),
+        ("deflate, br", False),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, deflate", False),
+        ("*;q=0", False),
+        ("gzip;q=0, *", False),
+        ("*;q=0, gzip;q=0.5", True),
+        ("gzip;q=bogus", False),
+    ],
+)
+def test_accepts_gzip_honours_quality_values(header, expected):
+    assert accepts_gzip(header) is expected
+
+
+@pytest.mark.asyncio
+async def test_arender_builds_once_and_caches_per_server_url():
+    cache = OpenAPIDocumentCache(max_variants=1)
+    spec = cache.warm()
+
+    first = await cache.arender("https://a.example")
+    assert await cache.arender("https://a.example") is first
+    assert cache.warm() is spec
+
+    body = json.loads(first.body)
+    assert body["servers"] == [{"url": "https://a.example", "description": "API base URL"}]
+    assert gzip.decompress(first.gzipped) == first.body
+    assert first.gzip_etag == first.etag[:-1] + '-gzip"'
+
+    second = await cache.arender("https://b.example")
+    assert second.etag != first.etag
+    assert cache.cached("https://a.example") is None
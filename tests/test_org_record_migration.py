@@ -0,0 +1,45 @@
+"""migrate_to_compact rewrites every hash that still holds v1 fields, marked v2 or not."""
+
+from __future__ import annotations
+
+import fakeredis.aioredis
+import pytest
+
+from managed_iam.repos import codec, orgs as orgs_module
+from managed_iam.repos.orgs import OrgRepository
+
+KEY = "v1:orgs:acme"
+
+
+async def _repo(redis, monkeypatch, record_format: str) -> OrgRepository:
+    monkeypatch.setattr(orgs_module.settings, "org_record_format", record_format)
+    return OrgRepository(redis)
+
+
+@pytest.mark.asyncio
+async def test_v2_hash_rewritten_by_a_v1_worker_is_migrated_again(monkeypatch):
+    redis = fakeredis.aioredis.FakeRedis()
+    v2 = await _repo(redis, monkeypatch, "v2")
+    await v2.create_org(org_name="acme", owner_user_id="owner", api_key="key-1", external_id="ext-1")
+    # A worker still on the default v1 format validates the organisation afterwards.
+    v1 = await _repo(redis, monkeypatch, "v1")
+    await v1.mark_validated("acme", account_id="123456789012", account_tags={"team": "infra"})
+
+    mixed = await redis.hgetall(KEY)
+    assert mixed[codec.FORMAT_FIELD] == codec.COMPACT_VERSION
+    assert b"validation_status" in mixed
+    assert not (await v2.get_org("acme")).compact
+
+    assert await v2.migrate_to_compact("acme") == "migrated"
+
+    migrated = await redis.hgetall(KEY)
+    assert not set(migrated) & {field.encode() for field in codec.COMPACT_NAMES}
+    record = await v2.get_org("acme")
+    assert record.compact
+    assert (record.validation_status, record.account_id, record.account_tags) == (
+        True,
+        "123456789012",
+        {"team": "infra"},
+    )
+    assert await v2.decrypt_api_key(record) == "key-1"
+    assert await v2.migrate_to_compact("acme") == "compact"
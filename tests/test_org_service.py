@@ -0,0 +1,50 @@
+"""Organisation reads: when the process cache is filled and when fields are projected."""
+
+from __future__ import annotations
+
+import fakeredis.aioredis
+import pytest
+
+from managed_iam.services.org_cache import OrgRecordCache
+from managed_iam.services.orgs import OrganisationService
+
+
+async def _service(cache: OrgRecordCache) -> OrganisationService:
+    redis = fakeredis.aioredis.FakeRedis()
+    await OrganisationService(redis, cache=cache).register_org(org_name="acme", owner_user_id="owner")
+    return OrganisationService(redis, cache=cache)
+
+
+@pytest.mark.asyncio
+async def test_usable_cache_reads_and_stores_whole_records():
+    cache = OrgRecordCache(use_pubsub=False)
+    service = await _service(cache)
+
+    record = await service.get_org("acme", fields=("validation_status",))
+
+    assert record.complete
+    assert record.owner_user_id == "owner"
+    assert cache.stats().stores == 1
+
+
+@pytest.mark.parametrize(
+    "cache",
+    [
+        OrgRecordCache(max_entries=0, use_pubsub=False),
+        # Pub/sub on but never subscribed: the cache is bypassed.
+        OrgRecordCache(subscriber=lambda: None),
+    ],
+    ids=["disabled", "bypassed"],
+)
+@pytest.mark.asyncio
+async def test_projects_fields_when_cache_is_not_in_use(cache, monkeypatch):
+    monkeypatch.setattr(cache, "_ensure_listener", lambda: None)
+    service = await _service(cache)
+
+    record = await service.get_org("acme", fields=("validation_status",))
+
+    assert not record.complete
+    assert record.validation_status is False
+    with pytest.raises(AttributeError):
+        record.account_tags
+    assert cache.stats().stores == 0
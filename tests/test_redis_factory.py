@@ -0,0 +1,69 @@
+"""Per-loop Redis clients are released when a WSGI-style request loop ends."""
+
+from __future__ import annotations
+
+import gc
+import threading
+
+import django
+import pytest
+from asgiref.sync import async_to_sync
+from fakeredis import TcpFakeServer
+from redis.asyncio.connection import AbstractConnection
+
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402 - needs Django configured first
+
+from managed_iam.storage import RedisFactory, redis as redis_module  # noqa: E402
+from managed_iam_app.views.api.users import create_user  # noqa: E402
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    monkeypatch.setattr(redis_module.settings, "redis_url", f"redis://{host}:{port}/0")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def opened_connections(monkeypatch):
+    # Strong references, so a connection only counts as closed if it was disconnected explicitly.
+    opened: list[AbstractConnection] = []
+    original = AbstractConnection.connect
+
+    async def connect(self, *args, **kwargs):
+        opened.append(self)
+        return await original(self, *args, **kwargs)
+
+    monkeypatch.setattr(AbstractConnection, "connect", connect)
+    return opened
+
+
+def test_wsgi_requests_close_their_redis_clients(redis_server, opened_connections):
+    factory = RequestFactory()
+
+    for _ in range(5):
+        request = factory.post("/api/users", data=b"{}", content_type="application/json")
+        # Django's WSGI handler runs async views like this: one fresh event loop per request.
+        response = async_to_sync(create_user)(request)
+        assert response.status_code == 201
+
+    gc.collect()
+    assert len(opened_connections) >= 5
+    assert not any(connection.is_connected for connection in opened_connections)
+    assert RedisFactory.stats().pools == 0
+
+
+def test_one_client_is_shared_within_a_loop(redis_server):
+    async def clients():
+        return RedisFactory.client(), RedisFactory.client()
+
+    first, second = async_to_sync(clients)()
+    assert first is second
+    assert RedisFactory.stats().pools == 0
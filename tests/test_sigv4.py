@@ -0,0 +1,120 @@
+"""The in-process S3 presigner must produce exactly the URLs boto3 does."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import boto3
+import pytest
+from botocore.config import Config
+
+from managed_iam.aws.sigv4 import SigningCredentials, presign_s3_url
+
+NOW = datetime(2024, 5, 17, 8, 30, 15, tzinfo=timezone.utc)
+
+CREDENTIALS = [
+    SigningCredentials("AKIDEXAMPLE", "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY"),
+    SigningCredentials(
+        "ASIAEXAMPLE",
+        "c2VjcmV0/with+slashes=",
+        "IQoJb3JpZ2luX2VjEJr//////////wEaCXVzLWVhc3QtMSJHMEUCIQD+token/with+special=chars",
+    ),
+]
+
+REGIONS = ["us-east-1", "us-west-2", "eu-west-1", "ap-northeast-2"]
+
+KEYS = [
+    "stack.yaml",
+    "templates/v1/stack.yaml",
+    "with space/and+plus.yaml",
+    "한글/템플릿 파일.yaml",
+    "double//slash/stack.yaml",
+    "leading/~tilde/!*'();:@&=$,?#[].yaml",
+]
+
+BUCKETS = [
+    "sunrin-templates",
+    "a" * 63,
+    "my.dotted.bucket",
+    "Upper_Case_Bucket",
+    "ab",
+    "AB",
+]
+
+
+def boto3_presigned_url(
+    monkeypatch: pytest.MonkeyPatch,
+    *,
+    bucket: str,
+    key: str,
+    region: str,
+    credentials: SigningCredentials,
+    expires_in: int,
+) -> str:
+    monkeypatch.setattr("botocore.auth.get_current_datetime", lambda: NOW.replace(tzinfo=None))
+    client = boto3.client(
+        "s3",
+        region_name=region,
+        aws_access_key_id=credentials.access_key,
+        aws_secret_access_key=credentials.secret_key,
+        aws_session_token=credentials.token,
+        config=Config(signature_version="s3v4"),
+    )
+    return client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket, "Key": key},
+        ExpiresIn=expires_in,
+    )
+
+
+@pytest.mark.parametrize("credentials", CREDENTIALS, ids=["static", "session-token"])
+@pytest.mark.parametrize("region", REGIONS)
+@pytest.mark.parametrize("key", KEYS)
+def test_matches_boto3_across_regions_keys_and_tokens(monkeypatch, credentials, region, key):
+    expected = boto3_presigned_url(
+        monkeypatch,
+        bucket="sunrin-templates",
+        key=key,
+        region=region,
+        credentials=credentials,
+        expires_in=3600,
+    )
+    actual = presign_s3_url(
+        bucket="sunrin-templates",
+        key=key,
+        region=region,
+        credentials=credentials,
+        expires_in=3600,
+        now=NOW,
+    )
+    assert actual == expected
+
+
+@pytest.mark.parametrize("region", REGIONS)
+@pytest.mark.parametrize("bucket", BUCKETS)
+def test_matches_boto3_addressing_for_bucket_names(monkeypatch, region, bucket):
+    expected = boto3_presigned_url(
+        monkeypatch,
+        bucket=bucket,
+        key="templates/stack.yaml",
+        region=region,
+        credentials=CREDENTIALS[0],
+        expires_in=900,
+    )
+    actual = presign_s3_url(
+        bucket=bucket,
+        key="templates/stack.yaml",
+        region=region,
+        credentials=CREDENTIALS[0],
+        expires_in=900,
+        now=NOW,
+    )
+    assert actual == expected
+
+
+@pytest.mark.parametrize("expires_in", [1, 3600, 604800])
+def test_matches_boto3_for_expiry(monkeypatch, expires_in):
+    kwargs = dict(bucket="sunrin-templates", key="stack.yaml", region="us-east-1", credentials=CREDENTIALS[1])
+    assert presign_s3_url(expires_in=expires_in, now=NOW, **kwargs) == boto3_presigned_url(
+        monkeypatch, expires_in=expires_in, **kwargs
+    )
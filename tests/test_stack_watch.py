@@ -0,0 +1,50 @@
+"""Stack watches made by WSGI-style requests are dropped with the request's event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import weakref
+
+import django
+from asgiref.sync import async_to_sync
+
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402 - needs Django configured first
+
+from managed_iam.services.stack_watch import stack_watch_hub  # noqa: E402
+from managed_iam.services.workload import StackActivity, WorkloadStackService, WorkloadStatus  # noqa: E402
+from managed_iam_app.views.portal.stack_status import stack_status  # noqa: E402
+
+
+def test_wsgi_polls_do_not_retain_watches_or_loops(monkeypatch):
+    loops: list[weakref.ref[asyncio.AbstractEventLoop]] = []
+
+    async def stack_activity(self, org_name, *, after_event_id=None, limit=None):
+        loops.append(weakref.ref(asyncio.get_running_loop()))
+        return StackActivity(
+            status=WorkloadStatus(
+                stack_name="sunrin-workload",
+                stack_id="stack-1",
+                status="CREATE_COMPLETE",
+                outputs={},
+                last_updated=None,
+            ),
+            events=[],
+        )
+
+    monkeypatch.setattr(WorkloadStackService, "stack_activity", stack_activity)
+    factory = RequestFactory()
+
+    for _ in range(10):
+        # Django's WSGI handler runs each async view on its own event loop like this.
+        response = async_to_sync(stack_status)(factory.get("/portal/stack-status", {"org_name": "acme"}))
+        assert response.status_code == 200
+        assert json.loads(response.content)["status"]["status"] == "CREATE_COMPLETE"
+
+    gc.collect()
+    assert len(loops) == 10
+    assert stack_watch_hub.stats().watches == 0
+    assert all(loop() is None for loop in loops)
@@ -0,0 +1,190 @@
+"""AsyncSTSClient against a local stand-in for the STS Query API."""
+
+from __future__ import annotations
+
+import socket
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+from botocore.exceptions import ClientError
+
+from managed_iam.aws import sts as sts_module
+from managed_iam.aws.sigv4 import SigningCredentials
+from managed_iam.aws.sts import AsyncSTSClient, STSTransportError
+
+SIGNING = SigningCredentials("AKIDEXAMPLE", "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY", "caller-token")
+
+ASSUME_ROLE_OK = b"""<AssumeRoleResponse xmlns="https://sts.amazonaws.com/doc/2011-06-15/">
+  <AssumeRoleResult>
+    <Credentials>
+      <AccessKeyId>ASIATESTACCESSKEY</AccessKeyId>
+      <SecretAccessKey>test/secret+key</SecretAccessKey>
+      <SessionToken>test-session-token</SessionToken>
+      <Expiration>2024-05-17T09:30:15Z</Expiration>
+    </Credentials>
+    <AssumedRoleUser>
+      <AssumedRoleId>AROATEST:sunrin</AssumedRoleId>
+      <Arn>arn:aws:sts::123456789012:assumed-role/ReadOnly/sunrin</Arn>
+    </AssumedRoleUser>
+  </AssumeRoleResult>
+  <ResponseMetadata><RequestId>req-1</RequestId></ResponseMetadata>
+</AssumeRoleResponse>"""
+
+ACCESS_DENIED = b"""<ErrorResponse xmlns="https://sts.amazonaws.com/doc/2011-06-15/">
+  <Error>
+    <Type>Sender</Type>
+    <Code>AccessDenied</Code>
+    <Message>User is not authorized to perform: sts:AssumeRole</Message>
+  </Error>
+  <RequestId>req-2</RequestId>
+</ErrorResponse>"""
+
+
+class _STSHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((dict(self.headers), parse_qs(body.decode())))
+        status, payload = self.server.reply
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - keep test output quiet
+        pass
+
+
+@pytest.fixture
+def sts_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _STSHandler)
+    server.requests = []
+    server.reply = (200, ASSUME_ROLE_OK)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(sts_module.settings, "sts_endpoint_url", f"http://127.0.0.1:{server.server_port}/")
+    monkeypatch.setattr(sts_module.settings, "aws_region", "us-east-1")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def signing_credentials(monkeypatch):
+    async def fixed(profile=None):
+        return SIGNING
+
+    monkeypatch.setattr(sts_module.credential_provider, "signing_credentials", fixed)
+
+
+async def _assume_role() -> dict:
+    try:
+        return await AsyncSTSClient().assume_role(
+            role_arn="arn:aws:iam::123456789012:role/ReadOnly",
+            role_session_name="sunrin",
+            external_id="ext-123",
+            duration_seconds=900,
+        )
+    finally:
+        await AsyncSTSClient.close()
+
+
+@pytest.mark.asyncio
+async def test_assume_role_returns_boto3_shaped_credentials(sts_server):
+    credentials = await _assume_role()
+
+    assert credentials == {
+        "AccessKeyId": "ASIATESTACCESSKEY",
+        "SecretAccessKey": "test/secret+key",
+        "SessionToken": "test-session-token",
+        "Expiration": datetime(2024, 5, 17, 9, 30, 15, tzinfo=timezone.utc),
+    }
+    headers, params = sts_server.requests[0]
+    assert params == {
+        "Action": ["AssumeRole"],
+        "Version": ["2011-06-15"],
+        "RoleArn": ["arn:aws:iam::123456789012:role/ReadOnly"],
+        "RoleSessionName": ["sunrin"],
+        "ExternalId": ["ext-123"],
+        "DurationSeconds": ["900"],
+    }
+    assert headers["Authorization"].startswith("AWS4-HMAC-SHA256 Credential=AKIDEXAMPLE/")
+    assert "/us-east-1/sts/aws4_request" in headers["Authorization"]
+    assert headers["X-Amz-Security-Token"] == "caller-token"
+
+
+@pytest.mark.asyncio
+async def test_error_response_is_raised_as_client_error(sts_server):
+    sts_server.reply = (403, ACCESS_DENIED)
+
+    with pytest.raises(ClientError) as excinfo:
+        await _assume_role()
+
+    assert excinfo.value.operation_name == "AssumeRole"
+    assert excinfo.value.response["Error"] == {
+        "Code": "AccessDenied",
+        "Message": "User is not authorized to perform: sts:AssumeRole",
+    }
+    assert excinfo.value.response["ResponseMetadata"]["HTTPStatusCode"] == 403
+
+
+@pytest.mark.asyncio
+async def test_unparseable_response_is_a_transport_error(sts_server):
+    sts_server.reply = (502, b"<html>Bad Gateway")
+
+    with pytest.raises(STSTransportError):
+        await _assume_role()
+
+
+@pytest.mark.asyncio
+async def test_missing_credentials_is_a_transport_error(sts_server):
+    sts_server.reply = (200, b'<AssumeRoleResponse xmlns="https://sts.amazonaws.com/doc/2011-06-15/"/>')
+
+    with pytest.raises(STSTransportError, match="missing credentials"):
+        await _assume_role()
+
+
+@pytest.mark.asyncio
+async def test_connection_failure_is_a_transport_error(monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    # Nothing listens on the port once the socket is closed, so the connect is refused.
+    monkeypatch.setattr(sts_module.settings, "sts_endpoint_url", f"http://127.0.0.1:{port}/")
+
+    with pytest.raises(STSTransportError) as excinfo:
+        await _assume_role()
+
+    assert excinfo.value.__cause__ is not None
+
+
+def test_wsgi_requests_close_their_http_clients(sts_server, monkeypatch):
+    created: list[httpx.AsyncClient] = []
+    build = AsyncSTSClient._http_clients._factory
+
+    def tracked() -> httpx.AsyncClient:
+        created.append(build())
+        return created[-1]
+
+    monkeypatch.setattr(AsyncSTSClient._http_clients, "_factory", tracked)
+
+    async def request() -> dict:
+        # What a view does: assume the role, without closing the shared client itself.
+        return await AsyncSTSClient().assume_role(
+            role_arn="arn:aws:iam::123456789012:role/ReadOnly",
+            role_session_name="sunrin",
+            external_id="ext-123",
+        )
+
+    for _ in range(5):
+        # Django's WSGI handler runs each async view on its own event loop like this.
+        assert async_to_sync(request)()["AccessKeyId"] == "ASIATESTACCESSKEY"
+
+    assert len(created) == 5
+    assert all(client.is_closed for client in created)
+    assert AsyncSTSClient._http_clients.values() == []
@@ -0,0 +1,98 @@
+"""Retries move to the stream atomically and stale stream entries never run a job twice."""
+
+from __future__ import annotations
+
+import fakeredis.aioredis
+import pytest
+from botocore.exceptions import ClientError
+
+from managed_iam import worker as worker_module
+from managed_iam.services.jobs import _DELAYED_KEY, STREAM_KEY, WorkloadJobQueue
+from managed_iam.services.workload import WorkloadActionResult
+from managed_iam.worker import WorkloadJobWorker
+
+THROTTLED = ClientError({"Error": {"Code": "Throttling", "Message": "Rate exceeded"}}, "CreateStack")
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    calls: list[str] = []
+    outcomes: list[BaseException | None] = []
+
+    async def run_job(job):
+        calls.append(job.job_id)
+        outcome = outcomes.pop(0) if outcomes else None
+        if outcome is not None:
+            raise outcome
+        return WorkloadActionResult(action="create", stack_id="stack-1", message="ok")
+
+    monkeypatch.setattr(worker_module, "run_job", run_job)
+    monkeypatch.setattr(worker_module, "retry_delay", lambda attempt: 0)
+    return calls, outcomes
+
+
+async def _queue() -> WorkloadJobQueue:
+    queue = WorkloadJobQueue(fakeredis.aioredis.FakeRedis())
+    await queue.ensure_group()
+    return queue
+
+
+@pytest.mark.asyncio
+async def test_due_retry_is_queued_again_with_its_record():
+    queue = await _queue()
+    job = await queue.enqueue("deploy", "acme", parameters={})
+    job.attempts = 1
+    await queue.retry_later(job, "Rate exceeded", 0)
+
+    assert await queue.promote_due() == 1
+
+    assert await queue._redis.zcard(_DELAYED_KEY) == 0
+    promoted = await queue.get(job.job_id)
+    assert (promoted.state, promoted.parameters, promoted.next_attempt_at) == ("queued", {}, None)
+    assert await queue._redis.ttl(f"v1:workload-job:{job.job_id}") > 0
+    entries = await queue.read("w1", count=10, block_ms=1)
+    assert [(job_id, attempt) for _, job_id, attempt in entries] == [(job.job_id, 0), (job.job_id, 1)]
+    assert await queue.promote_due() == 0
+
+
+@pytest.mark.asyncio
+async def test_entry_left_behind_by_a_crashed_retry_never_runs_the_job_again(runs):
+    calls, outcomes = runs
+    queue = await _queue()
+    worker = WorkloadJobWorker(consumer="w1")
+    job = await queue.enqueue("deploy", "acme")
+    ((first_entry, job_id, attempt),) = await queue.read("w1", count=10, block_ms=1)
+
+    # The attempt is throttled and scheduled for a retry, then the worker dies before its ACK.
+    outcomes.append(THROTTLED)
+
+    async def crash(entry_id):
+        raise ConnectionError("worker died")
+
+    queue.ack = crash
+    with pytest.raises(ConnectionError):
+        await worker._handle(queue, first_entry, job_id, attempt)
+    del queue.ack
+    assert (await queue.get(job.job_id)).state == "retrying"
+
+    # Another worker reclaims the stale entry while the retry still waits in the delayed set.
+    ((entry_id, _, attempt),) = await queue.reclaim("w2", min_idle_ms=0, count=10)
+    await worker._handle(queue, entry_id, job_id, attempt)
+    assert calls == [job.job_id]
+
+    # The retry is promoted and runs once, even if the old entry is delivered again.
+    await queue.promote_due()
+    ((retry_entry, _, retry_attempt),) = await queue.read("w2", count=10, block_ms=1)
+    await worker._handle(queue, first_entry, job_id, 0)
+    await worker._handle(queue, retry_entry, job_id, retry_attempt)
+
+    assert calls == [job.job_id, job.job_id]
+    finished = await queue.get(job.job_id)
+    assert (finished.state, finished.attempts) == ("succeeded", 2)
+    assert await queue._redis.get("v1:workload-job:active:acme") is None
+    assert await queue._redis.xpending(STREAM_KEY, "workload-workers") == {
+        "pending": 0,
+        "min": None,
+        "max": None,
+        "consumers": [],
+    }